@@ -0,0 +1,151 @@
+"""Visibility-aware pacing of the live countdown's wakeups and redraws."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import List, Optional, Sequence, Tuple
+
+VISIBLE_FRAME_MS = 1000
+UNFOCUSED_FRAME_MS = 5000
+# Hidden windows still wake up to checkpoint; matches the checkpointer's default rate.
+HIDDEN_WAKE_MS = 15000
+
+
+class Visibility(IntEnum):
+    """How much of the window the child can see, least to most."""
+
+    HIDDEN = 0
+    UNFOCUSED = 1
+    VISIBLE = 2
+
+
+@dataclass
+class PacingStats:
+    """Counters for measuring live countdown cost.
+
+    Attributes:
+        wakeups: Timer callbacks run.
+        frames: Timer ring redraws.
+        skipped_frames: Wakeups that skipped the redraw.
+        catch_ups: Extra frames requested when the window became visible.
+    """
+
+    wakeups: int = 0
+    frames: int = 0
+    skipped_frames: int = 0
+    catch_ups: int = 0
+
+    def wakeups_per_minute(self, elapsed_ms: int) -> float:
+        """Return average wakeups per minute over ``elapsed_ms``."""
+
+        return self.wakeups * 60000 / elapsed_ms if elapsed_ms else 0.0
+
+
+class LivePacer:
+    """Chooses when the live countdown wakes up and whether it redraws.
+
+    Visible windows redraw every second, unfocused ones every few seconds
+    and hidden ones not at all. Block transitions, the end-of-session alert
+    and the session end are scheduled exactly regardless of visibility.
+    Kept free of tkinter; the window reports ``<Map>``/``<Unmap>`` and focus
+    changes through ``set_visibility``.
+    """
+
+    def __init__(
+        self,
+        block_ends_ms: Sequence[int],
+        alert_at_ms: Optional[int] = None,
+        start_ms: int = 0,
+        visibility: Visibility = Visibility.VISIBLE,
+        frame_ms: int = VISIBLE_FRAME_MS,
+        unfocused_frame_ms: int = UNFOCUSED_FRAME_MS,
+        hidden_wake_ms: int = HIDDEN_WAKE_MS,
+    ) -> None:
+        """Initialize pacing for one live session.
+
+        Args:
+            block_ends_ms: Elapsed time at which each block ends; the last is the session end.
+            alert_at_ms: Elapsed time of the end-of-session alert, if any.
+            start_ms: Elapsed time a resumed session starts from; earlier events are skipped.
+            visibility: Window visibility when the session starts.
+            frame_ms: Redraw interval while visible.
+            unfocused_frame_ms: Redraw interval while visible but unfocused.
+            hidden_wake_ms: Wakeup interval while hidden.
+        """
+
+        if not block_ends_ms:
+            raise ValueError("A live session needs at least one block")
+
+        events: List[Tuple[int, str]] = [(end, "block") for end in block_ends_ms[:-1]]
+        events.append((block_ends_ms[-1], "end"))
+        if alert_at_ms is not None and 0 < alert_at_ms < block_ends_ms[-1]:
+            events.append((alert_at_ms, "alert"))
+        self._events = sorted(events)
+        self._next_event = sum(1 for at, _ in self._events if at <= start_ms)
+        self._intervals = {
+            Visibility.HIDDEN: hidden_wake_ms,
+            Visibility.UNFOCUSED: unfocused_frame_ms,
+            Visibility.VISIBLE: frame_ms,
+        }
+        self.visibility = visibility
+        self.stats = PacingStats()
+        self._last_frame_ms: Optional[int] = None
+        self._catch_up = False
+
+    def set_visibility(self, visibility: Visibility) -> bool:
+        """Record a visibility change.
+
+        Returns:
+            True when the caller should schedule one catch-up frame now;
+            repeated restore events before that frame return False.
+        """
+
+        previous, self.visibility = self.visibility, visibility
+        if visibility == Visibility.HIDDEN:
+            # A catch-up still pending when hidden again is re-requested on restore.
+            self._catch_up = False
+        if visibility <= previous or self._catch_up:
+            return False
+        self._catch_up = True
+        self.stats.catch_ups += 1
+        return True
+
+    def advance(self, elapsed_ms: int) -> List[str]:
+        """Count a wakeup and return timing events reached since the previous one."""
+
+        self.stats.wakeups += 1
+        reached = []
+        while self._next_event < len(self._events) and self._events[self._next_event][0] <= elapsed_ms:
+            reached.append(self._events[self._next_event][1])
+            self._next_event += 1
+        return reached
+
+    def should_draw(self, elapsed_ms: int, events: Sequence[str] = ()) -> bool:
+        """Return whether this wakeup redraws the ring, and count the decision."""
+
+        if self.visibility == Visibility.HIDDEN:
+            draw = False
+        elif self.visibility == Visibility.VISIBLE or self._catch_up or events or self._last_frame_ms is None:
+            draw = True
+        else:
+            # Tolerate timer jitter so a throttled wakeup is not skipped for being early.
+            jitter = self._intervals[Visibility.VISIBLE] // 2
+            draw = elapsed_ms - self._last_frame_ms >= self._intervals[Visibility.UNFOCUSED] - jitter
+
+        if draw:
+            self.stats.frames += 1
+            self._last_frame_ms = elapsed_ms
+            self._catch_up = False
+        else:
+            self.stats.skipped_frames += 1
+        return draw
+
+    def next_delay_ms(self, elapsed_ms: int) -> int:
+        """Return milliseconds until the next frame or timing event, whichever is first."""
+
+        interval = self._intervals[self.visibility]
+        delay = interval - elapsed_ms % interval
+        if self._next_event < len(self._events):
+            delay = min(delay, self._events[self._next_event][0] - elapsed_ms)
+        return max(1, delay)
@@ -2,12 +2,28 @@
 
 from __future__ import annotations
 
+import time
 import tkinter as tk
-from tkinter import ttk
-from typing import Callable, Dict, List, Tuple
-
-from data.models import Period, ScoreSnapshot, TaskProfile
+from tkinter import messagebox, ttk
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from data.models import Period, ScoreSnapshot, SessionRecord, TaskProfile
+from components.live_pacing import LivePacer, Visibility
+from components.ui_refresh import RefreshScheduler
+from components.virtual_list import ListViewport, VirtualList
+from services.checkpoint import LiveSessionState
+from services.events import EventBus, ProfileUpdated, RewardUnlocked, ScoreChanged, SessionsRecorded, StateReloaded
 from utils.app_meta import APP_NAME, APP_UI_VERSION
+from utils.profile_search import ProfileSearchIndex
+from utils.time_utils import PomodoroBlockPlanner, TimeBlock, format_mm_ss
+
+if TYPE_CHECKING:
+    from services.analytics import ReportRow
+    from services.leaderboard import LeaderboardEntry
+
+HISTORY_VISIBLE_ROWS = 15
+LEADERBOARD_ROWS = 10
+LIVE_TICK_MS = 1000
 
 
 class MainWindow:
@@ -20,14 +36,52 @@ class MainWindow:
         on_save_profile: Callable[[TaskProfile], None],
         on_get_scores: Callable[[], ScoreSnapshot],
         on_get_next_reward: Callable[[Period], Tuple[str, int]],
+        on_get_report: Optional[Callable[[Period], List[ReportRow]]] = None,
+        on_get_history: Optional[Callable[[int, int, Optional[str]], Tuple[int, List[SessionRecord]]]] = None,
+        on_begin_live: Optional[Callable[[str], LiveSessionState]] = None,
+        on_live_tick: Optional[Callable[[int], LiveSessionState]] = None,
+        on_finish_live: Optional[Callable[[], str]] = None,
+        on_live_pause: Optional[Callable[[bool], LiveSessionState]] = None,
+        pending_session: Optional[LiveSessionState] = None,
+        on_resume_pending: Optional[Callable[[], Optional[LiveSessionState]]] = None,
+        on_finalize_pending: Optional[Callable[[], str]] = None,
+        on_get_leaderboard: Optional[Callable[[Period, int], List[LeaderboardEntry]]] = None,
+        event_bus: Optional[EventBus] = None,
     ) -> None:
-        """Initialize the main window and render dashboard."""
+        """Initialize the main window and render dashboard.
+
+        Without the live-session callbacks START records the slider minutes
+        immediately, as a quick manual log. With ``on_live_pause`` START
+        pauses and resumes a running countdown. With an ``event_bus`` the window
+        refreshes only sections named by change events, batched into one
+        idle flush; without it every action re-pulls the scoreboard.
+        """
 
         self._on_start_clicked = on_start_clicked
         self._on_save_profile = on_save_profile
         self._on_get_scores = on_get_scores
         self._on_get_next_reward = on_get_next_reward
-        self.profile_map: Dict[str, TaskProfile] = {item.title: item for item in profiles}
+        self._on_get_report = on_get_report
+        self._on_get_history = on_get_history
+        self._on_begin_live = on_begin_live
+        self._on_live_tick = on_live_tick
+        self._on_finish_live = on_finish_live
+        self._on_live_pause = on_live_pause
+        self._on_resume_pending = on_resume_pending
+        self._on_finalize_pending = on_finalize_pending
+        self._on_get_leaderboard = on_get_leaderboard
+        self._live_profile: Optional[TaskProfile] = None
+        self._live_blocks: List[TimeBlock] = []
+        self._live_base_elapsed = 0
+        self._live_started = 0.0
+        self._live_after_id: Optional[str] = None
+        self._live_pacer: Optional[LivePacer] = None
+        self._live_paused = False
+        self._window_mapped = True
+        self._window_focused = True
+        self.profile_map: Dict[str, TaskProfile] = {item.profile_id: item for item in profiles}
+        self.profile_index = ProfileSearchIndex(profiles)
+        self.selected_profile_id: Optional[str] = None
 
         self.root = tk.Tk()
         self.root.title(f"{APP_NAME} | {APP_UI_VERSION}")
@@ -39,6 +93,17 @@ class MainWindow:
         self._build_layout()
         self._populate_profiles()
         self._update_scoreboard()
+        self._event_driven = event_bus is not None
+        self._latest_scores: Optional[ScoreSnapshot] = None
+        self.refresher = RefreshScheduler(self.root.after_idle)
+        if event_bus is not None:
+            self._subscribe(event_bus)
+        if pending_session is not None:
+            self.root.after_idle(lambda: self._offer_pending_session(pending_session))
+        self.root.bind("<Map>", lambda event: self._on_map_changed(event, True), add="+")
+        self.root.bind("<Unmap>", lambda event: self._on_map_changed(event, False), add="+")
+        self.root.bind("<FocusIn>", lambda _: self._on_focus_changed(), add="+")
+        self.root.bind("<FocusOut>", lambda _: self.root.after_idle(self._on_focus_changed), add="+")
 
     def _build_styles(self) -> None:
         """Create ttk styles for a Minecraft-like colorful dashboard."""
@@ -54,6 +119,11 @@ class MainWindow:
         style.configure("MenuText.TLabel", background="#2B1C12", foreground="#D7E8FF", font=("Segoe UI", 10))
         style.configure("ScoreTitle.TLabel", background="#0F1B27", foreground="#F0F0F0", font=("Segoe UI", 15, "bold"))
         style.configure("ScoreBody.TLabel", background="#0F1B27", foreground="#8DF3FF", font=("Segoe UI", 14, "bold"))
+        style.configure("Score.TNotebook", background="#2B1C12", borderwidth=0)
+        style.configure("Score.TNotebook.Tab", background="#0F1B27", foreground="#F0F0F0", font=("Segoe UI", 10, "bold"))
+        style.map("Score.TNotebook.Tab", background=[("selected", "#4AD66D")], foreground=[("selected", "#101910")])
+        style.configure("Report.Treeview", background="#0F1B27", fieldbackground="#0F1B27", foreground="#D7E8FF", rowheight=22)
+        style.configure("Report.Treeview.Heading", background="#2B1C12", foreground="#F0F0F0", font=("Segoe UI", 9, "bold"))
         style.configure(
             "Start.TButton",
             background="#4AD66D",
@@ -105,10 +175,11 @@ class MainWindow:
         ttk.Label(self.left_panel, text="🎮 PLAYER PANEL", style="MenuTitle.TLabel").pack(anchor="w", pady=(0, 10))
 
         ttk.Label(self.left_panel, text="پروفایل وظیفه", style="MenuText.TLabel").pack(anchor="w")
-        self.profile_var = tk.StringVar()
-        self.profile_combo = ttk.Combobox(self.left_panel, textvariable=self.profile_var, state="readonly", width=22)
-        self.profile_combo.pack(fill=tk.X, pady=(4, 12))
-        self.profile_combo.bind("<<ComboboxSelected>>", lambda _: self._fill_selected_profile())
+        self.profile_search_var = tk.StringVar()
+        ttk.Entry(self.left_panel, textvariable=self.profile_search_var, width=24).pack(fill=tk.X, pady=(4, 4))
+        self.profile_search_var.trace_add("write", lambda *_: self._filter_profiles())
+        self.profile_list = VirtualList(self.left_panel, on_select=self._on_profile_selected, visible_rows=6)
+        self.profile_list.pack(fill=tk.X, pady=(0, 12))
 
         self.total_var = tk.IntVar(value=60)
         self.focus_var = tk.IntVar(value=25)
@@ -163,31 +234,40 @@ class MainWindow:
     def _build_right_scoreboard(self) -> None:
         """Build right scoreboard and reward status card."""
 
-        ttk.Label(self.right_panel, text="🏆 SCOREBOARD", style="ScoreTitle.TLabel").pack(fill=tk.X)
+        self.right_tabs = ttk.Notebook(self.right_panel, style="Score.TNotebook")
+        self.right_tabs.pack(fill=tk.BOTH, expand=True)
+        self.scoreboard_tab = ttk.Frame(self.right_tabs, style="Panel.TFrame", padding=(0, 8, 0, 0))
+        self.right_tabs.add(self.scoreboard_tab, text="🏆 SCOREBOARD")
+        self._build_report_tab()
+        self._build_history_tab()
+        self._build_leaderboard_tab()
+        self.right_tabs.bind("<<NotebookTabChanged>>", lambda _: self._refresh_visible_tab())
+
+        ttk.Label(self.scoreboard_tab, text="🏆 SCOREBOARD", style="ScoreTitle.TLabel").pack(fill=tk.X)
 
         self.points_var = tk.StringVar(value="0")
         self.weekly_var = tk.StringVar(value="0")
         self.next_reward_var = tk.StringVar(value="-")
         self.remaining_var = tk.StringVar(value="0")
 
-        ttk.Label(self.right_panel, text="Current Points", style="MenuText.TLabel").pack(anchor="w", pady=(14, 0))
-        ttk.Label(self.right_panel, textvariable=self.points_var, style="ScoreBody.TLabel").pack(anchor="w")
+        ttk.Label(self.scoreboard_tab, text="Current Points", style="MenuText.TLabel").pack(anchor="w", pady=(14, 0))
+        ttk.Label(self.scoreboard_tab, textvariable=self.points_var, style="ScoreBody.TLabel").pack(anchor="w")
 
-        ttk.Label(self.right_panel, text="Weekly Score", style="MenuText.TLabel").pack(anchor="w", pady=(14, 0))
-        ttk.Label(self.right_panel, textvariable=self.weekly_var, style="ScoreBody.TLabel").pack(anchor="w")
+        ttk.Label(self.scoreboard_tab, text="Weekly Score", style="MenuText.TLabel").pack(anchor="w", pady=(14, 0))
+        ttk.Label(self.scoreboard_tab, textvariable=self.weekly_var, style="ScoreBody.TLabel").pack(anchor="w")
 
-        ttk.Separator(self.right_panel, orient="horizontal").pack(fill=tk.X, pady=12)
+        ttk.Separator(self.scoreboard_tab, orient="horizontal").pack(fill=tk.X, pady=12)
 
-        ttk.Label(self.right_panel, text="Next Reward", style="MenuText.TLabel").pack(anchor="w")
-        ttk.Label(self.right_panel, textvariable=self.next_reward_var, style="ScoreBody.TLabel", wraplength=220).pack(anchor="w")
+        ttk.Label(self.scoreboard_tab, text="Next Reward", style="MenuText.TLabel").pack(anchor="w")
+        ttk.Label(self.scoreboard_tab, textvariable=self.next_reward_var, style="ScoreBody.TLabel", wraplength=220).pack(anchor="w")
 
-        ttk.Label(self.right_panel, text="Points Remaining", style="MenuText.TLabel").pack(anchor="w", pady=(10, 0))
-        ttk.Label(self.right_panel, textvariable=self.remaining_var, style="ScoreBody.TLabel").pack(anchor="w")
+        ttk.Label(self.scoreboard_tab, text="Points Remaining", style="MenuText.TLabel").pack(anchor="w", pady=(10, 0))
+        ttk.Label(self.scoreboard_tab, textvariable=self.remaining_var, style="ScoreBody.TLabel").pack(anchor="w")
 
-        ttk.Label(self.right_panel, text="انجام‌شده (دقیقه)", style="MenuText.TLabel").pack(anchor="w", pady=(18, 4))
+        ttk.Label(self.scoreboard_tab, text="انجام‌شده (دقیقه)", style="MenuText.TLabel").pack(anchor="w", pady=(18, 4))
         self.completed_var = tk.IntVar(value=25)
         self.completed_scale = ttk.Scale(
-            self.right_panel,
+            self.scoreboard_tab,
             from_=5,
             to=120,
             orient="horizontal",
@@ -196,8 +276,126 @@ class MainWindow:
         self.completed_scale.set(25)
         self.completed_scale.pack(fill=tk.X)
 
-        self.completed_label = ttk.Label(self.right_panel, text="25 دقیقه", style="MenuText.TLabel")
+        self.completed_label = ttk.Label(self.scoreboard_tab, text="25 دقیقه", style="MenuText.TLabel")
         self.completed_label.pack(anchor="w", pady=(6, 0))
+        ttk.Button(
+            self.scoreboard_tab,
+            text="📝 ثبت دستی",
+            style="Save.TButton",
+            command=self._log_manual_session,
+        ).pack(fill=tk.X, pady=(8, 0))
+
+    def _build_report_tab(self) -> None:
+        """Build pre-aggregated period report tab."""
+
+        self.report_tab = ttk.Frame(self.right_tabs, style="Panel.TFrame", padding=(0, 8, 0, 0))
+        self.right_tabs.add(self.report_tab, text="📊 REPORTS")
+
+        self.report_period_var = tk.StringVar(value=Period.WEEKLY.value)
+        period_combo = ttk.Combobox(
+            self.report_tab,
+            textvariable=self.report_period_var,
+            values=[item.value for item in Period],
+            state="readonly",
+            width=12,
+        )
+        period_combo.pack(anchor="w", pady=(0, 6))
+        period_combo.bind("<<ComboboxSelected>>", lambda _: self._update_report())
+
+        columns = ("bucket", "profile", "minutes", "rate", "blocks", "points")
+        self.report_tree = ttk.Treeview(
+            self.report_tab,
+            columns=columns,
+            show="headings",
+            style="Report.Treeview",
+            height=16,
+        )
+        headings = {
+            "bucket": ("Period", 70),
+            "profile": ("Profile", 70),
+            "minutes": ("Min", 44),
+            "rate": ("%", 38),
+            "blocks": ("Blocks", 48),
+            "points": ("Points", 52),
+        }
+        for column, (heading, width) in headings.items():
+            self.report_tree.heading(column, text=heading)
+            self.report_tree.column(column, width=width, anchor="center", stretch=False)
+        self.report_tree.pack(fill=tk.BOTH, expand=True)
+
+    def _build_history_tab(self) -> None:
+        """Build session history tab backed by a fixed pool of tree rows."""
+
+        self.history_tab = ttk.Frame(self.right_tabs, style="Panel.TFrame", padding=(0, 8, 0, 0))
+        self.right_tabs.add(self.history_tab, text="📜 HISTORY")
+
+        self.history_profile_only = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.history_tab,
+            text="فقط پروفایل انتخاب‌شده",
+            variable=self.history_profile_only,
+            command=self._reset_history,
+        ).pack(anchor="w", pady=(0, 6))
+
+        container = ttk.Frame(self.history_tab, style="Panel.TFrame")
+        container.pack(fill=tk.BOTH, expand=True)
+        self.history_viewport = ListViewport(HISTORY_VISIBLE_ROWS)
+        self.history_scrollbar = ttk.Scrollbar(container, orient="vertical", command=self._on_history_scrollbar)
+        self.history_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        columns = ("date", "profile", "minutes", "blocks")
+        self.history_tree = ttk.Treeview(
+            container,
+            columns=columns,
+            show="headings",
+            style="Report.Treeview",
+            height=HISTORY_VISIBLE_ROWS,
+            selectmode="none",
+        )
+        headings = {"date": ("Date", 86), "profile": ("Profile", 80), "minutes": ("Min", 64), "blocks": ("Blocks", 50)}
+        for column, (heading, width) in headings.items():
+            self.history_tree.heading(column, text=heading)
+            self.history_tree.column(column, width=width, anchor="center", stretch=False)
+        self.history_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Rows are created once and recycled; scrolling only rewrites their values.
+        self._history_items = [
+            self.history_tree.insert("", tk.END, values=("", "", "", "")) for _ in range(HISTORY_VISIBLE_ROWS)
+        ]
+        self.history_tree.bind("<MouseWheel>", lambda event: self._scroll_history(-1 if event.delta > 0 else 1))
+        self.history_tree.bind("<Button-4>", lambda _: self._scroll_history(-1))
+        self.history_tree.bind("<Button-5>", lambda _: self._scroll_history(1))
+
+    def _build_leaderboard_tab(self) -> None:
+        """Build household leaderboard tab."""
+
+        self.leaderboard_tab = ttk.Frame(self.right_tabs, style="Panel.TFrame", padding=(0, 8, 0, 0))
+        self.right_tabs.add(self.leaderboard_tab, text="🥇 RANKING")
+
+        self.leaderboard_period_var = tk.StringVar(value=Period.WEEKLY.value)
+        period_combo = ttk.Combobox(
+            self.leaderboard_tab,
+            textvariable=self.leaderboard_period_var,
+            values=[item.value for item in Period],
+            state="readonly",
+            width=12,
+        )
+        period_combo.pack(anchor="w", pady=(0, 6))
+        period_combo.bind("<<ComboboxSelected>>", lambda _: self._update_leaderboard())
+
+        columns = ("rank", "name", "score")
+        self.leaderboard_tree = ttk.Treeview(
+            self.leaderboard_tab,
+            columns=columns,
+            show="headings",
+            style="Report.Treeview",
+            height=LEADERBOARD_ROWS,
+        )
+        headings = {"rank": ("#", 36), "name": ("نام", 150), "score": ("Points", 80)}
+        for column, (heading, width) in headings.items():
+            self.leaderboard_tree.heading(column, text=heading)
+            self.leaderboard_tree.column(column, width=width, anchor="center", stretch=False)
+        self.leaderboard_tree.pack(fill=tk.BOTH, expand=True)
 
     def _add_spin_line(self, label: str, variable: tk.IntVar) -> None:
         """Add one setting line containing a label and spinbox."""
@@ -207,7 +405,7 @@ class MainWindow:
         ttk.Label(line, text=label, style="MenuText.TLabel").pack(side=tk.LEFT)
         ttk.Spinbox(line, from_=1, to=240, textvariable=variable, width=7).pack(side=tk.RIGHT)
 
-    def _draw_timer_ring(self, progress_ratio: float, center_text: str) -> None:
+    def _draw_timer_ring(self, progress_ratio: float, center_text: str, block_title: str = "WORK BLOCK") -> None:
         """Draw segmented circular ring with mission text in center."""
 
         self.timer_canvas.delete("all")
@@ -254,24 +452,48 @@ class MainWindow:
                 width=13,
             )
 
-        self.timer_canvas.create_text(cx, cy - 38, text="WORK BLOCK", fill="#7CF084", font=("Segoe UI", 24, "bold"))
+        self.timer_canvas.create_text(cx, cy - 38, text=block_title, fill="#7CF084", font=("Segoe UI", 24, "bold"))
         self.timer_canvas.create_text(cx, cy + 4, text=center_text, fill="#F2F6FF", font=("Segoe UI", 52, "bold"))
         self.timer_canvas.create_text(cx, cy + 58, text="Build your focus!", fill="#D7E8FF", font=("Segoe UI", 18, "bold"))
 
     def _populate_profiles(self) -> None:
-        """Populate available profile names into combobox."""
+        """Populate profile list and select the first profile."""
+
+        self._filter_profiles()
+        profile_ids = self.profile_index.search("")
+        if profile_ids:
+            self._on_profile_selected(profile_ids[0])
+
+    def _filter_profiles(self) -> None:
+        """Show profiles matching the search box; only visible rows are rendered."""
+
+        matches = self.profile_index.search(self.profile_search_var.get())
+        self.profile_list.set_items(matches, self._profile_row_text)
+
+    def _profile_row_text(self, profile_id: str) -> str:
+        """Return list row text for a profile id."""
+
+        profile = self.profile_map[profile_id]
+        return f"{profile.title}  ·  {profile.profile_id}"
+
+    def _on_profile_selected(self, profile_id: str) -> None:
+        """Remember selected profile id and load its values."""
+
+        self.selected_profile_id = profile_id
+        self.profile_list.select(profile_id)
+        self._fill_selected_profile()
 
-        profile_names = list(self.profile_map.keys())
-        self.profile_combo["values"] = profile_names
-        if profile_names:
-            self.profile_combo.current(0)
-            self._fill_selected_profile()
+    def _selected_profile(self) -> Optional[TaskProfile]:
+        """Return currently selected profile, if any."""
+
+        if self.selected_profile_id is None:
+            return None
+        return self.profile_map.get(self.selected_profile_id)
 
     def _fill_selected_profile(self) -> None:
         """Load selected profile values into controls."""
 
-        selected_name = self.profile_var.get()
-        profile = self.profile_map.get(selected_name)
+        profile = self._selected_profile()
         if not profile:
             return
 
@@ -289,8 +511,7 @@ class MainWindow:
     def _save_current_profile(self) -> None:
         """Save profile setting values to persistence layer."""
 
-        selected_name = self.profile_var.get()
-        profile = self.profile_map.get(selected_name)
+        profile = self._selected_profile()
         if not profile:
             self.status_var.set("ابتدا یک پروفایل انتخاب کن")
             return
@@ -304,9 +525,17 @@ class MainWindow:
             alert_before_end_minutes=self.alert_var.get(),
             settings=profile.settings,
         )
-        self._on_save_profile(updated)
-        self.profile_map[updated.title] = updated
+        try:
+            self._on_save_profile(updated)
+        except ValueError:
+            self.status_var.set(f"قوانین امتیازدهی {updated.title} نامعتبر است")
+            return
         self.status_var.set(f"تنظیمات {updated.title} ذخیره شد")
+        if self._event_driven:
+            return
+        self.profile_map[updated.profile_id] = updated
+        self.profile_index.upsert(updated)
+        self.profile_list.refresh()
         self._fill_selected_profile()
 
     def _on_scale_change(self, value: str) -> None:
@@ -316,6 +545,66 @@ class MainWindow:
         self.completed_var.set(minutes)
         self.completed_label.configure(text=f"{minutes} دقیقه")
 
+    def _subscribe(self, event_bus: EventBus) -> None:
+        """Map controller events to dirty sections."""
+
+        refresher = self.refresher
+        refresher.register("scores", self._flush_scores)
+        refresher.register("profiles", self.profile_list.refresh)
+        refresher.register("selected", self._fill_selected_profile)
+        refresher.register("tabs", self._refresh_visible_tab)
+
+        event_bus.subscribe(ScoreChanged, self._on_score_changed)
+        event_bus.subscribe(RewardUnlocked, lambda _: refresher.mark("scores"))
+        event_bus.subscribe(SessionsRecorded, lambda _: refresher.mark("tabs"))
+        event_bus.subscribe(ProfileUpdated, lambda event: self._on_profile_updated(event.profile))
+        event_bus.subscribe(StateReloaded, lambda _: self._mark_all_dirty())
+
+    def _on_score_changed(self, event: ScoreChanged) -> None:
+        """Keep the published scores so the flush does not pull them again."""
+
+        self._latest_scores = event.scores
+        self.refresher.mark("scores")
+
+    def _mark_all_dirty(self) -> None:
+        """Schedule a refresh of every section."""
+
+        for section in ("scores", "profiles", "selected", "tabs"):
+            self.refresher.mark(section)
+
+    def _on_profile_updated(self, profile: TaskProfile) -> None:
+        """Index a changed profile; reload controls only if its timings changed."""
+
+        previous = self.profile_map.get(profile.profile_id)
+        self.profile_map[profile.profile_id] = profile
+        self.profile_index.upsert(profile)
+        self.refresher.mark("profiles")
+        if previous is None:
+            self._filter_profiles()
+        timings = ("total_minutes", "focus_minutes", "break_minutes", "alert_before_end_minutes")
+        if profile.profile_id == self.selected_profile_id and (
+            previous is None or any(getattr(previous, name) != getattr(profile, name) for name in timings)
+        ):
+            self.refresher.mark("selected")
+
+    def _flush_scores(self) -> None:
+        """Write changed score and reward values to their variables."""
+
+        scores = self._latest_scores or self._on_get_scores()
+        self._latest_scores = None
+        next_reward_title, remaining = self._on_get_next_reward(Period.WEEKLY)
+        assign = self.refresher.assign
+        assign(self.points_var, str(scores.weekly))
+        assign(self.weekly_var, str(scores.weekly))
+        assign(self.next_reward_var, next_reward_title)
+        assign(self.remaining_var, str(remaining))
+
+    def _after_action(self) -> None:
+        """Refresh after a user action unless change events already cover it."""
+
+        if not self._event_driven:
+            self._update_scoreboard()
+
     def _update_scoreboard(self) -> None:
         """Refresh score and reward information from controller callbacks."""
 
@@ -325,12 +614,301 @@ class MainWindow:
         self.weekly_var.set(str(scores.weekly))
         self.next_reward_var.set(next_reward_title)
         self.remaining_var.set(str(remaining))
+        self._refresh_visible_tab()
+
+    def _refresh_visible_tab(self) -> None:
+        """Refresh data of the tab that just became visible."""
+
+        self._update_report()
+        self._update_history()
+        self._update_leaderboard()
+
+    def _reset_history(self) -> None:
+        """Jump history view back to the newest session."""
+
+        self.history_viewport.scroll_to(0)
+        self._update_history()
+
+    def _scroll_history(self, rows: int) -> str:
+        """Scroll history by rows; returns "break" to stop default tree scrolling."""
+
+        self.history_viewport.scroll_by(rows)
+        self._update_history()
+        return "break"
+
+    def _on_history_scrollbar(self, action: str, amount: str, unit: str = "units") -> None:
+        """Translate scrollbar commands into history viewport moves."""
+
+        if action == "moveto":
+            self.history_viewport.moveto(float(amount))
+        elif unit == "pages":
+            self.history_viewport.scroll_by(int(amount) * HISTORY_VISIBLE_ROWS)
+        else:
+            self.history_viewport.scroll_by(int(amount))
+        self._update_history()
+
+    def _update_history(self) -> None:
+        """Fetch and render only the visible history rows."""
+
+        if self._on_get_history is None or self.right_tabs.select() != str(self.history_tab):
+            return
+
+        profile_id = self.selected_profile_id if self.history_profile_only.get() else None
+        viewport = self.history_viewport
+        requested_offset = viewport.offset
+        total, rows = self._on_get_history(requested_offset, HISTORY_VISIBLE_ROWS, profile_id)
+        viewport.set_total(total)
+        if viewport.offset != requested_offset:
+            total, rows = self._on_get_history(viewport.offset, HISTORY_VISIBLE_ROWS, profile_id)
+
+        for position, item in enumerate(self._history_items):
+            if position < len(rows):
+                session = rows[position]
+                profile = self.profile_map.get(session.profile_id)
+                values = (
+                    session.session_date.isoformat(),
+                    profile.title if profile else session.profile_id,
+                    f"{session.completed_minutes}/{session.planned_minutes}",
+                    session.completed_focus_blocks,
+                )
+            else:
+                values = ("", "", "", "")
+            self.history_tree.item(item, values=values)
+        self.history_scrollbar.set(*viewport.scrollbar_fractions())
+
+    def _update_report(self) -> None:
+        """Render selected period report when its tab is visible."""
+
+        if self._on_get_report is None or self.right_tabs.select() != str(self.report_tab):
+            return
+
+        rows = self._on_get_report(Period(self.report_period_var.get()))
+        self.report_tree.delete(*self.report_tree.get_children())
+        for row in reversed(rows):
+            totals = row.totals
+            profile = self.profile_map.get(row.profile_id)
+            self.report_tree.insert(
+                "",
+                tk.END,
+                values=(
+                    row.bucket,
+                    profile.title if profile else row.profile_id,
+                    totals.completed_minutes,
+                    f"{totals.completion_rate * 100:.0f}",
+                    totals.completed_focus_blocks,
+                    totals.points,
+                ),
+            )
+
+    def _update_leaderboard(self) -> None:
+        """Render the household top list when its tab is visible."""
+
+        if self._on_get_leaderboard is None or self.right_tabs.select() != str(self.leaderboard_tab):
+            return
+
+        entries = self._on_get_leaderboard(Period(self.leaderboard_period_var.get()), LEADERBOARD_ROWS)
+        self.leaderboard_tree.delete(*self.leaderboard_tree.get_children())
+        for entry in entries:
+            self.leaderboard_tree.insert("", tk.END, values=(entry.rank, entry.name, entry.score))
 
     def _run_session(self) -> None:
-        """Run selected profile and update ring + scoreboard feedback."""
+        """Start a live countdown for the selected profile (or log it directly)."""
+
+        if self._on_begin_live is None:
+            self._log_manual_session()
+            return
+        if self._live_profile is not None:
+            if self._on_live_pause is not None:
+                self._toggle_live_pause()
+            return
+
+        profile = self._selected_profile()
+        if not profile:
+            self.status_var.set("پروفایل معتبر انتخاب نشده")
+            return
+
+        try:
+            live = self._on_begin_live(profile.profile_id)
+        except ValueError:
+            self.status_var.set("ماموریت دیگری در پنجره دیگر برنامه در حال اجراست")
+            return
+        self._start_live_countdown(live)
+        self.status_var.set(f"ماموریت {profile.title} شروع شد")
+
+    def _start_live_countdown(self, live: LiveSessionState) -> None:
+        """Begin ticking a live session from its already elapsed seconds."""
+
+        profile = self.profile_map[live.profile_id]
+        planner = PomodoroBlockPlanner(focus_minutes=profile.focus_minutes, break_minutes=profile.break_minutes)
+        self._live_profile = profile
+        self._live_blocks = planner.build_blocks(profile.total_minutes)
+        self._live_base_elapsed = live.elapsed_seconds
+        self._live_started = time.monotonic()
+        self._live_paused = False
+        block_ends: List[int] = []
+        for block in self._live_blocks:
+            block_ends.append((block_ends[-1] if block_ends else 0) + block.duration_minutes * 60000)
+        alert_at = (profile.total_minutes - profile.alert_before_end_minutes) * 60000
+        self._live_pacer = LivePacer(
+            block_ends,
+            alert_at,
+            start_ms=live.elapsed_seconds * 1000,
+            visibility=self._visibility(),
+            frame_ms=LIVE_TICK_MS,
+        )
+        self._live_tick()
+
+    def _live_tick(self) -> None:
+        """Advance live countdown, checkpoint through the controller and redraw if seen.
+
+        The pacer decides the next wakeup: every frame while visible, fewer
+        while unfocused or hidden, but always exactly at block ends, the
+        end-of-session alert and the session end.
+        """
+
+        self._live_after_id = None
+        profile = self._live_profile
+        pacer = self._live_pacer
+        if profile is None or pacer is None or self._live_paused:
+            return
 
-        selected_name = self.profile_var.get()
-        profile = self.profile_map.get(selected_name)
+        total_ms = profile.total_minutes * 60000
+        elapsed_ms = min(self._live_base_elapsed * 1000 + int((time.monotonic() - self._live_started) * 1000), total_ms)
+        elapsed = elapsed_ms // 1000
+        events = pacer.advance(elapsed_ms)
+        if self._on_live_tick is not None:
+            self._on_live_tick(elapsed)
+        if "alert" in events:
+            self.status_var.set(f"ماموریت {profile.title} نزدیک به پایان است")
+            self.root.bell()
+        if pacer.should_draw(elapsed_ms, events):
+            self._draw_live_frame(elapsed)
+
+        if elapsed_ms >= total_ms:
+            self._finish_live_session()
+            return
+        self._live_after_id = self.root.after(pacer.next_delay_ms(elapsed_ms), self._live_tick)
+
+    def _toggle_live_pause(self) -> None:
+        """Pause the live countdown at the current second, or resume it."""
+
+        profile = self._live_profile
+        if profile is None or self._on_live_pause is None:
+            return
+
+        if self._live_paused:
+            self._live_paused = False
+            self._live_started = time.monotonic()
+            self._on_live_pause(False)
+            self.status_var.set(f"ماموریت {profile.title} ادامه یافت")
+            self._live_tick()
+            return
+
+        if self._live_after_id is not None:
+            self.root.after_cancel(self._live_after_id)
+            self._live_after_id = None
+        elapsed = self._live_base_elapsed + int(time.monotonic() - self._live_started)
+        self._live_base_elapsed = min(elapsed, profile.total_minutes * 60)
+        if self._on_live_tick is not None:
+            self._on_live_tick(self._live_base_elapsed)
+        self._live_paused = True
+        self._on_live_pause(True)
+        self._draw_live_frame(self._live_base_elapsed)
+        self.status_var.set(f"ماموریت {profile.title} متوقف موقت شد")
+
+    def _visibility(self) -> Visibility:
+        """Return window visibility from the last map and focus events."""
+
+        if not self._window_mapped:
+            return Visibility.HIDDEN
+        return Visibility.VISIBLE if self._window_focused else Visibility.UNFOCUSED
+
+    def _on_map_changed(self, event: tk.Event, mapped: bool) -> None:
+        """Track minimize/restore of the main window (child widgets also report here)."""
+
+        if event.widget is self.root:
+            self._window_mapped = mapped
+            self._apply_visibility()
+
+    def _on_focus_changed(self) -> None:
+        """Track whether any widget of the app has keyboard focus."""
+
+        try:
+            self._window_focused = self.root.focus_get() is not None
+        except KeyError:
+            # Combobox popdowns are not registered widgets but do hold focus.
+            self._window_focused = True
+        self._apply_visibility()
+
+    def _apply_visibility(self) -> None:
+        """Pass visibility to the live pacer and draw one catch-up frame on restore."""
+
+        if self._live_pacer is None or not self._live_pacer.set_visibility(self._visibility()):
+            return
+        if self._live_after_id is not None:
+            self.root.after_cancel(self._live_after_id)
+        self._live_after_id = self.root.after_idle(self._live_tick)
+
+    def _draw_live_frame(self, elapsed_seconds: int) -> None:
+        """Draw ring progress and remaining time of the current block."""
+
+        profile = self._live_profile
+        if profile is None:
+            return
+
+        block_end = 0
+        current = self._live_blocks[-1]
+        for block in self._live_blocks:
+            block_end += block.duration_minutes * 60
+            if elapsed_seconds < block_end:
+                current = block
+                break
+        remaining = max(block_end - elapsed_seconds, 0)
+        title = "WORK BLOCK" if current.block_type == "focus" else "BREAK BLOCK"
+        ratio = elapsed_seconds / max(profile.total_minutes * 60, 1)
+        self._draw_timer_ring(progress_ratio=ratio, center_text=format_mm_ss(remaining), block_title=title)
+
+    def _finish_live_session(self) -> None:
+        """Stop ticking and record the live session."""
+
+        if self._live_after_id is not None:
+            self.root.after_cancel(self._live_after_id)
+            self._live_after_id = None
+        self._live_profile = None
+        self._live_pacer = None
+        self._live_paused = False
+        if self._on_finish_live is None:
+            return
+
+        self.status_var.set(self._on_finish_live())
+        self._after_action()
+
+    def _offer_pending_session(self, pending: LiveSessionState) -> None:
+        """Ask whether to resume or finalize a session interrupted by a crash."""
+
+        profile = self.profile_map.get(pending.profile_id)
+        title = profile.title if profile else pending.profile_id
+        resume = messagebox.askyesno(
+            "ادامه ماموریت",
+            f"ماموریت {title} ({format_mm_ss(pending.elapsed_seconds)}) نیمه‌کاره ماند. ادامه می‌دهی؟",
+            parent=self.root,
+        )
+        if resume and profile and self._on_resume_pending is not None:
+            live = self._on_resume_pending()
+            if live is not None:
+                self._on_profile_selected(live.profile_id)
+                self._start_live_countdown(live)
+                self.status_var.set(f"ماموریت {title} ادامه یافت")
+                return
+
+        if self._on_finalize_pending is not None:
+            self.status_var.set(self._on_finalize_pending())
+            self._after_action()
+
+    def _log_manual_session(self) -> None:
+        """Record slider minutes for the selected profile and update ring + scoreboard."""
+
+        profile = self._selected_profile()
         if not profile:
             self.status_var.set("پروفایل معتبر انتخاب نشده")
             return
@@ -341,13 +919,16 @@ class MainWindow:
 
         message = self._on_start_clicked(profile.profile_id, completed)
         self.status_var.set(message)
-        self._update_scoreboard()
+        self._after_action()
 
     def _stop_session(self) -> None:
-        """Stop visual mission state and reset ring to current focus duration."""
+        """Stop live session (recording it) or reset ring to current focus duration."""
+
+        if self._live_profile is not None:
+            self._finish_live_session()
+            return
 
-        selected_name = self.profile_var.get()
-        profile = self.profile_map.get(selected_name)
+        profile = self._selected_profile()
         center_time = "00:00" if not profile else f"{profile.focus_minutes:02}:00"
         self._draw_timer_ring(progress_ratio=0.0, center_text=center_time)
         self.status_var.set("جلسه متوقف شد")
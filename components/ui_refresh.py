@@ -0,0 +1,101 @@
+"""Dirty tracking that batches widget refreshes into one idle flush."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Protocol, Set
+
+
+class Variable(Protocol):
+    """Subset of ``tk.Variable`` used for change-checked assignment."""
+
+    def get(self) -> Any:
+        """Return current value."""
+
+    def set(self, value: Any) -> None:
+        """Replace current value."""
+
+
+@dataclass
+class RefreshStats:
+    """Counters showing how much refresh work dirty tracking avoided.
+
+    Attributes:
+        marks: Dirty marks received (one per relevant event).
+        flushes: Idle flushes that ran.
+        handler_runs: Section refreshes performed.
+        writes: Widget variable writes performed.
+        skipped_writes: Writes avoided because the value was unchanged.
+    """
+
+    marks: int = 0
+    flushes: int = 0
+    handler_runs: int = 0
+    writes: int = 0
+    skipped_writes: int = 0
+
+    @property
+    def coalesced_marks(self) -> int:
+        """Return marks merged into an already pending section refresh."""
+
+        return self.marks - self.handler_runs
+
+
+class RefreshScheduler:
+    """Collects dirty sections and refreshes each at most once per loop turn.
+
+    Kept free of tkinter so batching can be tested headless; the window
+    passes ``root.after_idle`` as ``schedule``.
+    """
+
+    def __init__(self, schedule: Callable[[Callable[[], None]], object]) -> None:
+        """Initialize scheduler with an idle-callback scheduling function."""
+
+        self._schedule = schedule
+        self._handlers: Dict[str, Callable[[], None]] = {}
+        self._order: List[str] = []
+        self._dirty: Set[str] = set()
+        self._pending = False
+        self.stats = RefreshStats()
+
+    def register(self, section: str, handler: Callable[[], None]) -> None:
+        """Register the refresh handler of a section; flush runs them in registration order."""
+
+        if section not in self._handlers:
+            self._order.append(section)
+        self._handlers[section] = handler
+
+    def mark(self, section: str) -> None:
+        """Mark a section dirty and schedule a flush if none is pending."""
+
+        if section not in self._handlers:
+            raise ValueError(f"Unknown refresh section: {section}")
+
+        self.stats.marks += 1
+        self._dirty.add(section)
+        if not self._pending:
+            self._pending = True
+            self._schedule(self.flush)
+
+    def flush(self) -> None:
+        """Run handlers of all dirty sections once."""
+
+        dirty, self._dirty = self._dirty, set()
+        self._pending = False
+        if not dirty:
+            return
+        self.stats.flushes += 1
+        for section in self._order:
+            if section in dirty:
+                self.stats.handler_runs += 1
+                self._handlers[section]()
+
+    def assign(self, variable: Variable, value: Any) -> bool:
+        """Set ``variable`` only when ``value`` differs; returns True when written."""
+
+        if variable.get() == value:
+            self.stats.skipped_writes += 1
+            return False
+        variable.set(value)
+        self.stats.writes += 1
+        return True
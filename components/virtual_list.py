@@ -0,0 +1,193 @@
+"""Virtualized list widget that only creates widgets for visible rows."""
+
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+class ListViewport:
+    """Tracks which window of a long list is visible.
+
+    Kept free of tkinter so scrolling math can be tested headless.
+    """
+
+    def __init__(self, visible_rows: int) -> None:
+        """Initialize viewport with a fixed number of visible rows."""
+
+        if visible_rows <= 0:
+            raise ValueError("Visible rows must be positive")
+
+        self.visible_rows = visible_rows
+        self.total = 0
+        self.offset = 0
+
+    @property
+    def max_offset(self) -> int:
+        """Return the largest offset that still fills the viewport."""
+
+        return max(self.total - self.visible_rows, 0)
+
+    def set_total(self, total: int) -> None:
+        """Update item count, keeping the offset within range."""
+
+        self.total = max(total, 0)
+        self.offset = min(self.offset, self.max_offset)
+
+    def scroll_to(self, offset: int) -> None:
+        """Move the first visible row to ``offset`` (clamped)."""
+
+        self.offset = max(0, min(offset, self.max_offset))
+
+    def scroll_by(self, rows: int) -> None:
+        """Scroll relative to the current offset."""
+
+        self.scroll_to(self.offset + rows)
+
+    def moveto(self, fraction: float) -> None:
+        """Scroll to a scrollbar fraction in ``[0, 1]``."""
+
+        self.scroll_to(round(fraction * self.total))
+
+    def ensure_visible(self, index: int) -> None:
+        """Scroll the minimum amount needed to show row ``index``."""
+
+        if index < self.offset:
+            self.scroll_to(index)
+        elif index >= self.offset + self.visible_rows:
+            self.scroll_to(index - self.visible_rows + 1)
+
+    def visible_range(self) -> Tuple[int, int]:
+        """Return ``(start, stop)`` indexes of visible rows."""
+
+        return self.offset, min(self.offset + self.visible_rows, self.total)
+
+    def scrollbar_fractions(self) -> Tuple[float, float]:
+        """Return ``(first, last)`` fractions for a scrollbar ``set`` call."""
+
+        if self.total <= self.visible_rows:
+            return 0.0, 1.0
+        start, stop = self.visible_range()
+        return start / self.total, stop / self.total
+
+
+class VirtualList:
+    """Scrollable single-selection list backed by a fixed pool of labels.
+
+    Items are keys; their display text is produced only for visible rows,
+    so catalogs of any size cost the same number of widgets.
+    """
+
+    def __init__(
+        self,
+        parent: tk.Misc,
+        on_select: Callable[[str], None],
+        visible_rows: int = 8,
+        background: str = "#0F1B27",
+        foreground: str = "#D7E8FF",
+        selected_background: str = "#4AD66D",
+        selected_foreground: str = "#101910",
+    ) -> None:
+        """Create list frame, row label pool and scrollbar."""
+
+        self._on_select = on_select
+        self._colors = (background, foreground, selected_background, selected_foreground)
+        self.viewport = ListViewport(visible_rows)
+        self._keys: Sequence[str] = ()
+        self._text_for: Callable[[str], str] = str
+        self.selected_key: Optional[str] = None
+        self._rendered: List[Tuple[Optional[str], str, bool]] = [(None, "", False)] * visible_rows
+
+        self.frame = tk.Frame(parent, bg=background)
+        self._scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+        self._scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        rows_frame = tk.Frame(self.frame, bg=background)
+        rows_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self._rows: List[tk.Label] = []
+        for row_index in range(visible_rows):
+            label = tk.Label(rows_frame, anchor="w", bg=background, fg=foreground, font=("Segoe UI", 10), padx=6)
+            label.pack(fill=tk.X)
+            label.bind("<Button-1>", lambda _, index=row_index: self._click_row(index))
+            label.bind("<MouseWheel>", self._on_mousewheel)
+            label.bind("<Button-4>", lambda _: self._scroll(-1))
+            label.bind("<Button-5>", lambda _: self._scroll(1))
+            self._rows.append(label)
+
+    def pack(self, **kwargs: object) -> None:
+        """Pack the list container frame."""
+
+        self.frame.pack(**kwargs)
+
+    def set_items(self, keys: Sequence[str], text_for: Callable[[str], str]) -> None:
+        """Replace list contents; only visible rows are formatted."""
+
+        self._keys = keys
+        self._text_for = text_for
+        self.viewport.set_total(len(keys))
+        self.viewport.scroll_to(0)
+        self._render()
+
+    def select(self, key: Optional[str]) -> None:
+        """Highlight ``key`` without firing the selection callback."""
+
+        self.selected_key = key
+        self._render()
+
+    def refresh(self) -> None:
+        """Re-render visible rows after item text changed."""
+
+        self._rendered = [(None, "", False)] * len(self._rows)
+        self._render()
+
+    def _render(self) -> None:
+        """Push visible slice into the label pool, touching only changed rows."""
+
+        background, foreground, selected_background, selected_foreground = self._colors
+        start, stop = self.viewport.visible_range()
+        for row_index, label in enumerate(self._rows):
+            item_index = start + row_index
+            key = self._keys[item_index] if item_index < stop else None
+            text = self._text_for(key) if key is not None else ""
+            selected = key is not None and key == self.selected_key
+            if self._rendered[row_index] == (key, text, selected):
+                continue
+            self._rendered[row_index] = (key, text, selected)
+            label.configure(
+                text=text,
+                bg=selected_background if selected else background,
+                fg=selected_foreground if selected else foreground,
+            )
+        self._scrollbar.set(*self.viewport.scrollbar_fractions())
+
+    def _click_row(self, row_index: int) -> None:
+        """Select the item shown in a pool row."""
+
+        key = self._rendered[row_index][0]
+        if key is None:
+            return
+        self.select(key)
+        self._on_select(key)
+
+    def _scroll(self, rows: int) -> None:
+        """Scroll by rows and re-render."""
+
+        self.viewport.scroll_by(rows)
+        self._render()
+
+    def _on_mousewheel(self, event: tk.Event) -> None:
+        """Translate wheel deltas (120 per notch on Windows) into row scrolling."""
+
+        self._scroll(-1 if event.delta > 0 else 1)
+
+    def _on_scrollbar(self, action: str, amount: str, unit: str = "units") -> None:
+        """Handle ttk scrollbar ``moveto`` and ``scroll`` commands."""
+
+        if action == "moveto":
+            self.viewport.moveto(float(amount))
+        elif unit == "pages":
+            self.viewport.scroll_by(int(amount) * self.viewport.visible_rows)
+        else:
+            self.viewport.scroll_by(int(amount))
+        self._render()
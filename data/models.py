@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import date
 from enum import Enum
-from typing import Dict, List
+from typing import Any, Dict, List
 
 
 class Period(str, Enum):
@@ -24,11 +24,15 @@ class RewardRule:
         period: Period granularity.
         target_score: Required minimum score to unlock reward.
         reward_title: Human-readable reward label.
+        origin: Device that added the reward (sync stamp).
+        origin_sequence: Per-device sequence number of that change.
     """
 
     period: Period
     target_score: int
     reward_title: str
+    origin: str = ""
+    origin_sequence: int = 0
 
 
 @dataclass
@@ -43,6 +47,8 @@ class TaskProfile:
         break_minutes: Break block duration.
         alert_before_end_minutes: Remaining-time reminder threshold.
         settings: Profile-specific settings.
+        origin: Device that made the last change (sync stamp).
+        origin_sequence: Per-device sequence number of that change.
     """
 
     profile_id: str
@@ -52,6 +58,8 @@ class TaskProfile:
     break_minutes: int = 5
     alert_before_end_minutes: int = 5
     settings: Dict[str, str] = field(default_factory=dict)
+    origin: str = ""
+    origin_sequence: int = 0
 
 
 @dataclass
@@ -65,13 +73,68 @@ class ScoreSnapshot:
 
 @dataclass
 class SessionRecord:
-    """Represents one finished or interrupted profile session."""
+    """Represents one finished or interrupted profile session.
+
+    ``sequence`` is a per-state increasing number that orders sessions of
+    the same day and serves as the tie-breaker of history cursors.
+    ``origin``/``origin_sequence`` identify the session across devices.
+    """
 
     profile_id: str
     planned_minutes: int
     completed_minutes: int
     completed_focus_blocks: int
     session_date: date
+    sequence: int = 0
+    origin: str = ""
+    origin_sequence: int = 0
+
+
+@dataclass
+class DailyAggregate:
+    """Per-profile totals of one day whose sessions were folded by retention.
+
+    ``points`` are the session points at folding time; they are kept as-is
+    when scoring rules change later.
+    """
+
+    profile_id: str
+    day: date
+    planned_minutes: int = 0
+    completed_minutes: int = 0
+    completed_focus_blocks: int = 0
+    points: int = 0
+    sessions: int = 0
+
+
+@dataclass
+class StreakState:
+    """Compact persisted state for daily streaks and weekly consistency.
+
+    Attributes:
+        day_runs: Runs of consecutive active days as start -> end date ordinals.
+        week_masks: ISO week label -> bitmask of active weekdays (bit 0 = Monday).
+    """
+
+    day_runs: Dict[int, int] = field(default_factory=dict)
+    week_masks: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class SyncState:
+    """Device identity and sequence bookkeeping for change-set sync.
+
+    Attributes:
+        device_id: Identifier of this installation.
+        clock: Last per-device sequence number issued (Lamport clock).
+        seen: Highest sequence merged so far from each device, including this one.
+        peers: Peer device -> its ``seen`` vector at its last change set.
+    """
+
+    device_id: str = ""
+    clock: int = 0
+    seen: Dict[str, int] = field(default_factory=dict)
+    peers: Dict[str, Dict[str, int]] = field(default_factory=dict)
 
 
 @dataclass
@@ -82,3 +145,9 @@ class AppState:
     rewards: List[RewardRule] = field(default_factory=list)
     scores: ScoreSnapshot = field(default_factory=ScoreSnapshot)
     sessions: List[SessionRecord] = field(default_factory=list)
+    streaks: StreakState = field(default_factory=StreakState)
+    scoring_rules: List[Dict[str, Any]] = field(default_factory=list)
+    sync: SyncState = field(default_factory=SyncState)
+    daily_totals: List[DailyAggregate] = field(default_factory=list)
+    # Highest session sequence ever assigned, so numbers of archived sessions are never reused.
+    last_sequence: int = 0
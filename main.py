@@ -3,15 +3,45 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 from components.main_window import MainWindow
+from data.models import Period
 from services.app_controller import AppController
+from services.maintenance import IdleDriver, MaintenanceScheduler
+from utils.profiling import CONTROLLER_ACTIONS, WINDOW_ACTIONS, capture_from_env
+
+if TYPE_CHECKING:
+    from services.leaderboard import HouseholdLeaderboard, LeaderboardEntry
+
+
+def lazy_leaderboard(local_store: Path, household_dir: Path) -> Callable[[Period, int], List[LeaderboardEntry]]:
+    """Return a standings callback that reads household stores on first use."""
+
+    leaderboard: Optional[HouseholdLeaderboard] = None
+
+    def standings(period: Period, limit: int) -> List[LeaderboardEntry]:
+        nonlocal leaderboard
+        if leaderboard is None:
+            from services.leaderboard import HouseholdLeaderboard, household_stores
+
+            leaderboard = HouseholdLeaderboard()
+            leaderboard.add_child("local", "من", local_store)
+            for child_id, path in household_stores(household_dir).items():
+                leaderboard.add_child(child_id, child_id, path)
+        return leaderboard.standings(period, limit)
+
+    return standings
 
 
 def main() -> None:
     """Create app controller and launch main window."""
 
     app_controller = AppController(storage_path=Path("data/app_state.json"))
+    capture = capture_from_env(Path("data/profiles"))
+    if capture is not None:
+        capture.instrument(app_controller, CONTROLLER_ACTIONS)
+        capture.instrument(MainWindow, WINDOW_ACTIONS)
     profiles = app_controller.list_profiles()
 
     window = MainWindow(
@@ -20,7 +50,21 @@ def main() -> None:
         on_save_profile=app_controller.upsert_profile,
         on_get_scores=app_controller.get_scores,
         on_get_next_reward=app_controller.get_next_reward_progress,
+        on_get_report=app_controller.get_report,
+        on_get_history=app_controller.get_history_window,
+        on_begin_live=app_controller.begin_live_session,
+        on_live_tick=app_controller.tick_live_session,
+        on_finish_live=app_controller.finish_live_session,
+        on_live_pause=app_controller.set_live_paused,
+        pending_session=app_controller.pending_live_session,
+        on_resume_pending=app_controller.resume_pending_session,
+        on_finalize_pending=app_controller.finalize_pending_session,
+        on_get_leaderboard=lazy_leaderboard(app_controller.repository.storage_path, Path("data/household")),
+        event_bus=app_controller.events,
     )
+    scheduler = MaintenanceScheduler()
+    app_controller.register_maintenance(scheduler)
+    IdleDriver(scheduler, window.root.after_idle, window.root.after).start()
     window.run()
 
 
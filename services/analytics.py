@@ -0,0 +1,154 @@
+"""Pre-aggregated session analytics keyed by profile and calendar period."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from data.models import DailyAggregate, Period, SessionRecord
+
+
+@dataclass
+class PeriodAggregate:
+    """Running sums for one profile inside one period bucket."""
+
+    planned_minutes: int = 0
+    completed_minutes: int = 0
+    completed_focus_blocks: int = 0
+    points: int = 0
+    sessions: int = 0
+
+    @property
+    def completion_rate(self) -> float:
+        """Return completed/planned minutes ratio in ``[0, 1]``."""
+
+        if self.planned_minutes <= 0:
+            return 0.0
+        return min(self.completed_minutes / self.planned_minutes, 1.0)
+
+
+@dataclass(frozen=True)
+class ReportRow:
+    """One row of a period report."""
+
+    profile_id: str
+    bucket: str
+    totals: PeriodAggregate
+
+
+def bucket_key(period: Period, day: date) -> str:
+    """Return the bucket label of ``day`` for a period (ISO week, month or year)."""
+
+    if period == Period.WEEKLY:
+        iso_year, iso_week, _ = day.isocalendar()
+        return f"{iso_year}-W{iso_week:02}"
+    if period == Period.MONTHLY:
+        return f"{day.year}-{day.month:02}"
+    return str(day.year)
+
+
+# Profile id -> bucket label -> running totals.
+ProfileCube = Dict[str, Dict[str, PeriodAggregate]]
+
+
+class ReportEngine:
+    """Maintains profile x period cubes updated incrementally per session.
+
+    Every report reads only the cube cells it returns, so its cost is
+    proportional to the number of buckets rather than to session history.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty cubes for every supported period."""
+
+        self._cubes: Dict[Period, ProfileCube] = {period: {} for period in Period}
+
+    def rebuild(
+        self,
+        sessions: Iterable[SessionRecord],
+        points: Iterable[int],
+        daily_totals: Iterable[DailyAggregate] = (),
+    ) -> None:
+        """Recreate all cubes from stored sessions and their points.
+
+        Used at startup and after scoring rules change. ``daily_totals``
+        adds days whose sessions were folded by retention.
+        """
+
+        self._cubes = {period: {} for period in Period}
+        for session, session_points in zip(sessions, points):
+            self.add_session(session, session_points)
+        for item in daily_totals:
+            self.add_totals(
+                item.profile_id,
+                item.day,
+                PeriodAggregate(
+                    planned_minutes=item.planned_minutes,
+                    completed_minutes=item.completed_minutes,
+                    completed_focus_blocks=item.completed_focus_blocks,
+                    points=item.points,
+                    sessions=item.sessions,
+                ),
+            )
+
+    def add_session(self, session: SessionRecord, points: int) -> None:
+        """Fold one scored session into every period cube."""
+
+        self.add_totals(
+            session.profile_id,
+            session.session_date,
+            PeriodAggregate(
+                planned_minutes=session.planned_minutes,
+                completed_minutes=session.completed_minutes,
+                completed_focus_blocks=session.completed_focus_blocks,
+                points=points,
+                sessions=1,
+            ),
+        )
+
+    def add_totals(self, profile_id: str, day: date, totals: PeriodAggregate) -> None:
+        """Fold pre-summed totals for one profile and day into every cube."""
+
+        for period, cube in self._cubes.items():
+            buckets = cube.setdefault(profile_id, {})
+            key = bucket_key(period, day)
+            cell = buckets.get(key)
+            if cell is None:
+                cell = buckets[key] = PeriodAggregate()
+            cell.planned_minutes += totals.planned_minutes
+            cell.completed_minutes += totals.completed_minutes
+            cell.completed_focus_blocks += totals.completed_focus_blocks
+            cell.points += totals.points
+            cell.sessions += totals.sessions
+
+    def report(self, period: Period, profile_id: Optional[str] = None) -> List[ReportRow]:
+        """Return rows ordered by bucket then profile for one period."""
+
+        cube = self._cubes[period]
+        profile_ids = [profile_id] if profile_id is not None else sorted(cube)
+        rows = [
+            ReportRow(profile_id=item, bucket=bucket, totals=totals)
+            for item in profile_ids
+            for bucket, totals in cube.get(item, {}).items()
+        ]
+        rows.sort(key=lambda row: (row.bucket, row.profile_id))
+        return rows
+
+    def totals(self, period: Period, day: date, profile_id: Optional[str] = None) -> PeriodAggregate:
+        """Return totals of the bucket containing ``day``, optionally for one profile."""
+
+        cube = self._cubes[period]
+        key = bucket_key(period, day)
+        profile_ids = [profile_id] if profile_id is not None else list(cube)
+        combined = PeriodAggregate()
+        for item in profile_ids:
+            cell = cube.get(item, {}).get(key)
+            if cell is None:
+                continue
+            combined.planned_minutes += cell.planned_minutes
+            combined.completed_minutes += cell.completed_minutes
+            combined.completed_focus_blocks += cell.completed_focus_blocks
+            combined.points += cell.points
+            combined.sessions += cell.sessions
+        return combined
@@ -2,42 +2,132 @@
 
 from __future__ import annotations
 
+import time
+from datetime import date
 from pathlib import Path
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
 
-from data.models import Period, RewardRule, ScoreSnapshot, TaskProfile
+from data.models import Period, RewardRule, ScoreSnapshot, SessionRecord, TaskProfile
+from services.checkpoint import LiveSessionState, SessionCheckpointer
+from services.events import (
+    EventBus,
+    ProfileUpdated,
+    RewardUnlocked,
+    ScoreChanged,
+    SessionsRecorded,
+    StateReloaded,
+)
 from services.notifications import NotificationService
+from services.retention import DEFAULT_RETENTION_DAYS, RetentionEngine, RetentionResult
 from services.scoring import ScoringService
+from services.scoring_rules import ScoringRuleBook, compile_rules, validate_profile_rules
+from services.streaks import StreakTracker
+from services.sync import SyncEngine, SyncReport, new_device_id
 from services.timer_service import TimerController
-from utils.storage import LocalStateRepository
+from utils.session_history import HistoryCursor, SessionHistoryRepository, SessionPage
+from utils.storage import JournalCursor, JournalEntry, LocalStateRepository, SnapshotWriter
+from utils.timeline import EventKind, TimelineEvent, decode_timeline, encode_timeline, focus_seconds, paused_seconds
+
+if TYPE_CHECKING:
+    from services.analytics import ReportEngine, ReportRow
+    from services.bulk_import import ImportBatch, ImportReport
+    from services.maintenance import MaintenanceScheduler
+
+# Journal size that makes idle maintenance fold it into a fresh snapshot.
+JOURNAL_COMPACT_BYTES = 512 * 1024
+# Journal size at which a change compacts inline because maintenance fell behind.
+JOURNAL_MAX_BYTES = 4 * 1024 * 1024
+T = TypeVar("T")
+
+# Sessions encoded, scored or filtered per unit of maintenance work; a step
+# runs as many units as fit the scheduler's slice.
+MAINTENANCE_CHUNK = 128
 
 
 class AppController:
-    """High-level controller for managing profiles, sessions and persistence."""
+    """High-level controller for managing profiles, sessions and persistence.
+
+    Several app instances may share one state file: every change is merged
+    with other processes' journal entries and appended under the
+    repository lock, and read methods merge foreign changes first.
+    Changes, local or merged, are announced on ``events``.
+    """
+
+    def __init__(
+        self,
+        storage_path: Path,
+        checkpoint_interval_seconds: float = 15.0,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+    ) -> None:
+        """Initialize controller and dependencies.
 
-    def __init__(self, storage_path: Path) -> None:
-        """Initialize controller and dependencies."""
+        Args:
+            storage_path: Main JSON state file.
+            checkpoint_interval_seconds: Minimum seconds between live session checkpoints.
+            retention_days: Days of per-session history kept by ``apply_retention``.
+        """
 
+        self._retention_days = retention_days
         self.repository = LocalStateRepository(storage_path=storage_path)
+        self.checkpointer = SessionCheckpointer(
+            storage_path.with_name(f"{storage_path.stem}.live.json"),
+            interval_seconds=checkpoint_interval_seconds,
+        )
+        self.live_session: Optional[LiveSessionState] = None
+        self._live_events: List[TimelineEvent] = []
+        self.events = EventBus()
+        self._maintenance: Optional[MaintenanceScheduler] = None
+        self._unit_seconds: Dict[str, float] = {}
         self.notification_service = NotificationService()
         self.timer_controller = TimerController(self.notification_service)
-        self.scoring_service = ScoringService()
-        self.state = self.repository.load()
-        self._ensure_default_seed_data()
+        self._load_state()
+        with self.repository.lock:
+            self._merge_journal()
+            self._ensure_default_seed_data()
+            self._backfill_streaks()
+            self._ensure_sync_identity()
+        self.pending_live_session = self.checkpointer.load()
+
+    def refresh(self) -> bool:
+        """Merge changes appended by other processes since the last read.
+
+        Returns:
+            True when the journal changed and was merged.
+        """
+
+        if self.repository.journal_signature() == self._journal_signature:
+            return False
+        if self.repository.journal_generation() not in (None, self._journal_cursor.generation):
+            # Another process compacted; the new snapshot is read without the lock.
+            self._load_state()
+            self.events.publish(StateReloaded())
+            return True
+        with self.repository.lock:
+            self._merge_journal()
+        return True
+
+    @property
+    def device_id(self) -> str:
+        """Return the sync identifier of this installation."""
+
+        return self.state.sync.device_id
 
     def list_profiles(self) -> List[TaskProfile]:
         """Return all saved task profiles."""
 
+        self.refresh()
         return list(self.state.profiles)
 
     def get_scores(self) -> ScoreSnapshot:
         """Return score snapshot for UI scoreboard."""
 
+        self.refresh()
         return self.state.scores
 
     def get_next_reward_progress(self, period: Period = Period.WEEKLY) -> Tuple[str, int]:
         """Return next reward title and remaining points for target period."""
 
+        self.refresh()
         period_score_map = {
             Period.WEEKLY: self.state.scores.weekly,
             Period.MONTHLY: self.state.scores.monthly,
@@ -55,35 +145,837 @@ class AppController:
 
         return "همه جوایز این دوره آزاد شده‌اند", 0
 
+    def get_report(self, period: Period = Period.WEEKLY, profile_id: Optional[str] = None) -> List[ReportRow]:
+        """Return pre-aggregated per-profile totals for each bucket of a period."""
+
+        self.refresh()
+        return self.reports.report(period, profile_id)
+
+    def query_sessions(
+        self,
+        profile_id: Optional[str] = None,
+        after: Optional[HistoryCursor] = None,
+        limit: int = 50,
+    ) -> SessionPage:
+        """Return one newest-first history page after a keyset cursor."""
+
+        self.refresh()
+        return self.history.page(profile_id=profile_id, after=after, limit=limit)
+
+    def get_history_window(
+        self,
+        offset: int,
+        limit: int,
+        profile_id: Optional[str] = None,
+    ) -> Tuple[int, List[SessionRecord]]:
+        """Return total row count and the visible slice for a history view."""
+
+        self.refresh()
+        return self.history.count(profile_id), self.history.window(offset, limit, profile_id)
+
+    def get_archived_sessions(
+        self,
+        first: date,
+        last: date,
+        profile_id: Optional[str] = None,
+    ) -> List[SessionRecord]:
+        """Return sessions folded by retention that are dated ``first``..``last``."""
+
+        self.refresh()
+        return self.repository.archived_sessions(first, last, profile_id)
+
     def upsert_profile(self, profile: TaskProfile) -> None:
-        """Create or update a task profile by profile_id."""
+        """Create or update a task profile by profile_id.
 
-        for index, existing in enumerate(self.state.profiles):
-            if existing.profile_id == profile.profile_id:
-                self.state.profiles[index] = profile
-                self.repository.save(self.state)
-                return
+        Raises:
+            ValueError: When the profile's scoring rules setting is invalid.
+        """
+
+        validate_profile_rules(profile)
+        with self.repository.lock:
+            self._merge_journal()
+            self.sync.stamp(profile)
+            self._apply_profile(profile)
+            self._append_journal([self.repository.profile_entry(profile)])
+        self.events.publish(ProfileUpdated(profile))
+
+    def set_scoring_rules(self, rules: List[Dict[str, Any]]) -> None:
+        """Replace global scoring rules and recompute report points in bulk.
+
+        Already awarded period scores are kept; only future sessions and
+        report points use the new rules.
 
-        self.state.profiles.append(profile)
-        self.repository.save(self.state)
+        Raises:
+            ValueError: When a rule names an unknown metric or weight.
+        """
+
+        compile_rules(rules)
+        with self.repository.lock:
+            self._merge_journal()
+            self._apply_rules(rules)
+            self._append_journal([self.repository.rules_entry(rules)])
+        self.events.publish(StateReloaded())
 
     def run_profile_session(self, profile_id: str, completed_minutes: int | None = None) -> str:
         """Run one profile session and persist resulting score/session data."""
 
+        return self._record_session(profile_id, completed_minutes)[0]
+
+    def _record_session(
+        self,
+        profile_id: str,
+        completed_minutes: int | None = None,
+        timeline: Optional[List[TimelineEvent]] = None,
+        notify: bool = True,
+    ) -> Tuple[str, SessionRecord]:
+        """Persist one session with its optional event timeline; return the message and record.
+
+        ``notify`` shows the end-of-session reminder; live sessions pass
+        False because the window alerted at the real alert time.
+        """
+
+        self.refresh()
         profile = self._find_profile(profile_id)
-        result = self.timer_controller.run_profile_session(profile, completed_minutes=completed_minutes)
-        score_result = self.scoring_service.apply_session(self.state.scores, result.session)
+        if notify:
+            # Notifications may block on a message box, so the timer runs outside the lock.
+            result = self.timer_controller.run_profile_session(profile, completed_minutes=completed_minutes)
+        else:
+            result = self.timer_controller.build_session(profile, completed_minutes=completed_minutes)
+        session = result.session
+
+        with self.repository.lock:
+            self._merge_journal()
+            previous_scores = self.state.scores
+            streak = self.streaks.record(session.session_date)
+            score_result = self.scoring_service.apply_session(self.state.scores, session, streak)
+            session_points = score_result.awarded_points - score_result.bonus_points
 
-        self.state.scores = score_result.scores
-        self.state.sessions.append(result.session)
-        self.repository.save(self.state)
+            self.state.scores = score_result.scores
+            session.sequence = self.history.next_sequence()
+            self.sync.stamp(session)
+            self.state.sessions.append(session)
+            self.history.add(session)
+            if self._reports is not None:
+                self._reports.add_session(session, session_points)
+            self._append_journal([self.repository.session_entry(session, session_points, score_result.bonus_points)])
+            if timeline:
+                self.repository.timelines.append(session.sequence, timeline)
+        self._publish_sessions(previous_scores, 1)
 
+        message = f"پروفایل {profile.title}: {score_result.awarded_points} امتیاز ثبت شد"
         unlocked = self.scoring_service.unlocked_rewards(self.state.scores, self.state.rewards)
         if unlocked:
             rewards_text = "، ".join(item.reward_title for item in unlocked)
-            return f"پروفایل {profile.title}: {score_result.awarded_points} امتیاز ثبت شد | جوایز فعال: {rewards_text}"
+            message = f"{message} | جوایز فعال: {rewards_text}"
+        return message, session
+
+    def begin_live_session(self, profile_id: str) -> LiveSessionState:
+        """Start a live session and write its first checkpoint.
+
+        Raises:
+            ValueError: When another running instance has a live session.
+        """
+
+        profile = self._find_profile(profile_id)
+        if not self.checkpointer.claim():
+            raise ValueError("Another app instance is running a live session")
+        self.live_session = LiveSessionState(profile_id=profile_id, started_at=time.time())
+        self.pending_live_session = None
+        self._live_events = []
+        self._record_live_event(EventKind.START, 0)
+        self._record_live_event(self._block_event(self.timer_controller.block_at(profile, 0).block_type), 0)
+        self.checkpointer.update(self.live_session, force=True)
+        return self.live_session
+
+    def tick_live_session(self, elapsed_seconds: int) -> LiveSessionState:
+        """Advance the live session; checkpoints are rate-limited by the checkpointer."""
+
+        if self.live_session is None:
+            raise ValueError("No live session is running")
+
+        live = self.live_session
+        profile = self._find_profile(live.profile_id)
+        block = self.timer_controller.block_at(profile, elapsed_seconds)
+        live.elapsed_seconds = elapsed_seconds
+        if block.index != live.current_block:
+            self._record_live_event(self._block_event(block.block_type))
+        live.current_block = block.index
+        alert_at = (profile.total_minutes - profile.alert_before_end_minutes) * 60
+        if 0 < alert_at <= elapsed_seconds and all(event.kind != EventKind.ALERT for event in self._live_events):
+            self._record_live_event(EventKind.ALERT)
+        self.checkpointer.update(live)
+        return live
+
+    def set_live_paused(self, paused: bool) -> LiveSessionState:
+        """Pause or resume the live countdown and checkpoint the change."""
+
+        if self.live_session is None:
+            raise ValueError("No live session is running")
+
+        live = self.live_session
+        if live.paused != paused:
+            live.paused = paused
+            self._record_live_event(EventKind.PAUSE if paused else EventKind.RESUME)
+            self.checkpointer.update(live, force=True)
+        return live
+
+    def finish_live_session(self) -> str:
+        """Record the live session with its elapsed minutes and drop the checkpoint."""
+
+        if self.live_session is None:
+            raise ValueError("No live session is running")
+
+        live = self.live_session
+        self._record_live_event(EventKind.STOP)
+        message, _ = self._record_session(
+            live.profile_id,
+            completed_minutes=live.elapsed_seconds // 60,
+            timeline=self._live_events,
+            notify=False,
+        )
+        self.live_session = None
+        self._live_events = []
+        self.checkpointer.clear()
+        return message
+
+    def resume_pending_session(self) -> Optional[LiveSessionState]:
+        """Continue a session found in a checkpoint left by a crashed run.
+
+        The time the app was down is recorded in the timeline as a pause
+        that started at the last checkpoint.
+        """
+
+        if self.pending_live_session is None:
+            return None
+
+        live = self.pending_live_session
+        self.live_session = live
+        self.pending_live_session = None
+        try:
+            self._live_events = decode_timeline(bytes.fromhex(live.timeline))
+        except ValueError:
+            self._live_events = []
+        if not self._live_events:
+            self._record_live_event(EventKind.START, 0)
+        if not live.paused:
+            self._record_live_event(EventKind.PAUSE, live.elapsed_seconds + paused_seconds(self._live_events))
+        self._record_live_event(EventKind.RESUME)
+        live.paused = False
+        return live
+
+    def get_session_timeline(self, sequence: int) -> Optional[List[TimelineEvent]]:
+        """Return the event timeline of a recorded live session, if one was stored."""
+
+        return self.repository.timelines.get(sequence)
+
+    def get_focus_seconds(self, sequence: int) -> Optional[int]:
+        """Return seconds actually spent in focus blocks of a session, pauses excluded."""
+
+        timeline = self.get_session_timeline(sequence)
+        return None if timeline is None else focus_seconds(timeline)
+
+    def _record_live_event(self, kind: EventKind, offset_seconds: Optional[int] = None) -> None:
+        """Append an event to the live timeline and keep its checkpoint copy in sync."""
+
+        live = self.live_session
+        if live is None:
+            return
+        if offset_seconds is None:
+            offset_seconds = int(time.time() - live.started_at)
+        if self._live_events:
+            offset_seconds = max(offset_seconds, self._live_events[-1].offset_seconds)
+        self._live_events.append(TimelineEvent(kind, max(0, offset_seconds)))
+        live.timeline = encode_timeline(self._live_events).hex()
+
+    @staticmethod
+    def _block_event(block_type: str) -> EventKind:
+        """Return the timeline event marking the start of a block."""
+
+        return EventKind.FOCUS if block_type == "focus" else EventKind.BREAK
+
+    def finalize_pending_session(self) -> str:
+        """Record a crashed session as finished at its last checkpoint."""
+
+        live = self.resume_pending_session()
+        if live is None:
+            raise ValueError("No unfinished session checkpoint")
+        if all(profile.profile_id != live.profile_id for profile in self.state.profiles):
+            self.live_session = None
+            self.checkpointer.clear()
+            return f"پروفایل {live.profile_id} دیگر وجود ندارد"
+        return self.finish_live_session()
+
+    def import_sessions(self, source: Path, fmt: Optional[str] = None, commit_every: int = 0) -> ImportReport:
+        """Bulk import historical sessions from a CSV or JSONL file.
+
+        Records are validated against existing profiles and scored in
+        batches without running the timer or notifications. Parsing and
+        scoring run without the storage lock; each commit applies its
+        batches and writes one snapshot while holding it.
+
+        Args:
+            source: File to import.
+            fmt: ``"csv"`` or ``"jsonl"``; inferred from suffix when omitted.
+            commit_every: Save after this many batches; ``0`` saves once at the end.
+        """
+
+        from services.bulk_import import BulkSessionImporter
+
+        self.refresh()
+        importer = BulkSessionImporter(self.scoring_service, self.state.profiles)
+        pending: List[ImportBatch] = []
+        for batch in importer.read_batches(source, fmt):
+            pending.append(batch)
+            if commit_every and len(pending) >= commit_every:
+                importer.report.bonus_points += self._commit_batches(pending)
+                pending = []
+
+        if pending:
+            importer.report.bonus_points += self._commit_batches(pending)
+        return importer.report
+
+    def _commit_batches(self, batches: List[ImportBatch]) -> int:
+        """Apply imported batches and write one snapshot including them."""
+
+        sessions = [session for batch in batches for session in batch.sessions]
+
+        def apply() -> Tuple[ScoreSnapshot, int]:
+            previous_scores = self.state.scores
+            for session in sessions:
+                self.sync.stamp(session)
+            points = [points for batch in batches for points in batch.points]
+            return previous_scores, self._apply_session_batch(sessions, points)
+
+        previous_scores, bonus = self._commit_with_snapshot(apply)
+        self._publish_sessions(previous_scores, len(sessions))
+        return bonus
+
+    def export_changes(self, target: Path, peer_id: Optional[str] = None) -> int:
+        """Write the changes a peer device has not seen to a change-set file.
+
+        Sessions folded by retention are read back from the cold tier.
+
+        Args:
+            target: Change-set file to write.
+            peer_id: Receiving device; unknown or omitted peers get everything.
+
+        Returns:
+            Number of exported profiles, rewards and sessions.
+        """
+
+        self.refresh()
+        changes = self.sync.collect(peer_id, self.repository.archived_unseen)
+        self.repository.write_change_set(target, changes)
+        return len(changes.profiles) + len(changes.rewards) + len(changes.sessions)
+
+    def import_changes(self, source: Path) -> SyncReport:
+        """Merge a change-set file exported by another device.
+
+        Merged sessions are scored with local rules and added to the score,
+        streak and report rollups incrementally.
+
+        Raises:
+            ValueError: When a profile carries invalid scoring rules; nothing is merged.
+        """
+
+        changes = self.repository.read_change_set(source)
+        for profile in changes.profiles:
+            validate_profile_rules(profile)
+
+        def apply() -> Tuple[ScoreSnapshot, SyncReport]:
+            previous_scores = self.state.scores
+            report = self.sync.plan_merge(changes)
+            for profile in report.profiles:
+                self._apply_profile(profile)
+            self.state.rewards.extend(report.rewards)
+            if report.sessions:
+                points = self.scoring_service.score_many(report.sessions)
+                report.bonus_points = self._apply_session_batch(report.sessions, points)
+            self.sync.acknowledge(changes)
+            return previous_scores, report
+
+        previous_scores, report = self._commit_with_snapshot(apply)
+        for profile in report.profiles:
+            self.events.publish(ProfileUpdated(profile))
+        self._publish_sessions(previous_scores, len(report.sessions))
+        return report
+
+    def _apply_session_batch(self, sessions: List[SessionRecord], session_points: List[int]) -> int:
+        """Apply a scored batch of sessions to in-memory rollups.
+
+        Returns:
+            Streak and badge bonus points earned by the batch.
+        """
+
+        record_streak = self.streaks.record
+        streak_bonus = self.scoring_service.streak_bonus
+        bonus = sum(streak_bonus(record_streak(session.session_date)) for session in sessions)
+        points = sum(session_points) + bonus
+        scores = self.state.scores
+        self.state.scores = ScoreSnapshot(
+            weekly=scores.weekly + points,
+            monthly=scores.monthly + points,
+            yearly=scores.yearly + points,
+        )
+        self.state.sessions.extend(sessions)
+        first_sequence = self.history.next_sequence()
+        for offset, session in enumerate(sessions):
+            session.sequence = first_sequence + offset
+        self.history.add_many(sessions)
+        if self._reports is not None:
+            add_session = self._reports.add_session
+            for session, points_of_session in zip(sessions, session_points):
+                add_session(session, points_of_session)
+        return bonus
+
+    @property
+    def reports(self) -> ReportEngine:
+        """Return report cubes, building them on first use.
+
+        Startup skips both the analytics import and the full rebuild until
+        a report is actually requested.
+        """
+
+        if self._reports is None:
+            from services.analytics import ReportEngine
+
+            sessions = self.state.sessions
+            self._reports = ReportEngine()
+            self._reports.rebuild(sessions, self.scoring_service.score_many(sessions), self.state.daily_totals)
+        return self._reports
+
+    def apply_retention(self, today: Optional[date] = None) -> RetentionResult:
+        """Fold sessions older than the retention window into daily totals.
+
+        Only sessions that crossed the cutoff since the last run are read.
+        Report cubes already hold the same sums, so they stay untouched.
+        The sessions themselves move to the repository's cold tier.
+        """
+
+        self.refresh()
+        steps = self._retention_steps(self.retention.cutoff(today or date.today()))
+        while True:
+            try:
+                next(steps)
+            except StopIteration as finished:
+                result: RetentionResult = finished.value
+                break
+        if result.folded_sessions:
+            with self.repository.lock:
+                self._merge_journal()
+                self._compact()
+        return result
+
+    def register_maintenance(self, scheduler: MaintenanceScheduler) -> None:
+        """Register journal compaction and retention as sliced idle tasks."""
+
+        self._maintenance = scheduler
+        scheduler.register("journal-compaction", self._compaction_task, interval_seconds=30, max_delay_seconds=60)
+        scheduler.register(
+            "retention",
+            lambda: self._retention_steps(self.retention.cutoff(date.today())),
+            interval_seconds=6 * 3600,
+            max_delay_seconds=3600,
+            first_due_seconds=60,
+        )
+
+    def _compaction_task(self) -> Optional[Iterator[None]]:
+        """Return compaction steps when the snapshot is stale or the journal is large."""
+
+        if not self._snapshot_stale and self._journal_cursor.offset < JOURNAL_COMPACT_BYTES:
+            return None
+        return self._compaction_steps()
+
+    def _compaction_steps(self) -> Iterator[None]:
+        """Write a snapshot in session chunks, then swap it in under the lock.
+
+        Recorded sessions never change, so chunks are encoded without the
+        lock between UI events. The final step merges other processes'
+        changes, writes the sessions added meanwhile and the small sections,
+        and gives up when the state was reloaded or replaced in between.
+        """
+
+        state = self.state
+        sessions = state.sessions
+        writer = self.repository.snapshot_writer(self.device_id)
+        written = 0
+
+        def write_chunk() -> bool:
+            nonlocal written
+            chunk = sessions[written : written + MAINTENANCE_CHUNK]
+            writer.write_sessions(chunk)
+            written += len(chunk)
+            return written < len(sessions)
+
+        try:
+            while self._run_units("compaction", write_chunk):
+                yield
+                if self.state is not state or state.sessions is not sessions:
+                    writer.abort()
+                    return
+            yield from self._fresh_slice()
+
+            with self.repository.lock:
+                self._merge_journal()
+                if self.state is not state or state.sessions is not sessions:
+                    writer.abort()
+                    return
+                writer.write_sessions(sessions[written:])
+                self._finish_snapshot(writer)
+        except BaseException:
+            writer.abort()
+            raise
+
+    def _retention_steps(self, cutoff: date) -> Iterator[None]:
+        """Fold expired sessions in chunks; the live state changes in one final step.
+
+        Expired sessions are scored into a staged engine, the kept session
+        list is built and the cold archive is staged chunk by chunk, so an
+        interrupted run leaves nothing half-applied and the final step only
+        swaps files and lists under the lock. The generator returns a
+        ``RetentionResult``.
+        """
+
+        state = self.state
+        sessions = state.sessions
+        staged = RetentionEngine([], self._retention_days)
+        expired: List[SessionRecord] = []
+        expired_sequences = set()
+        position = 0
+
+        def fold_chunk() -> bool:
+            nonlocal position
+            found = self.history.older_than(cutoff, position, MAINTENANCE_CHUNK)
+            position += len(found)
+            # Older sessions recorded between steps shift positions; skip repeats.
+            chunk = [session for session in found if session.sequence not in expired_sequences]
+            staged.fold(cutoff, chunk, self.scoring_service.score_many(chunk))
+            expired.extend(chunk)
+            expired_sequences.update(session.sequence for session in chunk)
+            return bool(found)
+
+        while self._run_units("retention-fold", fold_chunk):
+            yield
+            if self.state is not state:
+                return RetentionResult(cutoff=cutoff)
+        if not expired_sequences:
+            return RetentionResult(cutoff=cutoff)
+
+        kept: List[SessionRecord] = []
+        scanned = 0
+
+        def keep_chunk() -> bool:
+            nonlocal scanned
+            chunk = sessions[scanned : scanned + MAINTENANCE_CHUNK]
+            kept.extend(session for session in chunk if session.sequence not in expired_sequences)
+            scanned += len(chunk)
+            return scanned < len(sessions)
+
+        # Expired sessions are compressed into a staged archive outside the lock.
+        staging = self.repository.stage_archive(expired)
+        try:
+            yield
+            while self._run_units("retention-keep", keep_chunk):
+                yield
+                if self.state is not state or state.sessions is not sessions:
+                    return RetentionResult(cutoff=cutoff)
+            while self._run_units("retention-archive", staging.advance):
+                yield
+                if self.state is not state or state.sessions is not sessions:
+                    return RetentionResult(cutoff=cutoff)
+            yield from self._fresh_slice()
+            if self.state is not state or state.sessions is not sessions:
+                return RetentionResult(cutoff=cutoff)
+
+            with self.repository.lock:
+                self._merge_journal()
+                if self.state is not state or state.sessions is not sessions:
+                    return RetentionResult(cutoff=cutoff)
+                if staging.commit() is None:
+                    # Another process archived meanwhile; its snapshot is merged on the next read.
+                    return RetentionResult(cutoff=cutoff)
+                # Sessions older than the cutoff that arrived since the scan stay for the next run.
+                late = [
+                    session
+                    for session in self.history.drop_older_than(cutoff)
+                    if session.sequence not in expired_sequences
+                ]
+                self.history.add_many(late)
+                kept.extend(session for session in sessions[scanned:] if session.sequence not in expired_sequences)
+                state.sessions = kept
+                self.retention.merge(staged.daily_totals)
+                self._snapshot_stale = True
+        finally:
+            staging.abort()
+        self.events.publish(StateReloaded())
+        return RetentionResult(
+            cutoff=cutoff,
+            folded_sessions=len(expired_sequences),
+            touched_days=len(staged.daily_totals),
+        )
+
+    def _run_units(self, name: str, unit: Callable[[], bool]) -> bool:
+        """Run ``unit`` while its measured cost fits the maintenance slice.
+
+        ``unit`` does one chunk of work and returns True while more is left.
+        Without a scheduler everything runs at once. The first unit of a
+        fresh slice always runs, so a step makes progress even when one unit
+        is slower than the budget.
+
+        Returns:
+            True when work is left for a later step.
+        """
+
+        scheduler = self._maintenance
+        ran = False
+        while True:
+            if scheduler is not None:
+                left = scheduler.time_left()
+                fresh = left >= scheduler.slice_budget_seconds / 2
+                # Twice the estimate leaves room for a slow unit and the scheduler's own work.
+                if 2 * self._unit_seconds.get(name, 0.0) > left and (ran or not fresh):
+                    scheduler.end_slice()
+                    return True
+            started = time.perf_counter()
+            more = unit()
+            elapsed = time.perf_counter() - started
+            # Rises at once with a slow unit and decays slowly, so estimates err long.
+            self._unit_seconds[name] = max(elapsed, 0.9 * self._unit_seconds.get(name, 0.0))
+            ran = True
+            if not more:
+                return False
+
+    def _fresh_slice(self) -> Iterator[None]:
+        """Yield unless most of the slice is left, so an indivisible step starts on a full budget."""
+
+        scheduler = self._maintenance
+        if scheduler is not None and scheduler.time_left() < scheduler.slice_budget_seconds / 2:
+            scheduler.end_slice()
+            yield
+
+    def _invalidate_reports(self) -> None:
+        """Drop report cubes after a scoring change; they rebuild on next use."""
+
+        self._reports = None
+
+    def get_streak_summary(self) -> Tuple[int, int, int]:
+        """Return current streak, longest streak and earned weekly badges."""
+
+        return (
+            self.streaks.current_streak(date.today()),
+            self.streaks.longest_streak(),
+            self.streaks.weekly_badges(),
+        )
+
+    def _load_state(self) -> None:
+        """Load the snapshot without the lock, then replay the journal under it.
+
+        Snapshots are only replaced whole, so the file is streamed and
+        indexed without the lock; the lock covers checking that it is still
+        the current snapshot and replaying the journal tail. Caller must not
+        hold the lock.
+        """
+
+        while True:
+            signature = self.repository.snapshot_signature()
+            cursor = self._index_snapshot()
+            with self.repository.lock:
+                if self.repository.snapshot_signature() == signature:
+                    self._replay_journal(cursor)
+                    return
+            # Another process compacted while the snapshot was read; read the new one.
+
+    def _index_snapshot(self) -> JournalCursor:
+        """Load the snapshot and rebuild derived indexes; return the journal position it includes."""
+
+        self.state, cursor = self.repository.load_snapshot()
+        self.scoring_service = ScoringService(ScoringRuleBook(self.state.scoring_rules, self.state.profiles))
+        self.streaks = StreakTracker(self.state.streaks)
+        self.history = SessionHistoryRepository(self.state.sessions, self.state.last_sequence)
+        self._reports: Optional[ReportEngine] = None
+        self.retention = RetentionEngine(self.state.daily_totals, self._retention_days)
+        self.sync = SyncEngine(self.state)
+        self._snapshot_stale = False
+        return cursor
+
+    def _replay_journal(self, cursor: JournalCursor) -> None:
+        """Apply journal entries after ``cursor`` to a freshly indexed snapshot (lock held)."""
+
+        entries, self._journal_cursor, _ = self.repository.read_journal(cursor)
+        replayed: List[SessionRecord] = []
+        for entry in entries:
+            self._apply_entry(entry, replayed)
+        self.history.add_many(replayed)
+        self._journal_signature = self.repository.journal_signature()
+
+    def _merge_journal(self) -> None:
+        """Apply journal entries written by other processes (lock held)."""
+
+        entries, cursor, reset = self.repository.read_journal(self._journal_cursor)
+        if reset:
+            # Another process folded the journal into a new snapshot; every
+            # local change is already on disk, so reloading loses nothing.
+            # ``refresh`` reloads without the lock; this only happens when a
+            # compaction slipped in between it and taking the lock.
+            self._replay_journal(self._index_snapshot())
+            self.events.publish(StateReloaded())
+            return
+
+        previous_scores = self.state.scores
+        merged: List[SessionRecord] = []
+        for entry in entries:
+            if entry.writer != self.repository.writer_id:
+                self._apply_entry(entry, merged)
+                if entry.op == "profile" and entry.profile is not None:
+                    self.events.publish(ProfileUpdated(entry.profile))
+        self.history.add_many(merged)
+        merged_sessions = len(merged)
+        self._journal_cursor = cursor
+        self._journal_signature = self.repository.journal_signature()
+        self._publish_sessions(previous_scores, merged_sessions)
+
+    def _publish_sessions(self, previous_scores: ScoreSnapshot, count: int) -> None:
+        """Announce added sessions, the score change and newly unlocked rewards."""
+
+        if not count:
+            return
+        self.events.publish(SessionsRecorded(count))
+        if self.state.scores == previous_scores:
+            return
+        self.events.publish(ScoreChanged(self.state.scores))
+        unlocked = self.scoring_service.unlocked_rewards
+        before = unlocked(previous_scores, self.state.rewards)
+        new_rewards = tuple(rule for rule in unlocked(self.state.scores, self.state.rewards) if rule not in before)
+        if new_rewards:
+            self.events.publish(RewardUnlocked(new_rewards))
+
+    def _append_journal(self, entries: List[JournalEntry]) -> None:
+        """Append local changes (lock held), compacting a journal grown too large.
+
+        Regular compaction runs as idle maintenance; compacting here is the
+        fallback for when no maintenance scheduler keeps up.
+        """
+
+        self._journal_cursor = self.repository.append_journal(entries, self._journal_cursor)
+        if self._journal_cursor.offset > JOURNAL_MAX_BYTES:
+            self._compact()
+            return
+        self._journal_signature = self.repository.journal_signature()
+
+    def _commit_with_snapshot(self, apply: Callable[[], T]) -> T:
+        """Run ``apply`` under the lock and save a snapshot that includes it.
+
+        Recorded sessions never change, so the ones already in the state are
+        encoded before the lock is taken; the lock is held for ``apply`` and
+        the sessions it adds. When merging other processes' changes reloaded
+        the state, the snapshot is written in full under the lock instead.
+        """
+
+        state = self.state
+        sessions = state.sessions
+        written = len(sessions)
+        writer = self.repository.snapshot_writer(self.device_id)
+        try:
+            writer.write_sessions(sessions[:written])
+            with self.repository.lock:
+                self._merge_journal()
+                result = apply()
+                if self.state is state and state.sessions is sessions:
+                    writer.write_sessions(sessions[written:])
+                    self._finish_snapshot(writer)
+                else:
+                    writer.abort()
+                    self._compact()
+        except BaseException:
+            writer.abort()
+            raise
+        return result
+
+    def _finish_snapshot(self, writer: SnapshotWriter) -> None:
+        """Complete a snapshot whose sessions are written and start a new journal generation (lock held)."""
+
+        self.state.last_sequence = self.history.last_sequence
+        self._journal_cursor = writer.finish(self.state, self._journal_cursor)
+        self._journal_signature = self.repository.journal_signature()
+        self._snapshot_stale = False
+
+    def _compact(self) -> None:
+        """Write a full snapshot and start a new journal generation (lock held)."""
+
+        self.state.last_sequence = self.history.last_sequence
+        self._journal_cursor = self.repository.compact(self.state, self._journal_cursor)
+        self._journal_signature = self.repository.journal_signature()
+        self._snapshot_stale = False
+
+    def _apply_entry(self, entry: JournalEntry, replayed: List[SessionRecord]) -> None:
+        """Apply one journal entry to in-memory state and derived indexes.
+
+        Sessions are collected in ``replayed``; the caller indexes the whole
+        batch in history with one ``add_many``.
+        """
+
+        if entry.op == "session" and entry.session is not None:
+            session = entry.session
+            self.sync.observe(session)
+            self.streaks.record(session.session_date)
+            points = entry.points + entry.bonus
+            scores = self.state.scores
+            self.state.scores = ScoreSnapshot(
+                weekly=scores.weekly + points,
+                monthly=scores.monthly + points,
+                yearly=scores.yearly + points,
+            )
+            self.state.sessions.append(session)
+            replayed.append(session)
+            if self._reports is not None:
+                self._reports.add_session(session, entry.points)
+        elif entry.op == "profile" and entry.profile is not None:
+            self.sync.observe(entry.profile)
+            self._apply_profile(entry.profile)
+        elif entry.op == "rules":
+            self._apply_rules(entry.rules)
+
+    def _apply_profile(self, profile: TaskProfile) -> None:
+        """Insert or replace a profile and recompile its scoring rules."""
+
+        rules_changed = self.scoring_service.rule_book.update_profile(profile)
+        for index, existing in enumerate(self.state.profiles):
+            if existing.profile_id == profile.profile_id:
+                self.state.profiles[index] = profile
+                break
+        else:
+            self.state.profiles.append(profile)
+
+        if rules_changed:
+            self._invalidate_reports()
+
+    def _apply_rules(self, rules: List[Dict[str, Any]]) -> None:
+        """Replace global scoring rules."""
+
+        self.scoring_service = ScoringService(ScoringRuleBook(rules, self.state.profiles))
+        self.state.scoring_rules = list(rules)
+        self._invalidate_reports()
+
+    def _backfill_streaks(self) -> None:
+        """Seed streak state once for state files written before streak tracking."""
+
+        if self.state.sessions and not self.state.streaks.day_runs:
+            for session in self.state.sessions:
+                self.streaks.record(session.session_date)
+            self._compact()
+
+    def _ensure_sync_identity(self) -> None:
+        """Assign a device id once and stamp data written before sync existed."""
+
+        if self.state.sync.device_id:
+            return
 
-        return f"پروفایل {profile.title}: {score_result.awarded_points} امتیاز ثبت شد"
+        self.state.sync.device_id = new_device_id()
+        for items in (self.state.profiles, self.state.rewards, self.state.sessions):
+            for item in items:
+                if not item.origin:
+                    self.sync.stamp(item)
+        self._compact()
 
     def _find_profile(self, profile_id: str) -> TaskProfile:
         """Find profile by identifier."""
@@ -136,4 +1028,4 @@ class AppController:
             dirty = True
 
         if dirty:
-            self.repository.save(self.state)
+            self._compact()
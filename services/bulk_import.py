@@ -0,0 +1,245 @@
+"""Streaming bulk import of historical session logs (CSV or JSONL)."""
+
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from data.models import SessionRecord, TaskProfile
+from services.scoring import ScoringService
+from utils.time_utils import PomodoroBlockPlanner
+
+SUPPORTED_FORMATS = ("csv", "jsonl")
+MAX_REPORTED_ERRORS = 20
+
+
+@dataclass
+class ImportBatch:
+    """A validated group of imported sessions with their awarded points."""
+
+    sessions: List[SessionRecord]
+    points: List[int]
+
+    @property
+    def awarded_points(self) -> int:
+        """Return total points of the batch."""
+
+        return sum(self.points)
+
+
+@dataclass
+class ImportReport:
+    """Summary of one bulk import run.
+
+    Attributes:
+        imported: Number of accepted session records.
+        rejected: Number of invalid records skipped.
+        awarded_points: Session points added to every period score.
+        bonus_points: Streak and badge bonus earned by the imported days.
+        errors: First rejected records as ``line N: reason`` messages.
+    """
+
+    imported: int = 0
+    rejected: int = 0
+    awarded_points: int = 0
+    bonus_points: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def detect_format(source: Path) -> str:
+    """Infer import format from file suffix."""
+
+    suffix = source.suffix.lower().lstrip(".")
+    if suffix in ("jsonl", "ndjson"):
+        return "jsonl"
+    if suffix == "csv":
+        return "csv"
+    raise ValueError(f"Unsupported import format: {source.suffix}")
+
+
+def iter_raw_records(source: Path, fmt: Optional[str] = None) -> Iterator[Tuple[int, Mapping[str, object]]]:
+    """Yield ``(line_number, record)`` pairs without loading the whole file.
+
+    Args:
+        source: CSV file with a header row, or JSON Lines file.
+        fmt: Either ``"csv"`` or ``"jsonl"``; inferred from suffix when omitted.
+    """
+
+    fmt = fmt or detect_format(source)
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    with source.open("r", encoding="utf-8-sig", newline="") as handle:
+        if fmt == "csv":
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as error:
+                yield line_number, {"__error__": f"invalid JSON ({error.msg})"}
+                continue
+            if not isinstance(record, dict):
+                record = {"__error__": "record is not an object"}
+            yield line_number, record
+
+
+class BulkSessionImporter:
+    """Validates and scores raw session records in large batches.
+
+    The importer never touches persistence; callers apply each yielded
+    batch to their state and decide when to commit.
+    """
+
+    def __init__(
+        self,
+        scoring_service: ScoringService,
+        profiles: Iterable[TaskProfile],
+        batch_size: int = 10_000,
+    ) -> None:
+        """Initialize importer.
+
+        Args:
+            scoring_service: Service used to calculate points per session.
+            profiles: Known task profiles; records for other ids are rejected.
+            batch_size: Number of accepted sessions per yielded batch.
+        """
+
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+
+        self.scoring_service = scoring_service
+        self.profiles: Dict[str, TaskProfile] = {item.profile_id: item for item in profiles}
+        self.batch_size = batch_size
+        self.report = ImportReport()
+        self._focus_prefix_cache: Dict[str, List[Tuple[int, int]]] = {}
+
+    def read_batches(self, source: Path, fmt: Optional[str] = None) -> Iterator[ImportBatch]:
+        """Stream a CSV/JSONL file and yield validated, scored batches."""
+
+        return self.iter_batches(iter_raw_records(source, fmt))
+
+    def iter_batches(self, records: Iterable[Tuple[int, Mapping[str, object]]]) -> Iterator[ImportBatch]:
+        """Validate ``(line_number, record)`` pairs and yield scored batches."""
+
+        calculate_points = self.scoring_service.calculate_points
+        sessions: List[SessionRecord] = []
+        points: List[int] = []
+
+        for line_number, record in records:
+            try:
+                session = self._parse_record(record)
+            except (KeyError, TypeError, ValueError) as error:
+                self._reject(line_number, error)
+                continue
+
+            sessions.append(session)
+            points.append(calculate_points(session))
+            if len(sessions) >= self.batch_size:
+                yield self._close_batch(sessions, points)
+                sessions = []
+                points = []
+
+        if sessions:
+            yield self._close_batch(sessions, points)
+
+    def _close_batch(self, sessions: List[SessionRecord], points: List[int]) -> ImportBatch:
+        """Account a finished batch in the running report."""
+
+        batch = ImportBatch(sessions=sessions, points=points)
+        self.report.imported += len(sessions)
+        self.report.awarded_points += batch.awarded_points
+        return batch
+
+    def _reject(self, line_number: int, error: Exception) -> None:
+        """Record one rejected input line."""
+
+        self.report.rejected += 1
+        if len(self.report.errors) < MAX_REPORTED_ERRORS:
+            reason = error.args[0] if error.args else type(error).__name__
+            self.report.errors.append(f"line {line_number}: {reason}")
+
+    def _parse_record(self, record: Mapping[str, object]) -> SessionRecord:
+        """Convert one raw record into a validated session."""
+
+        if "__error__" in record:
+            raise ValueError(record["__error__"])
+
+        profile_id = str(record.get("profile_id") or "").strip()
+        profile = self.profiles.get(profile_id)
+        if profile is None:
+            raise ValueError(f"unknown profile_id {profile_id!r}")
+
+        planned = _optional_int(record.get("planned_minutes"))
+        planned = profile.total_minutes if planned is None else planned
+        completed = _optional_int(record.get("completed_minutes"))
+        if completed is None:
+            raise ValueError("completed_minutes is required")
+        if planned <= 0:
+            raise ValueError("planned_minutes must be positive")
+        if completed < 0 or completed > planned:
+            raise ValueError("completed_minutes must be between 0 and planned_minutes")
+
+        blocks = _optional_int(record.get("completed_focus_blocks"))
+        if blocks is None:
+            blocks = self._completed_focus_blocks(profile, completed)
+        elif blocks < 0:
+            raise ValueError("completed_focus_blocks cannot be negative")
+
+        raw_date = record.get("session_date")
+        if not raw_date:
+            raise ValueError("session_date is required")
+
+        return SessionRecord(
+            profile_id=profile_id,
+            planned_minutes=planned,
+            completed_minutes=completed,
+            completed_focus_blocks=blocks,
+            session_date=date.fromisoformat(str(raw_date).strip()),
+        )
+
+    def _completed_focus_blocks(self, profile: TaskProfile, completed_minutes: int) -> int:
+        """Derive finished focus blocks for logs that only record minutes."""
+
+        prefix = self._focus_prefix_cache.get(profile.profile_id)
+        if prefix is None:
+            planner = PomodoroBlockPlanner(profile.focus_minutes, profile.break_minutes)
+            prefix = []
+            elapsed = 0
+            for block in planner.build_blocks(profile.total_minutes):
+                elapsed += block.duration_minutes
+                if block.block_type == "focus":
+                    prefix.append((elapsed, len(prefix) + 1))
+            self._focus_prefix_cache[profile.profile_id] = prefix
+
+        finished = 0
+        for end_minute, count in prefix:
+            if completed_minutes < end_minute:
+                break
+            finished = count
+        return finished
+
+
+def _optional_int(value: object) -> Optional[int]:
+    """Parse an integer field where blanks mean "not provided"."""
+
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError("expected an integer")
+    if isinstance(value, int):
+        return value
+    text = str(value).strip()
+    if not text:
+        return None
+    return int(text)
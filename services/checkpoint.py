@@ -0,0 +1,168 @@
+"""Crash-safe checkpoints of in-progress (live) sessions."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from utils.file_lock import FileLock
+
+
+@dataclass
+class LiveSessionState:
+    """In-progress session data needed to resume or finalize after a crash.
+
+    Attributes:
+        profile_id: Running profile.
+        started_at: Wall-clock start time (epoch seconds).
+        elapsed_seconds: Active seconds counted so far.
+        current_block: One-based index of the block in progress.
+        paused: Whether the countdown is paused.
+        timeline: Hex of the encoded event timeline recorded so far.
+    """
+
+    profile_id: str
+    started_at: float
+    elapsed_seconds: int = 0
+    current_block: int = 1
+    paused: bool = False
+    timeline: str = ""
+
+
+@dataclass
+class CheckpointStats:
+    """Cost counters for checkpoint writes."""
+
+    writes: int = 0
+    fsyncs: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        """Return average write duration."""
+
+        return self.total_seconds / self.writes if self.writes else 0.0
+
+
+class SessionCheckpointer:
+    """Writes live session state to a tiny side file at a bounded rate.
+
+    Writes are skipped until ``interval_seconds`` passed since the last one,
+    and ``fsync`` is only issued every ``fsync_every`` writes, so the
+    per-tick cost is usually a timestamp comparison.
+
+    Instances sharing the state file share the checkpoint, so ownership is
+    an OS lock on ``<path>.lock`` held while a session runs; the operating
+    system drops it when the owner exits or crashes. A checkpoint is only
+    offered for recovery once that lock can be taken, and the file records
+    the owner's id.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        interval_seconds: float = 15.0,
+        fsync_every: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize checkpointer.
+
+        Args:
+            path: Side file next to the main state file.
+            interval_seconds: Minimum time between checkpoint writes.
+            fsync_every: Issue ``fsync`` on every Nth write.
+            clock: Monotonic time source (injectable for tests).
+        """
+
+        if interval_seconds < 0 or fsync_every <= 0:
+            raise ValueError("Checkpoint interval and fsync cadence must be positive")
+
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.fsync_every = fsync_every
+        self.stats = CheckpointStats()
+        self._clock = clock
+        self._last_write: Optional[float] = None
+        self.owner_id = os.urandom(8).hex()
+        self._owner_lock = FileLock(path.with_name(f"{path.name}.lock"))
+
+    def claim(self) -> bool:
+        """Take ownership of the checkpoint; False while another running instance owns it."""
+
+        return self._owner_lock.held or self._owner_lock.acquire(blocking=False)
+
+    def update(self, state: LiveSessionState, force: bool = False) -> bool:
+        """Checkpoint ``state`` if the interval elapsed (or ``force``).
+
+        Returns:
+            True when the state was written.
+
+        Raises:
+            ValueError: When another running instance owns the checkpoint.
+        """
+
+        if not self.claim():
+            raise ValueError("Live session checkpoint is owned by another running instance")
+        now = self._clock()
+        if not force and self._last_write is not None and now - self._last_write < self.interval_seconds:
+            return False
+
+        started = time.perf_counter()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        sync = force or (self.stats.writes + 1) % self.fsync_every == 0
+        with temp_path.open("w", encoding="utf-8") as handle:
+            handle.write(json.dumps({**asdict(state), "owner": self.owner_id}))
+            if sync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        os.replace(temp_path, self.path)
+
+        elapsed = time.perf_counter() - started
+        self._last_write = now
+        self.stats.writes += 1
+        self.stats.fsyncs += int(sync)
+        self.stats.total_seconds += elapsed
+        self.stats.max_seconds = max(self.stats.max_seconds, elapsed)
+        return True
+
+    def load(self) -> Optional[LiveSessionState]:
+        """Return an unfinished checkpoint whose owner is gone, claiming it.
+
+        Returns None when there is no readable checkpoint or its owner is
+        still running.
+        """
+
+        if not self.path.exists() or not self.claim():
+            return None
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            return LiveSessionState(
+                profile_id=str(payload["profile_id"]),
+                started_at=float(payload["started_at"]),
+                elapsed_seconds=int(payload["elapsed_seconds"]),
+                current_block=int(payload.get("current_block", 1)),
+                paused=bool(payload.get("paused", False)),
+                timeline=str(payload.get("timeline", "")),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            self.close()
+            return None
+
+    def clear(self) -> None:
+        """Remove the checkpoint after the session was recorded and give up ownership."""
+
+        self._last_write = None
+        self.path.unlink(missing_ok=True)
+        self.close()
+
+    def close(self) -> None:
+        """Give up ownership and leave the checkpoint for recovery by another run."""
+
+        if self._owner_lock.held:
+            self._owner_lock.release()
@@ -0,0 +1,310 @@
+"""Differential checks of optimized engines against reference implementations."""
+
+from __future__ import annotations
+
+import random
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Tuple
+
+from data.models import AppState, Period, RewardRule, ScoreSnapshot, SessionRecord, SyncState, TaskProfile
+from services.scoring import ScoringService
+from services.timer_service import TimerController
+from utils.storage import LocalStateRepository
+from utils.time_utils import PomodoroBlockPlanner, TimeBlock
+
+Engine = Callable[[Any], Any]
+
+# Block counts and completion ratios are most fragile at these totals.
+EDGE_TOTAL_MINUTES = (1, 2, 5, 25, 29, 30, 31, 60)
+DEVICE_IDS = ("dev-a", "dev-b", "dev-c")
+
+
+@dataclass(frozen=True)
+class Raised:
+    """Outcome of an engine call that raised; compared by type and message."""
+
+    error: str
+    message: str
+
+
+@dataclass
+class DifferentialCase:
+    """An engine checked against the implementation it replaces.
+
+    Attributes:
+        name: Case label used in reports.
+        generate: Builds one input from a seeded ``random.Random``.
+        reference: Current implementation, used as the oracle.
+        candidate: Engine under test; must return an equal result.
+        compare: Equality used for results (``==`` by default).
+    """
+
+    name: str
+    generate: Callable[[random.Random], Any]
+    reference: Engine
+    candidate: Engine
+    compare: Callable[[Any, Any], bool] = lambda expected, actual: expected == actual
+
+
+@dataclass
+class Mismatch:
+    """One input on which the candidate disagreed with the reference."""
+
+    seed: int
+    inputs: Any
+    expected: Any
+    actual: Any
+
+
+@dataclass
+class CaseReport:
+    """Mismatches and timings of one case over all seeds."""
+
+    name: str
+    runs: int = 0
+    mismatches: List[Mismatch] = field(default_factory=list)
+    reference_seconds: float = 0.0
+    candidate_seconds: float = 0.0
+
+    @property
+    def speedup(self) -> float:
+        """Return reference time divided by candidate time."""
+
+        if self.candidate_seconds <= 0:
+            return float("inf")
+        return self.reference_seconds / self.candidate_seconds
+
+
+def run_cases(cases: Iterable[DifferentialCase], seeds: Iterable[int], repeat: int = 1) -> List[CaseReport]:
+    """Run every case on one generated input per seed.
+
+    Args:
+        cases: Cases to check.
+        seeds: Seeds for ``random.Random``; a seed reproduces its input.
+        repeat: Calls per engine and input, to time fast engines reliably.
+
+    Returns:
+        One report per case, in order.
+    """
+
+    if repeat <= 0:
+        raise ValueError("Repeat count must be positive")
+
+    seeds = list(seeds)
+    reports: List[CaseReport] = []
+    for case in cases:
+        report = CaseReport(case.name)
+        for seed in seeds:
+            inputs = case.generate(random.Random(seed))
+            expected, reference_seconds = _timed(case.reference, inputs, repeat)
+            actual, candidate_seconds = _timed(case.candidate, inputs, repeat)
+            report.runs += 1
+            report.reference_seconds += reference_seconds
+            report.candidate_seconds += candidate_seconds
+            if not _same_outcome(case.compare, expected, actual):
+                report.mismatches.append(Mismatch(seed, inputs, expected, actual))
+        reports.append(report)
+    return reports
+
+
+def format_report(reports: Iterable[CaseReport], max_examples: int = 1) -> str:
+    """Return a plain-text table of mismatches and speedups with failing seeds."""
+
+    lines = [f"{'case':<20} {'runs':>6} {'mismatch':>8} {'ref ms':>10} {'new ms':>10} {'speedup':>8}"]
+    details: List[str] = []
+    for report in reports:
+        lines.append(
+            f"{report.name:<20} {report.runs:>6} {len(report.mismatches):>8} "
+            f"{report.reference_seconds * 1000:>10.2f} {report.candidate_seconds * 1000:>10.2f} "
+            f"{report.speedup:>7.2f}x"
+        )
+        for mismatch in report.mismatches[:max_examples]:
+            details.append(
+                f"{report.name} seed={mismatch.seed}: expected {_short(mismatch.expected)}, "
+                f"got {_short(mismatch.actual)}"
+            )
+    return "\n".join(lines + details)
+
+
+def default_cases(candidates: Optional[Mapping[str, Engine]] = None) -> List[DifferentialCase]:
+    """Return cases for the block planner, block completion, scoring and storage.
+
+    ``candidates`` maps case names to new engines; a case without one runs
+    the reference against itself, which checks that it is deterministic.
+    """
+
+    candidates = candidates or {}
+    specs: List[Tuple[str, Callable[[random.Random], Any], Engine]] = [
+        ("block-planner", random_plan, reference_blocks),
+        ("block-completion", random_completion, reference_completion),
+        ("scoring", random_scoring, reference_scoring),
+        ("storage-round-trip", random_state, reference_round_trip),
+    ]
+    unknown = set(candidates) - {name for name, _, _ in specs}
+    if unknown:
+        raise ValueError(f"Unknown differential cases: {sorted(unknown)}")
+    return [
+        DifferentialCase(name, generate, reference, candidates.get(name, reference))
+        for name, generate, reference in specs
+    ]
+
+
+def random_profile(rng: random.Random, index: int = 0) -> TaskProfile:
+    """Return a profile with random, often boundary, timings."""
+
+    total = rng.choice(EDGE_TOTAL_MINUTES) if rng.random() < 0.3 else rng.randint(1, 240)
+    return TaskProfile(
+        profile_id=f"profile-{index}",
+        title=f"پروفایل {index}",
+        total_minutes=total,
+        focus_minutes=rng.randint(1, 60),
+        break_minutes=rng.randint(1, 20),
+        alert_before_end_minutes=rng.randint(0, total),
+    )
+
+
+def random_sessions(rng: random.Random, profiles: List[TaskProfile], count: int) -> List[SessionRecord]:
+    """Return sessions of ``profiles``, including overruns and zero-length plans."""
+
+    first_day = date(2024, 1, 1)
+    sessions = []
+    for index in range(count):
+        profile = rng.choice(profiles)
+        planned = 0 if rng.random() < 0.02 else profile.total_minutes
+        sessions.append(
+            SessionRecord(
+                profile_id=profile.profile_id,
+                planned_minutes=planned,
+                completed_minutes=rng.randint(0, planned + 10),
+                completed_focus_blocks=rng.randint(0, 6),
+                session_date=first_day + timedelta(days=rng.randint(0, 730)),
+                sequence=index + 1,
+                origin=rng.choice(DEVICE_IDS),
+                origin_sequence=index + 1,
+            )
+        )
+    return sessions
+
+
+def random_rewards(rng: random.Random, count: int) -> List[RewardRule]:
+    """Return a reward catalog spread over all periods."""
+
+    return [
+        RewardRule(
+            period=rng.choice(list(Period)),
+            target_score=rng.randint(0, 3000),
+            reward_title=f"جایزه {index}",
+            origin=rng.choice(DEVICE_IDS),
+            origin_sequence=index + 1,
+        )
+        for index in range(count)
+    ]
+
+
+def random_plan(rng: random.Random) -> Tuple[int, int, int]:
+    """Return ``(focus, break, total)`` minutes; a few are invalid so errors are compared too."""
+
+    profile = random_profile(rng)
+    plan = [profile.focus_minutes, profile.break_minutes, profile.total_minutes]
+    if rng.random() < 0.05:
+        plan[rng.randrange(3)] = 0
+    return plan[0], plan[1], plan[2]
+
+
+def random_completion(rng: random.Random) -> Tuple[List[TimeBlock], int]:
+    """Return planned blocks and completed minutes, sometimes past the plan."""
+
+    profile = random_profile(rng)
+    blocks = PomodoroBlockPlanner(profile.focus_minutes, profile.break_minutes).build_blocks(profile.total_minutes)
+    return blocks, rng.randint(0, profile.total_minutes + 5)
+
+
+def random_scoring(rng: random.Random) -> Tuple[List[SessionRecord], List[RewardRule]]:
+    """Return sessions to score in order and a reward catalog to check."""
+
+    profiles = [random_profile(rng, index) for index in range(rng.randint(1, 5))]
+    return random_sessions(rng, profiles, rng.randint(1, 200)), random_rewards(rng, rng.randint(0, 40))
+
+
+def random_state(rng: random.Random) -> AppState:
+    """Return a state with every section the snapshot stores."""
+
+    profiles = [random_profile(rng, index) for index in range(rng.randint(1, 5))]
+    return AppState(
+        profiles=profiles,
+        rewards=random_rewards(rng, rng.randint(0, 10)),
+        scores=ScoreSnapshot(rng.randint(0, 500), rng.randint(0, 2000), rng.randint(0, 20000)),
+        sessions=random_sessions(rng, profiles, rng.randint(0, 300)),
+        sync=SyncState(device_id=DEVICE_IDS[0]),
+    )
+
+
+def reference_blocks(inputs: Tuple[int, int, int]) -> List[TimeBlock]:
+    """Plan blocks with ``PomodoroBlockPlanner.build_blocks``."""
+
+    focus, pause, total = inputs
+    return PomodoroBlockPlanner(focus, pause).build_blocks(total)
+
+
+def reference_completion(inputs: Tuple[List[TimeBlock], int]) -> List[bool]:
+    """Return ``TimerController._block_is_completed`` for every block."""
+
+    blocks, completed = inputs
+    return [TimerController._block_is_completed(block, completed, blocks) for block in blocks]
+
+
+def reference_scoring(
+    inputs: Tuple[List[SessionRecord], List[RewardRule]],
+) -> Tuple[ScoreSnapshot, List[int], List[str]]:
+    """Fold sessions with ``ScoringService.apply_session`` and resolve ``unlocked_rewards``."""
+
+    sessions, rewards = inputs
+    service = ScoringService()
+    scores = ScoreSnapshot()
+    awarded = []
+    for session in sessions:
+        result = service.apply_session(scores, session)
+        scores = result.scores
+        awarded.append(result.awarded_points)
+    return scores, awarded, [rule.reward_title for rule in service.unlocked_rewards(scores, rewards)]
+
+
+def reference_round_trip(state: AppState) -> AppState:
+    """Save ``state`` with ``LocalStateRepository`` and load it back."""
+
+    with tempfile.TemporaryDirectory() as directory:
+        repository = LocalStateRepository(Path(directory) / "state.json")
+        repository.save(state)
+        return repository.load()
+
+
+def _timed(engine: Engine, inputs: Any, repeat: int) -> Tuple[Any, float]:
+    """Call ``engine`` ``repeat`` times; return its last outcome and total seconds."""
+
+    outcome: Any = None
+    started = time.perf_counter()
+    for _ in range(repeat):
+        try:
+            outcome = engine(inputs)
+        except Exception as error:  # an engine must raise exactly when the reference does
+            outcome = Raised(type(error).__name__, str(error))
+    return outcome, time.perf_counter() - started
+
+
+def _same_outcome(compare: Callable[[Any, Any], bool], expected: Any, actual: Any) -> bool:
+    """Compare results, or errors by type and message when either side raised."""
+
+    if isinstance(expected, Raised) or isinstance(actual, Raised):
+        return expected == actual
+    return compare(expected, actual)
+
+
+def _short(value: Any, limit: int = 160) -> str:
+    """Return ``repr(value)`` cut to ``limit`` characters."""
+
+    text = repr(value)
+    return text if len(text) <= limit else f"{text[: limit - 3]}..."
@@ -0,0 +1,70 @@
+"""Typed change events published by the application controller."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple, Type, TypeVar
+
+from data.models import RewardRule, ScoreSnapshot, TaskProfile
+
+
+@dataclass(frozen=True)
+class ScoreChanged:
+    """Period scores changed."""
+
+    scores: ScoreSnapshot
+
+
+@dataclass(frozen=True)
+class ProfileUpdated:
+    """A profile was created or changed (locally or by a merge)."""
+
+    profile: TaskProfile
+
+
+@dataclass(frozen=True)
+class RewardUnlocked:
+    """Rewards that became unlocked by the latest score change."""
+
+    rewards: Tuple[RewardRule, ...]
+
+
+@dataclass(frozen=True)
+class SessionsRecorded:
+    """Sessions were added to history and reports."""
+
+    count: int
+
+
+@dataclass(frozen=True)
+class StateReloaded:
+    """State was replaced wholesale; every view may be stale."""
+
+
+EventT = TypeVar("EventT")
+
+
+class EventBus:
+    """Synchronous publish/subscribe dispatch keyed by event type."""
+
+    def __init__(self) -> None:
+        """Create a bus without subscribers."""
+
+        self._handlers: Dict[type, List[Callable[[Any], None]]] = {}
+
+    def subscribe(self, event_type: Type[EventT], handler: Callable[[EventT], None]) -> Callable[[], None]:
+        """Call ``handler`` for every published ``event_type``.
+
+        Returns:
+            Function that removes the subscription.
+        """
+
+        handlers = self._handlers.setdefault(event_type, [])
+        handlers.append(handler)
+        return lambda: handlers.remove(handler)
+
+    def publish(self, event: object) -> None:
+        """Deliver ``event`` to subscribers of its exact type."""
+
+        for handler in list(self._handlers.get(type(event), ())):
+            handler(event)
@@ -0,0 +1,233 @@
+"""Household leaderboard ranking several children's state stores."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from data.models import Period, ScoreSnapshot
+from utils.storage import JournalCursor, LocalStateRepository
+
+
+@dataclass
+class LeaderboardEntry:
+    """One ranked child of a period leaderboard.
+
+    Attributes:
+        rank: One-based rank; tied scores share a rank.
+        child_id: Store identifier.
+        name: Display name.
+        score: Period score.
+    """
+
+    rank: int
+    child_id: str
+    name: str
+    score: int
+
+
+class RankIndex:
+    """Children ordered by descending score for one period.
+
+    Updates move a single key with ``bisect``/``insort``, so a logged
+    session never re-sorts the whole household.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+
+        self._keys: List[Tuple[int, str]] = []
+        self._scores: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Return number of ranked children."""
+
+        return len(self._keys)
+
+    def update(self, child_id: str, score: int) -> bool:
+        """Set a child's score; returns False when it did not change."""
+
+        previous = self._scores.get(child_id)
+        if previous == score:
+            return False
+        if previous is not None:
+            del self._keys[bisect_left(self._keys, (-previous, child_id))]
+        self._scores[child_id] = score
+        insort(self._keys, (-score, child_id))
+        return True
+
+    def remove(self, child_id: str) -> None:
+        """Drop a child from the ranking."""
+
+        previous = self._scores.pop(child_id, None)
+        if previous is not None:
+            del self._keys[bisect_left(self._keys, (-previous, child_id))]
+
+    def top(self, limit: int) -> List[Tuple[int, str, int]]:
+        """Return ``(rank, child_id, score)`` for the best ``limit`` children."""
+
+        rows: List[Tuple[int, str, int]] = []
+        rank = 0
+        previous: Optional[int] = None
+        for position, (negative_score, child_id) in enumerate(self._keys[:limit], start=1):
+            if negative_score != previous:
+                rank = position
+                previous = negative_score
+            rows.append((rank, child_id, -negative_score))
+        return rows
+
+    def rank(self, child_id: str) -> Optional[int]:
+        """Return a child's one-based rank, or None when not ranked."""
+
+        score = self._scores.get(child_id)
+        if score is None:
+            return None
+        return bisect_left(self._keys, (-score, "")) + 1
+
+
+@dataclass
+class _ChildStore:
+    """Read-only view of one child's state store."""
+
+    name: str
+    repository: LocalStateRepository
+    scores: ScoreSnapshot
+    cursor: JournalCursor
+    snapshot_signature: Tuple[int, int]
+    journal_signature: Tuple[int, int]
+
+
+def household_stores(directory: Path) -> Dict[str, Path]:
+    """Return child state files in ``directory`` keyed by file stem."""
+
+    if not directory.is_dir():
+        return {}
+    return {
+        path.stem: path
+        for path in sorted(directory.glob("*.json"))
+        if not path.name.endswith(".live.json")
+    }
+
+
+def _file_signature(path: Path) -> Tuple[int, int]:
+    """Return ``(size, mtime_ns)`` of a file, or zeros when missing."""
+
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return 0, 0
+    return stat.st_size, stat.st_mtime_ns
+
+
+class HouseholdLeaderboard:
+    """Ranks children across separate state stores for each period.
+
+    Each store is followed like another app instance would follow it: its
+    journal tail adds the points of newly logged sessions, and only a
+    compaction or snapshot rewrite causes a full re-read. Stores whose
+    files did not change cost one ``stat`` per refresh.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty household."""
+
+        self._children: Dict[str, _ChildStore] = {}
+        self._indexes: Dict[Period, RankIndex] = {period: RankIndex() for period in Period}
+
+    def __len__(self) -> int:
+        """Return number of tracked children."""
+
+        return len(self._children)
+
+    def add_child(self, child_id: str, name: str, storage_path: Path) -> None:
+        """Start tracking a child's state store."""
+
+        repository = LocalStateRepository(storage_path)
+        child = _ChildStore(name, repository, ScoreSnapshot(), JournalCursor(), (0, 0), (0, 0))
+        self._children[child_id] = child
+        self._reload(child_id, child)
+
+    def remove_child(self, child_id: str) -> None:
+        """Stop tracking a child."""
+
+        self._children.pop(child_id, None)
+        for index in self._indexes.values():
+            index.remove(child_id)
+
+    def refresh(self) -> int:
+        """Pick up sessions logged in any store since the last refresh.
+
+        Returns:
+            Number of children whose files changed.
+        """
+
+        changed = 0
+        for child_id, child in self._children.items():
+            snapshot_signature = _file_signature(child.repository.storage_path)
+            journal_signature = child.repository.journal_signature()
+            if (snapshot_signature, journal_signature) == (child.snapshot_signature, child.journal_signature):
+                continue
+
+            changed += 1
+            if snapshot_signature != child.snapshot_signature:
+                self._reload(child_id, child)
+                continue
+
+            entries, cursor, reset = child.repository.read_journal(child.cursor)
+            if reset:
+                self._reload(child_id, child)
+                continue
+            points = sum(entry.points + entry.bonus for entry in entries if entry.op == "session")
+            scores = child.scores
+            self._set_scores(
+                child_id,
+                child,
+                ScoreSnapshot(scores.weekly + points, scores.monthly + points, scores.yearly + points),
+            )
+            child.cursor = cursor
+            child.journal_signature = journal_signature
+        return changed
+
+    def top(self, period: Period = Period.WEEKLY, limit: int = 10) -> List[LeaderboardEntry]:
+        """Return the best ``limit`` children of a period."""
+
+        return [
+            LeaderboardEntry(rank=rank, child_id=child_id, name=self._children[child_id].name, score=score)
+            for rank, child_id, score in self._indexes[period].top(limit)
+        ]
+
+    def rank(self, child_id: str, period: Period = Period.WEEKLY) -> Optional[int]:
+        """Return a child's rank in a period."""
+
+        return self._indexes[period].rank(child_id)
+
+    def standings(self, period: Period = Period.WEEKLY, limit: int = 10) -> List[LeaderboardEntry]:
+        """Refresh changed stores, then return the period's top children."""
+
+        self.refresh()
+        return self.top(period, limit)
+
+    def _reload(self, child_id: str, child: _ChildStore) -> None:
+        """Re-read a store's snapshot and journal from scratch."""
+
+        child.snapshot_signature = _file_signature(child.repository.storage_path)
+        child.journal_signature = child.repository.journal_signature()
+        state, marker = child.repository.load_snapshot()
+        entries, child.cursor, _ = child.repository.read_journal(marker)
+        points = sum(entry.points + entry.bonus for entry in entries if entry.op == "session")
+        scores = state.scores
+        self._set_scores(
+            child_id,
+            child,
+            ScoreSnapshot(scores.weekly + points, scores.monthly + points, scores.yearly + points),
+        )
+
+    def _set_scores(self, child_id: str, child: _ChildStore, scores: ScoreSnapshot) -> None:
+        """Store a child's scores and move it in each period index."""
+
+        child.scores = scores
+        self._indexes[Period.WEEKLY].update(child_id, scores.weekly)
+        self._indexes[Period.MONTHLY].update(child_id, scores.monthly)
+        self._indexes[Period.YEARLY].update(child_id, scores.yearly)
@@ -0,0 +1,245 @@
+"""Time-sliced housekeeping that runs while the UI is idle."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+# Factory returning the steps of one task run, or None when nothing is due.
+TaskFactory = Callable[[], Optional[Iterator[None]]]
+
+DEFAULT_SLICE_BUDGET_SECONDS = 0.008
+
+
+@dataclass
+class SliceStats:
+    """Duration instrumentation of maintenance slices.
+
+    Attributes:
+        slices: Slices that ran at least one step.
+        steps: Task steps executed.
+        total_seconds: Time spent in slices.
+        max_seconds: Longest slice.
+        over_budget: Slices that ended past the slice budget.
+        recent: Durations of the latest slices.
+    """
+
+    slices: int = 0
+    steps: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    over_budget: int = 0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+    @property
+    def mean_seconds(self) -> float:
+        """Return average slice duration."""
+
+        return self.total_seconds / self.slices if self.slices else 0.0
+
+
+@dataclass
+class _Task:
+    """Scheduling state of one registered task."""
+
+    name: str
+    factory: TaskFactory
+    interval_seconds: float
+    max_delay_seconds: float
+    due_at: float
+    deadline: float
+    steps: Optional[Iterator[None]] = None
+    runs: int = 0
+    late_runs: int = 0
+
+
+class MaintenanceScheduler:
+    """Runs registered tasks in slices bounded by ``slice_budget_seconds``.
+
+    Tasks are generators, so long jobs yield between small steps. Each
+    slice keeps stepping the due task with the earliest deadline until the
+    budget is used up; a task becomes due every ``interval_seconds`` and
+    its deadline is ``max_delay_seconds`` later, so a busy task cannot
+    starve the others. Tasks size their steps with ``time_left`` and call
+    ``end_slice`` when their next unit of work would not fit.
+    """
+
+    def __init__(
+        self,
+        slice_budget_seconds: float = DEFAULT_SLICE_BUDGET_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize scheduler.
+
+        Args:
+            slice_budget_seconds: Work time allowed per slice.
+            clock: Monotonic time source (injectable for tests).
+        """
+
+        if slice_budget_seconds <= 0:
+            raise ValueError("Slice budget must be positive")
+
+        self.slice_budget_seconds = slice_budget_seconds
+        self.stats = SliceStats()
+        self._clock = clock
+        self._tasks: Dict[str, _Task] = {}
+        self._slice_end: Optional[float] = None
+
+    def register(
+        self,
+        name: str,
+        factory: TaskFactory,
+        interval_seconds: float,
+        max_delay_seconds: float,
+        first_due_seconds: float = 0.0,
+    ) -> None:
+        """Register a periodic task.
+
+        Args:
+            name: Task name used in statistics.
+            factory: Returns the steps of one run, or None when there is nothing to do.
+            interval_seconds: Time between the end of a run and the next due time.
+            max_delay_seconds: Time after becoming due by which a run should finish.
+            first_due_seconds: Delay before the first run.
+        """
+
+        due_at = self._clock() + first_due_seconds
+        self._tasks[name] = _Task(name, factory, interval_seconds, max_delay_seconds, due_at, due_at + max_delay_seconds)
+
+    def task_runs(self) -> Dict[str, int]:
+        """Return completed runs per task."""
+
+        return {name: task.runs for name, task in self._tasks.items()}
+
+    def late_runs(self) -> Dict[str, int]:
+        """Return runs per task that finished after their deadline."""
+
+        return {name: task.late_runs for name, task in self._tasks.items()}
+
+    def next_due_in(self) -> Optional[float]:
+        """Return seconds until some task has work (0 when work is pending)."""
+
+        if not self._tasks:
+            return None
+        now = self._clock()
+        return max(0.0, min(0.0 if task.steps is not None else task.due_at - now for task in self._tasks.values()))
+
+    def time_left(self) -> float:
+        """Return seconds left in the running slice (the full budget outside a slice)."""
+
+        if self._slice_end is None:
+            return self.slice_budget_seconds
+        return max(0.0, self._slice_end - time.perf_counter())
+
+    def end_slice(self) -> None:
+        """End the running slice after the current step."""
+
+        if self._slice_end is not None:
+            self._slice_end = 0.0
+
+    def run_slice(self) -> bool:
+        """Run due work for at most one slice budget.
+
+        Returns:
+            True when due work remains.
+        """
+
+        started = time.perf_counter()
+        self._slice_end = started + self.slice_budget_seconds
+        steps = 0
+        try:
+            while time.perf_counter() < self._slice_end:
+                task = self._next_task()
+                if task is None:
+                    break
+                if task.steps is None:
+                    task.steps = task.factory()
+                    if task.steps is None:
+                        self._finish(task)
+                        continue
+                try:
+                    next(task.steps)
+                    steps += 1
+                except StopIteration:
+                    self._finish(task)
+                    steps += 1
+        finally:
+            self._slice_end = None
+
+        if steps:
+            elapsed = time.perf_counter() - started
+            stats = self.stats
+            stats.slices += 1
+            stats.steps += steps
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            stats.over_budget += elapsed > self.slice_budget_seconds
+            stats.recent.append(elapsed)
+        return self._next_task() is not None
+
+    def run_until_idle(self, max_slices: int = 1_000_000) -> int:
+        """Run slices back to back until no work is due; returns slices run."""
+
+        for slices in range(max_slices):
+            if not self.run_slice():
+                return slices + 1
+        return max_slices
+
+    def _next_task(self) -> Optional[_Task]:
+        """Return the due or running task with the earliest deadline."""
+
+        now = self._clock()
+        ready: List[_Task] = [task for task in self._tasks.values() if task.steps is not None or task.due_at <= now]
+        if not ready:
+            return None
+        return min(ready, key=lambda task: task.deadline)
+
+    def _finish(self, task: _Task) -> None:
+        """Close a run and schedule the next one."""
+
+        now = self._clock()
+        task.steps = None
+        task.runs += 1
+        task.late_runs += now > task.deadline
+        task.due_at = now + task.interval_seconds
+        task.deadline = task.due_at + task.max_delay_seconds
+
+
+class IdleDriver:
+    """Feeds scheduler slices from the UI event loop's idle time.
+
+    Kept free of tkinter: the window passes ``root.after_idle`` and
+    ``root.after``. Between slices the driver returns to the event loop
+    for at least one millisecond, so input and redraws are handled first.
+    """
+
+    def __init__(
+        self,
+        scheduler: MaintenanceScheduler,
+        after_idle: Callable[[Callable[[], None]], object],
+        after: Callable[[int, Callable[[], None]], object],
+        poll_ms: int = 1000,
+    ) -> None:
+        """Initialize driver with event-loop scheduling functions."""
+
+        self.scheduler = scheduler
+        self._after_idle = after_idle
+        self._after = after
+        self._poll_ms = poll_ms
+
+    def start(self) -> None:
+        """Arm the first idle slice."""
+
+        self._after_idle(self._tick)
+
+    def _tick(self) -> None:
+        """Run one slice and re-arm for the next due work."""
+
+        if self.scheduler.run_slice():
+            self._after(1, self.start)
+            return
+        delay = self.scheduler.next_due_in()
+        delay_ms = self._poll_ms if delay is None else min(self._poll_ms, max(1, int(delay * 1000)))
+        self._after(delay_ms, self.start)
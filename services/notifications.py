@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-import ctypes
-import platform
+import sys
+
+# Platform backends (ctypes, winsound) are imported on first alert, not at startup.
+IS_WINDOWS = sys.platform == "win32"
 
 
 class NotificationService:
@@ -12,7 +14,9 @@ class NotificationService:
     def popup(self, title: str, message: str) -> None:
         """Show a popup message with Windows API where available."""
 
-        if platform.system().lower() == "windows":
+        if IS_WINDOWS:
+            import ctypes
+
             ctypes.windll.user32.MessageBoxW(0, message, title, 0x40)
             return
 
@@ -21,7 +25,7 @@ class NotificationService:
     def play_sound(self) -> None:
         """Play a short alert sound where supported."""
 
-        if platform.system().lower() == "windows":
+        if IS_WINDOWS:
             import winsound
 
             winsound.MessageBeep(winsound.MB_ICONASTERISK)
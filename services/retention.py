@@ -0,0 +1,92 @@
+"""Retention policy folding old sessions into per-day, per-profile totals."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Sequence, Tuple
+
+from data.models import DailyAggregate, SessionRecord
+
+DEFAULT_RETENTION_DAYS = 365
+
+
+@dataclass
+class RetentionResult:
+    """Outcome of one retention run.
+
+    Attributes:
+        cutoff: Sessions dated before this day were folded.
+        folded_sessions: Number of sessions replaced by daily totals.
+        touched_days: Daily totals created or extended.
+    """
+
+    cutoff: date
+    folded_sessions: int = 0
+    touched_days: int = 0
+
+
+class RetentionEngine:
+    """Keeps session detail for ``keep_days`` and daily totals beyond that.
+
+    Daily totals keep the sums the report cubes need, and period scores are
+    cumulative counters that never read sessions, so rollups and rewards
+    stay exact. Each run only receives the sessions that crossed the cutoff
+    since the previous run (see ``SessionHistoryRepository.drop_older_than``).
+    """
+
+    def __init__(self, daily_totals: List[DailyAggregate], keep_days: int = DEFAULT_RETENTION_DAYS) -> None:
+        """Bind engine to the state's daily totals list.
+
+        Args:
+            daily_totals: Persisted totals, extended in place.
+            keep_days: Days of full session detail to keep.
+        """
+
+        if keep_days <= 0:
+            raise ValueError("Retention must keep at least one day")
+
+        self.keep_days = keep_days
+        self.daily_totals = daily_totals
+        self._index: Dict[Tuple[str, int], DailyAggregate] = {
+            (item.profile_id, item.day.toordinal()): item for item in daily_totals
+        }
+
+    def cutoff(self, today: date) -> date:
+        """Return the first day whose sessions are kept in full."""
+
+        return today - timedelta(days=self.keep_days - 1)
+
+    def fold(self, cutoff: date, sessions: Sequence[SessionRecord], points: Sequence[int]) -> RetentionResult:
+        """Add expired sessions and their points to daily totals."""
+
+        touched = set()
+        for session, session_points in zip(sessions, points):
+            key = (session.profile_id, session.session_date.toordinal())
+            aggregate = self._index.get(key)
+            if aggregate is None:
+                aggregate = self._index[key] = DailyAggregate(session.profile_id, session.session_date)
+                self.daily_totals.append(aggregate)
+            aggregate.planned_minutes += session.planned_minutes
+            aggregate.completed_minutes += session.completed_minutes
+            aggregate.completed_focus_blocks += session.completed_focus_blocks
+            aggregate.points += session_points
+            aggregate.sessions += 1
+            touched.add(key)
+        return RetentionResult(cutoff=cutoff, folded_sessions=len(sessions), touched_days=len(touched))
+
+    def merge(self, totals: Sequence[DailyAggregate]) -> None:
+        """Add totals folded by another engine, e.g. one staged off the live state."""
+
+        for item in totals:
+            key = (item.profile_id, item.day.toordinal())
+            aggregate = self._index.get(key)
+            if aggregate is None:
+                self._index[key] = item
+                self.daily_totals.append(item)
+                continue
+            aggregate.planned_minutes += item.planned_minutes
+            aggregate.completed_minutes += item.completed_minutes
+            aggregate.completed_focus_blocks += item.completed_focus_blocks
+            aggregate.points += item.points
+            aggregate.sessions += item.sessions
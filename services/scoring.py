@@ -3,46 +3,82 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import Iterable, List, Optional
 
 from data.models import Period, RewardRule, ScoreSnapshot, SessionRecord
+from services.scoring_rules import ScoringRuleBook
+from services.streaks import StreakUpdate
+
+STREAK_POINTS_PER_DAY = 5
+STREAK_BONUS_MAX_DAYS = 7
+CONSISTENCY_BADGE_POINTS = 25
 
 
 @dataclass
 class ScoreResult:
-    """Result of processing one session into score totals."""
+    """Result of processing one session into score totals.
+
+    ``awarded_points`` includes ``bonus_points`` from streaks and badges.
+    """
 
     scores: ScoreSnapshot
     awarded_points: int
+    bonus_points: int = 0
 
 
 class ScoringService:
     """Calculates earned points and resolves reward eligibility."""
 
+    def __init__(self, rule_book: Optional[ScoringRuleBook] = None) -> None:
+        """Initialize service with compiled scoring rules (defaults when omitted)."""
+
+        self.rule_book = rule_book or ScoringRuleBook()
+
     def calculate_points(self, session: SessionRecord) -> int:
         """Calculate points for a completed session.
 
-        Base formula uses completion percentage and focus block consistency.
+        Uses the compiled rules of the session's profile; the default rules
+        score completion percentage plus focus block consistency.
         """
 
-        if session.planned_minutes <= 0:
-            return 0
+        return self.rule_book.score(session)
 
-        completion_ratio = min(session.completed_minutes / session.planned_minutes, 1.0)
-        completion_points = int(completion_ratio * 100)
-        block_bonus = session.completed_focus_blocks * 2
-        return completion_points + block_bonus
+    def score_many(self, sessions: Iterable[SessionRecord]) -> List[int]:
+        """Calculate points for many sessions in one bulk pass."""
 
-    def apply_session(self, scores: ScoreSnapshot, session: SessionRecord) -> ScoreResult:
-        """Apply a session into all period aggregates."""
+        return self.rule_book.score_many(sessions)
+
+    def streak_bonus(self, streak: StreakUpdate) -> int:
+        """Calculate bonus points for the first session of a day.
+
+        Each consecutive day after the first adds points (capped), and
+        completing a weekly consistency badge adds a one-time bonus.
+        """
+
+        if not streak.new_day:
+            return 0
 
-        points = self.calculate_points(session)
+        bonus = min(streak.streak_days - 1, STREAK_BONUS_MAX_DAYS) * STREAK_POINTS_PER_DAY
+        if streak.badge_unlocked:
+            bonus += CONSISTENCY_BADGE_POINTS
+        return bonus
+
+    def apply_session(
+        self,
+        scores: ScoreSnapshot,
+        session: SessionRecord,
+        streak: Optional[StreakUpdate] = None,
+    ) -> ScoreResult:
+        """Apply a session (and optional streak update) into all period aggregates."""
+
+        bonus = self.streak_bonus(streak) if streak is not None else 0
+        points = self.calculate_points(session) + bonus
         updated = ScoreSnapshot(
             weekly=scores.weekly + points,
             monthly=scores.monthly + points,
             yearly=scores.yearly + points,
         )
-        return ScoreResult(scores=updated, awarded_points=points)
+        return ScoreResult(scores=updated, awarded_points=points, bonus_points=bonus)
 
     def unlocked_rewards(self, scores: ScoreSnapshot, reward_rules: List[RewardRule]) -> List[RewardRule]:
         """Return rewards that are unlocked by current score levels."""
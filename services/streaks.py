@@ -0,0 +1,99 @@
+"""Incremental daily streak and weekly consistency tracking."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Optional
+
+from data.models import StreakState
+
+CONSISTENCY_BADGE_DAYS = 5
+
+
+@dataclass(frozen=True)
+class StreakUpdate:
+    """Outcome of recording one session day.
+
+    Attributes:
+        new_day: False when the day already had a session.
+        streak_days: Length of the consecutive-day run containing the day,
+            or 0 when the day was already recorded.
+        badge_unlocked: True when this day completed a weekly consistency badge.
+    """
+
+    new_day: bool
+    streak_days: int
+    badge_unlocked: bool
+
+
+def week_label(day: date) -> str:
+    """Return ISO week label such as ``2026-W09``."""
+
+    iso_year, iso_week, _ = day.isocalendar()
+    return f"{iso_year}-W{iso_week:02}"
+
+
+class StreakTracker:
+    """Maintains day runs and week masks with O(1) work per session.
+
+    Runs are kept in two hash maps (start -> end and end -> start), so a
+    backfilled or out-of-order day merges with its neighbours without any
+    scan of session history.
+    """
+
+    def __init__(self, state: StreakState, badge_days: int = CONSISTENCY_BADGE_DAYS) -> None:
+        """Initialize tracker over persisted streak state (mutated in place)."""
+
+        self.state = state
+        self.badge_days = badge_days
+        self._run_starts: Dict[int, int] = {end: start for start, end in state.day_runs.items()}
+        self._latest_start: Optional[int] = self._run_starts[max(self._run_starts)] if self._run_starts else None
+
+    def record(self, day: date) -> StreakUpdate:
+        """Record activity on ``day`` and return the resulting streak update."""
+
+        label = week_label(day)
+        bit = 1 << day.weekday()
+        mask = self.state.week_masks.get(label, 0)
+        if mask & bit:
+            return StreakUpdate(new_day=False, streak_days=0, badge_unlocked=False)
+
+        mask |= bit
+        self.state.week_masks[label] = mask
+        badge_unlocked = bin(mask).count("1") == self.badge_days
+
+        runs = self.state.day_runs
+        latest_end = runs[self._latest_start] if self._latest_start is not None else None
+        ordinal = day.toordinal()
+        start = self._run_starts.pop(ordinal - 1, ordinal)
+        end = runs.pop(ordinal + 1, ordinal)
+        if end != ordinal:
+            del self._run_starts[end]
+        runs[start] = end
+        self._run_starts[end] = start
+
+        if latest_end is None or end >= latest_end:
+            self._latest_start = start
+
+        return StreakUpdate(new_day=True, streak_days=end - start + 1, badge_unlocked=badge_unlocked)
+
+    def current_streak(self, today: date) -> int:
+        """Return days in the latest run if it reaches today or yesterday."""
+
+        if self._latest_start is None:
+            return 0
+        end = self.state.day_runs[self._latest_start]
+        if today.toordinal() - end > 1:
+            return 0
+        return end - self._latest_start + 1
+
+    def longest_streak(self) -> int:
+        """Return the longest run of consecutive active days."""
+
+        return max((end - start + 1 for start, end in self.state.day_runs.items()), default=0)
+
+    def weekly_badges(self) -> int:
+        """Return how many ISO weeks reached the consistency threshold."""
+
+        return sum(1 for mask in self.state.week_masks.values() if bin(mask).count("1") >= self.badge_days)
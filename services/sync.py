@@ -0,0 +1,161 @@
+"""Incremental device-to-device sync through change-set files."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from data.models import AppState, RewardRule, SessionRecord, TaskProfile
+from utils.storage import ChangeSet
+
+Stamped = Union[TaskProfile, RewardRule, SessionRecord]
+
+
+@dataclass
+class SyncReport:
+    """Changes accepted from one change set.
+
+    Attributes:
+        profiles: New profiles or profiles whose remote change won.
+        rewards: Rewards not known locally.
+        sessions: Sessions not merged before.
+        duplicates: Sessions skipped because they were already merged.
+        bonus_points: Streak and badge bonus earned locally by merged sessions.
+    """
+
+    profiles: List[TaskProfile] = field(default_factory=list)
+    rewards: List[RewardRule] = field(default_factory=list)
+    sessions: List[SessionRecord] = field(default_factory=list)
+    duplicates: int = 0
+    bonus_points: int = 0
+
+
+def new_device_id() -> str:
+    """Return a fresh random device identifier."""
+
+    return os.urandom(6).hex()
+
+
+def reward_key(rule: RewardRule) -> Tuple[str, int, str]:
+    """Return the identity of a reward across devices."""
+
+    return rule.period.value, rule.target_score, rule.reward_title
+
+
+def _stamp(item: Stamped) -> Tuple[int, str]:
+    """Return an item's ``(sequence, device)`` stamp; ties break on device id."""
+
+    return item.origin_sequence, item.origin
+
+
+class SyncEngine:
+    """Stamps local changes and computes or merges change sets for one state.
+
+    Every change gets the next per-device sequence number. ``seen`` records,
+    per device, the highest sequence whose changes are already merged, so an
+    export only carries items stamped above the peer's vector and an import
+    drops anything at or below ours. The clock follows merged stamps (a
+    Lamport clock), so a later local edit wins over any change it has seen.
+    """
+
+    def __init__(self, state: AppState) -> None:
+        """Bind engine to the sync bookkeeping of ``state``."""
+
+        self.state = state
+
+    @property
+    def device_id(self) -> str:
+        """Return this device's identifier."""
+
+        return self.state.sync.device_id
+
+    def stamp(self, item: Stamped) -> None:
+        """Stamp a local change with this device and its next sequence."""
+
+        sync = self.state.sync
+        sync.clock += 1
+        item.origin = sync.device_id
+        item.origin_sequence = sync.clock
+        sync.seen[sync.device_id] = sync.clock
+
+    def observe(self, item: Stamped) -> None:
+        """Advance clock and ``seen`` past a stamp replayed from the journal."""
+
+        sync = self.state.sync
+        if item.origin_sequence > sync.seen.get(item.origin, 0):
+            sync.seen[item.origin] = item.origin_sequence
+        sync.clock = max(sync.clock, item.origin_sequence)
+
+    def collect(
+        self,
+        peer_id: Optional[str] = None,
+        archived: Optional[Callable[[Dict[str, int]], List[SessionRecord]]] = None,
+    ) -> ChangeSet:
+        """Return changes the peer has not seen, or everything for an unknown peer.
+
+        Args:
+            peer_id: Receiving device.
+            archived: Returns sessions moved out of the state by retention
+                that are stamped above a ``seen`` vector; they are shipped
+                first, so a peer can rebuild the same totals.
+        """
+
+        since = self.state.sync.peers.get(peer_id, {}) if peer_id else {}
+
+        def unseen(item: Stamped) -> bool:
+            return item.origin_sequence > since.get(item.origin, 0)
+
+        sessions = archived(since) if archived is not None else []
+        sessions.extend(session for session in self.state.sessions if unseen(session))
+        return ChangeSet(
+            device_id=self.device_id,
+            seen=dict(self.state.sync.seen),
+            profiles=[profile for profile in self.state.profiles if unseen(profile)],
+            rewards=[rule for rule in self.state.rewards if unseen(rule)],
+            sessions=sessions,
+        )
+
+    def plan_merge(self, changes: ChangeSet) -> SyncReport:
+        """Select the profiles, rewards and sessions of ``changes`` to apply.
+
+        Profiles resolve by last writer (highest stamp), rewards by identity
+        and sessions by their origin stamp, so merging is deterministic and
+        importing the same change set twice is a no-op.
+        """
+
+        report = SyncReport()
+        if changes.device_id == self.device_id:
+            return report
+
+        local_profiles: Dict[str, TaskProfile] = {profile.profile_id: profile for profile in self.state.profiles}
+        for profile in changes.profiles:
+            existing = local_profiles.get(profile.profile_id)
+            if existing is None or _stamp(profile) > _stamp(existing):
+                report.profiles.append(profile)
+
+        known_rewards = {reward_key(rule) for rule in self.state.rewards}
+        for rule in changes.rewards:
+            if reward_key(rule) not in known_rewards:
+                known_rewards.add(reward_key(rule))
+                report.rewards.append(rule)
+
+        seen = self.state.sync.seen
+        for session in changes.sessions:
+            if session.origin_sequence <= seen.get(session.origin, 0):
+                report.duplicates += 1
+            else:
+                report.sessions.append(session)
+        return report
+
+    def acknowledge(self, changes: ChangeSet) -> None:
+        """Record that everything up to the sender's vector is now merged."""
+
+        sync = self.state.sync
+        if changes.device_id == sync.device_id:
+            return
+        for device, sequence in changes.seen.items():
+            if sequence > sync.seen.get(device, 0):
+                sync.seen[device] = sequence
+            sync.clock = max(sync.clock, sequence)
+        sync.peers[changes.device_id] = dict(changes.seen)
@@ -42,6 +42,29 @@ class TimerController:
             TimerRunResult containing generated blocks and session record.
         """
 
+        result = self.build_session(profile, completed_minutes)
+        if profile.total_minutes - result.session.completed_minutes <= profile.alert_before_end_minutes:
+            self.notification_service.popup(
+                "یادآور پایان وظیفه",
+                f"پروفایل {profile.title} نزدیک به پایان است.",
+            )
+            self.notification_service.play_sound()
+        return result
+
+    def build_session(self, profile: TaskProfile, completed_minutes: Optional[int] = None) -> TimerRunResult:
+        """Build the session record of a run without notifying.
+
+        Live sessions use this: their end-of-session alert already fired
+        while they ran.
+
+        Args:
+            profile: Target task profile.
+            completed_minutes: Completed minutes, defaults to full completion.
+
+        Returns:
+            TimerRunResult containing generated blocks and session record.
+        """
+
         planner = PomodoroBlockPlanner(
             focus_minutes=profile.focus_minutes,
             break_minutes=profile.break_minutes,
@@ -50,13 +73,6 @@ class TimerController:
         completed = profile.total_minutes if completed_minutes is None else completed_minutes
         completed = max(0, min(completed, profile.total_minutes))
 
-        if profile.total_minutes - completed <= profile.alert_before_end_minutes:
-            self.notification_service.popup(
-                "یادآور پایان وظیفه",
-                f"پروفایل {profile.title} نزدیک به پایان است.",
-            )
-            self.notification_service.play_sound()
-
         completed_focus_blocks = sum(
             1
             for block in blocks
@@ -71,6 +87,22 @@ class TimerController:
         )
         return TimerRunResult(session=session, blocks=blocks)
 
+    @staticmethod
+    def block_at(profile: TaskProfile, elapsed_seconds: int) -> TimeBlock:
+        """Return the planned block running after ``elapsed_seconds`` of a live session."""
+
+        planner = PomodoroBlockPlanner(
+            focus_minutes=profile.focus_minutes,
+            break_minutes=profile.break_minutes,
+        )
+        blocks = planner.build_blocks(profile.total_minutes)
+        boundary = 0
+        for block in blocks:
+            boundary += block.duration_minutes * 60
+            if elapsed_seconds < boundary:
+                return block
+        return blocks[-1]
+
     @staticmethod
     def _block_is_completed(target: TimeBlock, completed_minutes: int, blocks: List[TimeBlock]) -> bool:
         """Return True if block duration is fully included in completed time."""
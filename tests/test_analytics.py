@@ -0,0 +1,57 @@
+"""Tests for pre-aggregated period reports."""
+
+from datetime import date
+
+from data.models import Period, SessionRecord
+from services.analytics import ReportEngine, bucket_key
+from services.app_controller import AppController
+
+
+def _session(profile_id: str, day: date, completed: int = 30, blocks: int = 1) -> SessionRecord:
+    return SessionRecord(
+        profile_id=profile_id,
+        planned_minutes=60,
+        completed_minutes=completed,
+        completed_focus_blocks=blocks,
+        session_date=day,
+    )
+
+
+def test_bucket_keys_use_iso_week_month_and_year() -> None:
+    day = date(2027, 1, 1)
+
+    assert bucket_key(Period.WEEKLY, day) == "2026-W53"
+    assert bucket_key(Period.MONTHLY, day) == "2027-01"
+    assert bucket_key(Period.YEARLY, day) == "2027"
+
+
+def test_report_engine_accumulates_per_profile_and_bucket() -> None:
+    engine = ReportEngine()
+    engine.add_session(_session("study", date(2026, 3, 2)), points=50)
+    engine.add_session(_session("study", date(2026, 3, 4), completed=60, blocks=2), points=104)
+    engine.add_session(_session("game", date(2026, 3, 4)), points=52)
+    engine.add_session(_session("study", date(2026, 4, 1)), points=50)
+
+    weekly = engine.report(Period.WEEKLY, "study")
+    monthly = engine.report(Period.MONTHLY)
+
+    assert [(row.bucket, row.totals.points) for row in weekly] == [("2026-W10", 154), ("2026-W14", 50)]
+    assert weekly[0].totals.completion_rate == 0.75
+    assert [(row.bucket, row.profile_id) for row in monthly] == [
+        ("2026-03", "game"),
+        ("2026-03", "study"),
+        ("2026-04", "study"),
+    ]
+    assert engine.totals(Period.YEARLY, date(2026, 1, 1)).sessions == 4
+
+
+def test_controller_reports_match_rebuild_after_reload(tmp_path) -> None:
+    controller = AppController(storage_path=tmp_path / "state.json")
+    profile = controller.list_profiles()[0]
+    controller.run_profile_session(profile.profile_id, completed_minutes=profile.total_minutes)
+
+    live = controller.get_report(Period.MONTHLY, profile.profile_id)
+    reloaded = AppController(storage_path=tmp_path / "state.json").get_report(Period.MONTHLY, profile.profile_id)
+
+    assert live == reloaded
+    assert live[0].totals.points == controller.get_scores().monthly
@@ -1,5 +1,9 @@
 """Tests for app controller profile and reward management."""
 
+import subprocess
+import sys
+from pathlib import Path
+
 from data.models import Period
 from services.app_controller import AppController
 
@@ -32,3 +36,66 @@ def test_get_next_reward_progress_returns_non_negative_remaining(tmp_path) -> No
 
     assert isinstance(title, str)
     assert remaining >= 0
+
+
+def test_controllers_sharing_a_file_merge_each_others_changes(tmp_path) -> None:
+    first = AppController(storage_path=tmp_path / "state.json")
+    second = AppController(storage_path=tmp_path / "state.json")
+    profile = first.list_profiles()[0]
+
+    first.run_profile_session(profile.profile_id, completed_minutes=profile.total_minutes)
+    second.run_profile_session(profile.profile_id, completed_minutes=profile.total_minutes)
+
+    assert second.get_scores() == first.get_scores()
+    assert first.get_history_window(0, 10)[0] == 2
+    sequences = {session.sequence for session in first.state.sessions}
+    assert len(sequences) == 2
+    assert first.repository.lock.max_hold_seconds < 1.0
+
+
+def test_snapshot_compacted_elsewhere_is_read_outside_the_lock(tmp_path) -> None:
+    first = AppController(storage_path=tmp_path / "state.json")
+    second = AppController(storage_path=tmp_path / "state.json")
+    profile = first.list_profiles()[0]
+    source = tmp_path / "history.csv"
+    source.write_text(
+        f"profile_id,completed_minutes,session_date\n{profile.profile_id},30,2025-01-06\n",
+        encoding="utf-8",
+    )
+    first.import_sessions(source)
+    first.run_profile_session(profile.profile_id, completed_minutes=profile.total_minutes)
+    lock_held_while_loading = []
+    original_load = second.repository.load_snapshot
+    second.repository.load_snapshot = lambda: (
+        lock_held_while_loading.append(second.repository.lock.held),
+        original_load(),
+    )[1]
+
+    assert second.refresh()
+
+    assert lock_held_while_loading == [False]
+    assert second.get_history_window(0, 10)[0] == 2
+    assert second.get_scores() == first.get_scores()
+
+
+def test_concurrent_processes_keep_every_session(tmp_path) -> None:
+    path = tmp_path / "state.json"
+    AppController(storage_path=path)
+    script = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from services.app_controller import AppController\n"
+        "controller = AppController(storage_path=Path(sys.argv[1]))\n"
+        "profile = controller.list_profiles()[0]\n"
+        "for _ in range(15):\n"
+        "    controller.run_profile_session(profile.profile_id, completed_minutes=profile.total_minutes)\n"
+    )
+    root = Path(__file__).resolve().parents[1]
+    workers = [subprocess.Popen([sys.executable, "-c", script, str(path)], cwd=root) for _ in range(4)]
+    assert all(worker.wait(timeout=120) == 0 for worker in workers)
+
+    controller = AppController(storage_path=path)
+    sessions = controller.state.sessions
+    assert len(sessions) == 60
+    assert len({session.sequence for session in sessions}) == 60
+    assert controller.get_scores().yearly >= 60 * 102
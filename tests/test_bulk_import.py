@@ -0,0 +1,51 @@
+"""Tests for streaming bulk session import."""
+
+import json
+
+from data.models import TaskProfile
+from services.app_controller import AppController
+from services.bulk_import import BulkSessionImporter
+from services.scoring import ScoringService
+
+
+def test_csv_import_scores_and_rejects_invalid_rows(tmp_path) -> None:
+    source = tmp_path / "logs.csv"
+    source.write_text(
+        "profile_id,planned_minutes,completed_minutes,completed_focus_blocks,session_date\n"
+        "study-default,60,60,2,2026-01-05\n"
+        "unknown,60,60,2,2026-01-05\n"
+        "study-default,60,90,2,2026-01-06\n"
+        "study-default,60,30,1,2026-01-07\n",
+        encoding="utf-8",
+    )
+    controller = AppController(storage_path=tmp_path / "state.json")
+    generation = controller.repository.journal_generation()
+
+    report = controller.import_sessions(source)
+
+    assert report.imported == 2
+    assert report.rejected == 2
+    assert report.errors[0].startswith("line 3:")
+    assert report.awarded_points == 104 + 52
+    assert controller.get_scores().weekly == 156
+    # The whole import is written as one snapshot, which starts one new journal generation.
+    assert controller.repository.journal_generation() == generation + 1
+    reloaded = AppController(storage_path=tmp_path / "state.json")
+    assert len(reloaded.state.sessions) == 2
+
+
+def test_jsonl_import_derives_focus_blocks_and_batches() -> None:
+    profile = TaskProfile(profile_id="p1", title="study", total_minutes=60, focus_minutes=25, break_minutes=5)
+    importer = BulkSessionImporter(ScoringService(), [profile], batch_size=2)
+    records = [
+        (1, json.loads('{"profile_id": "p1", "completed_minutes": 55, "session_date": "2026-02-01"}')),
+        (2, {"profile_id": "p1", "completed_minutes": "20", "session_date": "2026-02-02"}),
+        (3, {"__error__": "invalid JSON"}),
+    ]
+
+    batches = list(importer.iter_batches(records))
+
+    assert [len(batch.sessions) for batch in batches] == [2]
+    assert [item.completed_focus_blocks for item in batches[0].sessions] == [2, 0]
+    assert batches[0].sessions[0].planned_minutes == 60
+    assert importer.report.rejected == 1
@@ -0,0 +1,91 @@
+"""Tests for live session checkpoints and crash recovery."""
+
+import pytest
+
+from services import checkpoint
+from services.app_controller import AppController
+from services.checkpoint import LiveSessionState, SessionCheckpointer
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_checkpoint_writes_are_rate_limited_and_fsync_is_amortized(tmp_path, monkeypatch) -> None:
+    fsynced = []
+    monkeypatch.setattr(checkpoint.os, "fsync", fsynced.append)
+    clock = FakeClock()
+    checkpointer = SessionCheckpointer(tmp_path / "live.json", interval_seconds=10, fsync_every=3, clock=clock)
+    state = LiveSessionState(profile_id="study", started_at=0.0)
+
+    written = []
+    for second in range(0, 120):
+        clock.now = float(second)
+        state.elapsed_seconds = second
+        written.append(checkpointer.update(state))
+
+    # 120 one-second ticks: one write per 10 s interval, one fsync per 3 writes.
+    assert sum(written) == checkpointer.stats.writes == 12
+    assert len(fsynced) == checkpointer.stats.fsyncs == 4
+    assert checkpointer.load().elapsed_seconds == 110
+
+    (tmp_path / "live.json").write_text("{broken", encoding="utf-8")
+    assert checkpointer.load() is None
+
+
+def test_crashed_live_session_can_be_finalized_on_next_start(tmp_path) -> None:
+    crashed = AppController(storage_path=tmp_path / "state.json", checkpoint_interval_seconds=0)
+    profile = crashed.list_profiles()[0]
+    crashed.begin_live_session(profile.profile_id)
+    crashed.tick_live_session(26 * 60)
+    crashed.checkpointer.close()  # the process dies and the OS drops its lock
+
+    restarted = AppController(storage_path=tmp_path / "state.json")
+
+    assert restarted.pending_live_session.current_block == 2
+    message = restarted.finalize_pending_session()
+    assert profile.title in message
+    assert restarted.state.sessions[-1].completed_minutes == 26
+    assert restarted.state.sessions[-1].completed_focus_blocks == 1
+    assert AppController(storage_path=tmp_path / "state.json").pending_live_session is None
+
+
+def test_resumed_session_continues_from_checkpoint(tmp_path) -> None:
+    crashed = AppController(storage_path=tmp_path / "state.json", checkpoint_interval_seconds=0)
+    profile = crashed.list_profiles()[0]
+    crashed.begin_live_session(profile.profile_id)
+    crashed.tick_live_session(300)
+    crashed.checkpointer.close()
+
+    restarted = AppController(storage_path=tmp_path / "state.json")
+    live = restarted.resume_pending_session()
+    restarted.tick_live_session(live.elapsed_seconds + 600)
+    restarted.finish_live_session()
+
+    assert restarted.state.sessions[-1].completed_minutes == 15
+
+
+def test_running_owner_keeps_its_checkpoint_from_other_instances(tmp_path) -> None:
+    first = AppController(storage_path=tmp_path / "state.json", checkpoint_interval_seconds=0)
+    profile = first.list_profiles()[0]
+    first.begin_live_session(profile.profile_id)
+    first.tick_live_session(600)
+
+    second = AppController(storage_path=tmp_path / "state.json")
+    assert second.pending_live_session is None
+    with pytest.raises(ValueError):
+        second.finalize_pending_session()
+    with pytest.raises(ValueError):
+        second.begin_live_session(profile.profile_id)
+
+    first.finish_live_session()
+    assert len(second.query_sessions().rows) == 1
+    assert not first.checkpointer.path.exists()
+    second.begin_live_session(profile.profile_id)
+    assert AppController(storage_path=tmp_path / "state.json").pending_live_session is None
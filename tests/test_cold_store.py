@@ -0,0 +1,101 @@
+"""Tests for the compressed cold session tier."""
+
+import json
+import time
+from datetime import date, timedelta
+
+from data.models import SessionRecord
+from services.app_controller import AppController
+from utils.cold_store import ColdSessionStore
+
+
+def _sessions(start: int, count: int):
+    first_day = date(2023, 1, 1)
+    return [
+        SessionRecord(
+            profile_id=("study-default", "gaming-default", "internet-default")[index % 3],
+            planned_minutes=60,
+            completed_minutes=20 + index % 41,
+            completed_focus_blocks=index % 3,
+            session_date=first_day + timedelta(days=index // 30),
+            sequence=index + 1,
+            origin="dev1",
+            origin_sequence=index + 1,
+        )
+        for index in range(start, start + count)
+    ]
+
+
+def test_month_query_decompresses_only_overlapping_blocks(tmp_path) -> None:
+    store = ColdSessionStore(tmp_path / "state.json.cold", block_sessions=1024)
+    archived = []
+    for start, count in ((0, 700), (700, 9000), (9700, 10300)):
+        batch = _sessions(start, count)
+        store.append(batch)
+        archived.extend(batch)
+    assert store.committed == 20000
+
+    plain_size = len(json.dumps([vars(session) for session in archived], default=str))
+    cold_size = store.path.stat().st_size
+    assert cold_size * 10 < plain_size
+
+    started = time.perf_counter()
+    store.blocks_decompressed = 0
+    march = store.sessions_between(date(2024, 3, 1), date(2024, 3, 31))
+    elapsed = time.perf_counter() - started
+    assert march == [session for session in archived if session.session_date.strftime("%Y-%m") == "2024-03"]
+    assert store.blocks_decompressed <= 2 < len(store.blocks())
+    # Timings vary between machines, so the query time is reported rather than asserted.
+    print(f"benchmark: one month out of {store.committed} archived sessions in {elapsed:.3f}s")
+    assert store.sessions_between(date(2030, 1, 1), date(2030, 1, 31)) == []
+
+
+def test_staged_append_swaps_in_only_over_the_archive_it_started_from(tmp_path) -> None:
+    store = ColdSessionStore(tmp_path / "state.json.cold", block_sessions=1024)
+    store.append(_sessions(0, 1500))
+    staging = store.stage(_sessions(1500, 3000))
+    steps = 1
+    while staging.advance():
+        steps += 1
+    # Blocks are compressed a few kilobytes per step and stay invisible until committed.
+    assert steps > 20
+    assert staging.path.exists() and store.committed == 1500
+    assert len(store.sessions_between(date(2023, 1, 1), date(2030, 1, 1))) == 1500
+
+    assert staging.commit() == store.committed == 4500
+    assert not staging.path.exists()
+    assert store.sessions_between(date(2023, 1, 1), date(2030, 1, 1)) == _sessions(0, 4500)
+
+    outdated = store.stage(_sessions(4500, 10))
+    store.append(_sessions(4500, 20))
+    assert outdated.commit() is None
+    assert not outdated.path.exists() and store.committed == 4520
+
+
+def test_retention_archives_sessions_and_rolls_back_uncommitted_blocks(tmp_path) -> None:
+    today = date.today()
+    lines = ["profile_id,completed_minutes,session_date"]
+    for offset in range(90):
+        lines.append(f"study-default,{20 + offset % 30},{(today - timedelta(days=offset)).isoformat()}")
+    source = tmp_path / "history.csv"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    controller = AppController(storage_path=tmp_path / "state.json", retention_days=30)
+    controller.import_sessions(source)
+    old_days = {today - timedelta(days=offset) for offset in range(30, 90)}
+
+    result = controller.apply_retention(today)
+
+    archived = controller.get_archived_sessions(today - timedelta(days=365), today)
+    assert result.folded_sessions == len(archived) == 60
+    assert {session.session_date for session in archived} == old_days
+    reloaded = AppController(storage_path=tmp_path / "state.json", retention_days=30)
+    assert reloaded.get_archived_sessions(today - timedelta(days=365), today) == archived
+
+    # Blocks written by a run that never saved its snapshot are ignored and replaced.
+    committed = reloaded.repository.cold.committed
+    reloaded.repository.archive_sessions(_sessions(0, 5))
+    restarted = AppController(storage_path=tmp_path / "state.json", retention_days=30)
+    assert restarted.repository.cold.committed == committed
+    assert restarted.get_archived_sessions(date(2023, 1, 1), date(2023, 1, 31)) == []
+    restarted.repository.archive_sessions(_sessions(100, 2))
+    assert restarted.repository.cold.committed == committed + 2
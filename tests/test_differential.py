@@ -0,0 +1,60 @@
+"""Tests for the differential engine harness."""
+
+import random
+from typing import List, Tuple
+
+from services.differential import (
+    DifferentialCase,
+    default_cases,
+    format_report,
+    random_completion,
+    random_state,
+    reference_completion,
+    reference_round_trip,
+    run_cases,
+)
+from utils.time_utils import TimeBlock
+
+
+def _prefix_completion(inputs: Tuple[List[TimeBlock], int]) -> List[bool]:
+    """Single-pass block completion, the kind of engine the harness is for."""
+
+    blocks, completed = inputs
+    flags = []
+    elapsed = 0
+    for block in blocks:
+        elapsed += block.duration_minutes
+        flags.append(completed >= elapsed)
+    return flags
+
+
+def test_reference_engines_agree_with_themselves_and_round_trip() -> None:
+    reports = run_cases(default_cases(), seeds=range(10))
+
+    assert [report.name for report in reports] == ["block-planner", "block-completion", "scoring", "storage-round-trip"]
+    assert all(report.runs == 10 and not report.mismatches for report in reports)
+    for seed in range(5):
+        state = random_state(random.Random(seed))
+        assert reference_round_trip(state) == state
+    assert "storage-round-trip" in format_report(reports)
+
+
+def test_candidates_report_mismatching_seeds_and_speedup() -> None:
+    completion = default_cases({"block-completion": _prefix_completion})[1]
+    fast = run_cases([completion], seeds=range(40), repeat=20)[0]
+    assert not fast.mismatches
+    # Timings vary between runs, so the speedup is reported rather than asserted.
+    assert f"{fast.speedup:>7.2f}x" in format_report([fast])
+
+    # Off by one at block ends: every seed that lands exactly on a boundary is reported.
+    def off_by_one(inputs: Tuple[List[TimeBlock], int]) -> List[bool]:
+        blocks, completed = inputs
+        ends = [sum(block.duration_minutes for block in blocks[: block.index]) for block in blocks]
+        return [completed > end for end in ends]
+
+    broken = DifferentialCase("block-completion", random_completion, reference_completion, off_by_one)
+    report = run_cases([broken], seeds=range(200))[0]
+    assert report.mismatches
+    mismatch = report.mismatches[0]
+    assert reference_completion(random_completion(random.Random(mismatch.seed))) == mismatch.expected
+    assert f"seed={mismatch.seed}" in format_report([report])
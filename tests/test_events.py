@@ -0,0 +1,67 @@
+"""Tests for controller change events and batched UI refresh."""
+
+from dataclasses import replace
+
+from components.ui_refresh import RefreshScheduler
+from services.app_controller import AppController
+from services.events import ProfileUpdated, RewardUnlocked, ScoreChanged, SessionsRecorded
+
+
+class FakeVar:
+    def __init__(self, value: str = "") -> None:
+        self.value = value
+
+    def get(self) -> str:
+        return self.value
+
+    def set(self, value: str) -> None:
+        self.value = value
+
+
+def test_controller_publishes_local_and_merged_changes(tmp_path) -> None:
+    controller = AppController(storage_path=tmp_path / "state.json")
+    other = AppController(storage_path=tmp_path / "state.json")
+    received = []
+    for event_type in (ScoreChanged, RewardUnlocked, SessionsRecorded, ProfileUpdated):
+        controller.events.subscribe(event_type, received.append)
+    profile = controller.list_profiles()[0]
+    controller.state.rewards[0].target_score = 1
+
+    controller.run_profile_session(profile.profile_id, completed_minutes=profile.total_minutes)
+    assert [type(event) for event in received] == [SessionsRecorded, ScoreChanged, RewardUnlocked]
+
+    received.clear()
+    other.upsert_profile(replace(profile, title="کتاب"))
+    other.run_profile_session(profile.profile_id, completed_minutes=profile.total_minutes)
+    controller.refresh()
+    assert [type(event) for event in received] == [ProfileUpdated, SessionsRecorded, ScoreChanged]
+    assert received[-1].scores == other.get_scores()
+
+
+def test_refresh_scheduler_batches_events_and_skips_unchanged_writes() -> None:
+    scheduled = []
+    refresher = RefreshScheduler(scheduled.append)
+    variables = [FakeVar() for _ in range(4)]
+    score = {"value": 0}
+
+    def flush_scores() -> None:
+        refresher.assign(variables[0], str(score["value"]))
+        refresher.assign(variables[1], str(score["value"]))
+        refresher.assign(variables[2], "next reward")
+        refresher.assign(variables[3], "0")
+
+    refresher.register("scores", flush_scores)
+    for _ in range(10):
+        score["value"] += 5
+        refresher.mark("scores")
+    assert len(scheduled) == 1
+    scheduled.pop()()
+
+    # Re-pulling on every event would have written 4 variables 10 times.
+    stats = refresher.stats
+    assert (stats.flushes, stats.handler_runs, stats.coalesced_marks) == (1, 1, 9)
+    assert stats.writes == 4 and variables[0].get() == "50"
+
+    refresher.mark("scores")
+    scheduled.pop()()
+    assert stats.writes == 4 and stats.skipped_writes == 4
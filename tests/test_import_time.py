@@ -0,0 +1,73 @@
+"""Cold-import budgets checked with ``python -X importtime``."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Import measured in the same run as the yardstick for budgets, so a slow or
+# busy machine raises both sides alike.
+YARDSTICK_MODULE = "tkinter"
+
+# Cumulative import time per top-level module in multiples of the yardstick,
+# about 2.5x a reference run. These are a coarse guard; the lazy-module test
+# below is the hard gate.
+IMPORT_BUDGETS = {
+    "main": 12.0,
+    "components.main_window": 10.0,
+    "services.app_controller": 10.0,
+    "utils.storage": 8.0,
+    "data.models": 5.0,
+}
+
+# Subsystems that must load on first use, never at startup.
+LAZY_MODULES = (
+    "ctypes",
+    "csv",
+    "cProfile",
+    "lzma",
+    "tracemalloc",
+    "uuid",
+    "zlib",
+    "services.analytics",
+    "services.bulk_import",
+    "services.leaderboard",
+)
+
+
+def _cumulative_import_us(module: str) -> int:
+    """Return the best of three cumulative cold-import times of ``module``."""
+
+    timings = []
+    for _ in range(3):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in result.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == module:
+                timings.append(int(parts[1]))
+    return min(timings)
+
+
+def test_top_level_modules_import_within_budget() -> None:
+    over_budget = {}
+    for module, budget in IMPORT_BUDGETS.items():
+        # The yardstick is re-measured next to each module, so load changes during the run affect both.
+        ratio = _cumulative_import_us(module) / _cumulative_import_us(YARDSTICK_MODULE)
+        if ratio > budget:
+            over_budget[module] = round(ratio, 1)
+
+    assert over_budget == {}
+
+
+def test_startup_does_not_import_lazy_subsystems() -> None:
+    script = f"import sys, main; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
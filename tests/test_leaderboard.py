@@ -0,0 +1,41 @@
+"""Tests for the household leaderboard."""
+
+import random
+
+from data.models import Period
+from services.app_controller import AppController
+from services.leaderboard import HouseholdLeaderboard, RankIndex
+
+
+def test_rank_index_matches_full_sort_under_random_updates() -> None:
+    generator = random.Random(7)
+    index = RankIndex()
+    scores = {}
+    for _ in range(2000):
+        child_id = f"child-{generator.randrange(300)}"
+        scores[child_id] = generator.randrange(50)
+        index.update(child_id, scores[child_id])
+
+    expected = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:10]
+    assert [(child_id, score) for _, child_id, score in index.top(10)] == expected
+    ranks = [rank for rank, _, _ in index.top(10)]
+    assert ranks[0] == 1 and ranks == sorted(ranks)
+    some_child = expected[-1][0]
+    assert index.rank(some_child) == 1 + sum(score > scores[some_child] for score in scores.values())
+
+
+def test_household_follows_sessions_logged_in_child_stores(tmp_path) -> None:
+    children = {name: AppController(storage_path=tmp_path / name / "state.json") for name in ("sara", "omid")}
+    leaderboard = HouseholdLeaderboard()
+    for name, controller in children.items():
+        leaderboard.add_child(name, name.title(), controller.repository.storage_path)
+    assert leaderboard.refresh() == 0
+
+    profile = children["omid"].list_profiles()[0]
+    children["omid"].run_profile_session(profile.profile_id, completed_minutes=profile.total_minutes)
+
+    assert leaderboard.refresh() == 1
+    top = leaderboard.top(Period.WEEKLY)
+    assert [entry.child_id for entry in top] == ["omid", "sara"]
+    assert top[0].score == children["omid"].get_scores().weekly
+    assert leaderboard.rank("sara", Period.YEARLY) == 2
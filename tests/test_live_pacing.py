@@ -0,0 +1,68 @@
+"""Tests for visibility-aware live countdown pacing."""
+
+from components.live_pacing import LivePacer, Visibility
+
+MINUTE_MS = 60000
+
+
+def _simulate(pacer: LivePacer, total_ms: int, visibility_at: dict) -> dict:
+    """Drive the pacer like ``MainWindow._live_tick`` and record when events fire."""
+
+    fired = {}
+    wakeups_by_minute = [0] * (total_ms // MINUTE_MS)
+    now = 0
+    changes = sorted(visibility_at.items())
+    while True:
+        while changes and changes[0][0] <= now:
+            pacer.set_visibility(changes.pop(0)[1])
+        events = pacer.advance(now)
+        for event in events:
+            fired.setdefault(event, []).append(now)
+        pacer.should_draw(now, events)
+        if now >= total_ms:
+            break
+        wakeups_by_minute[now // MINUTE_MS] += 1
+        delay = pacer.next_delay_ms(now)
+        if changes and changes[0][0] < now + delay:
+            delay = changes[0][0] - now
+        now += delay
+    return {"fired": fired, "per_minute": wakeups_by_minute}
+
+
+def test_hidden_window_wakes_rarely_but_fires_events_on_time() -> None:
+    # 25 + 5 + 25 + 5 minute blocks with an alert 10 minutes before the end.
+    block_ends = [25 * MINUTE_MS, 30 * MINUTE_MS, 55 * MINUTE_MS, 60 * MINUTE_MS]
+    pacer = LivePacer(block_ends, alert_at_ms=50 * MINUTE_MS)
+    result = _simulate(
+        pacer,
+        60 * MINUTE_MS,
+        {10 * MINUTE_MS: Visibility.UNFOCUSED, 20 * MINUTE_MS: Visibility.HIDDEN, 59 * MINUTE_MS: Visibility.VISIBLE},
+    )
+
+    assert result["fired"]["block"] == block_ends[:-1]
+    assert result["fired"]["alert"] == [50 * MINUTE_MS]
+    assert result["fired"]["end"] == [60 * MINUTE_MS]
+    per_minute = result["per_minute"]
+    assert per_minute[5] == 60
+    assert per_minute[15] == 12
+    assert per_minute[40] == 4
+    assert pacer.stats.wakeups_per_minute(60 * MINUTE_MS) < 20
+    assert pacer.stats.skipped_frames > 0
+
+
+def test_restore_requests_one_catch_up_frame() -> None:
+    pacer = LivePacer([30 * MINUTE_MS], visibility=Visibility.HIDDEN)
+    pacer.advance(90000)
+    assert not pacer.should_draw(90000)
+
+    assert pacer.set_visibility(Visibility.UNFOCUSED)
+    assert not pacer.set_visibility(Visibility.VISIBLE)  # coalesced into the pending frame
+    assert pacer.should_draw(90500)
+    assert not pacer.set_visibility(Visibility.VISIBLE)
+    assert pacer.set_visibility(Visibility.HIDDEN) is False
+    assert pacer.set_visibility(Visibility.VISIBLE)
+    assert pacer.stats.catch_ups == 2
+
+    resumed = LivePacer([25 * MINUTE_MS, 30 * MINUTE_MS], start_ms=26 * MINUTE_MS)
+    assert resumed.advance(26 * MINUTE_MS) == []
+    assert resumed.next_delay_ms(29 * MINUTE_MS + 59500) == 500
@@ -0,0 +1,92 @@
+"""Tests for time-sliced idle maintenance."""
+
+import json
+from datetime import date, timedelta
+
+from data.models import Period
+from services.app_controller import AppController
+from services.maintenance import MaintenanceScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_scheduler_runs_earliest_deadline_first_without_starving() -> None:
+    clock = FakeClock()
+    scheduler = MaintenanceScheduler(slice_budget_seconds=0.05, clock=clock)
+    trace = []
+
+    def long_task():
+        for _ in range(50):
+            trace.append("long")
+            clock.now += 1.0
+            yield
+
+    def short_task():
+        trace.append("short")
+        yield
+
+    scheduler.register("long", long_task, interval_seconds=1000, max_delay_seconds=100)
+    scheduler.register("short", short_task, interval_seconds=10, max_delay_seconds=5)
+
+    scheduler.run_until_idle()
+
+    # The short task goes first (earlier deadline) and becomes due again
+    # while the long task is running, so it gets slices in between.
+    assert trace[0] == "short"
+    assert trace.count("long") == 50
+    assert scheduler.task_runs()["short"] >= 4
+    assert scheduler.late_runs()["short"] == 0
+    assert scheduler.next_due_in() > 0
+    assert scheduler.stats.steps >= 54
+
+
+def test_controller_maintenance_compacts_and_folds_in_bounded_slices(tmp_path) -> None:
+    today = date.today()
+    start = today - timedelta(days=500)
+    lines = ["profile_id,completed_minutes,session_date"]
+    for offset in range(500):
+        day = (start + timedelta(days=offset)).isoformat()
+        lines.extend(f"study-default,{20 + block},{day}" for block in range(12))
+    source = tmp_path / "history.csv"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    controller = AppController(storage_path=tmp_path / "state.json")
+    controller.import_sessions(source)
+    reports_before = controller.get_report(Period.MONTHLY)
+    controller.run_profile_session("gaming-default", completed_minutes=30)
+    clock = FakeClock()
+    scheduler = MaintenanceScheduler(slice_budget_seconds=0.008, clock=clock)
+    controller.register_maintenance(scheduler)
+    snapshot = tmp_path / "state.json"
+
+    def snapshot_sessions() -> int:
+        return len(json.loads(snapshot.read_text(encoding="utf-8"))["sessions"])
+
+    clock.now = 120.0
+    scheduler.run_until_idle()
+    assert scheduler.task_runs()["retention"] == 1
+    # Retention only changes memory; the snapshot on disk waits for the next compaction.
+    assert snapshot_sessions() > len(controller.state.sessions)
+    clock.now = 200.0
+    scheduler.run_until_idle()
+
+    assert scheduler.task_runs()["retention"] == 1
+    assert snapshot_sessions() == len(controller.state.sessions)
+    assert controller.repository.journal_path.stat().st_size < 200
+    assert all(session.session_date > today - timedelta(days=365) for session in controller.state.sessions)
+    # Both runs were split into slices; the ceiling is generous because slice time depends on machine load.
+    assert scheduler.stats.slices >= 3
+    assert scheduler.stats.max_seconds < 0.25
+
+    reloaded = AppController(storage_path=tmp_path / "state.json")
+    assert len(reloaded.state.sessions) == len(controller.state.sessions)
+    assert len(reloaded.state.daily_totals) == len(controller.state.daily_totals)
+    assert reloaded.get_scores() == controller.get_scores()
+    assert reloaded.get_report(Period.YEARLY) == controller.get_report(Period.YEARLY)
+    assert len(reloaded.get_report(Period.MONTHLY)) >= len(reports_before)
@@ -0,0 +1,62 @@
+"""Tests for profile search index and list viewport."""
+
+from components.virtual_list import ListViewport
+from data.models import TaskProfile
+from utils.profile_search import ProfileSearchIndex
+
+
+def _profile(profile_id: str, title: str) -> TaskProfile:
+    return TaskProfile(profile_id=profile_id, title=title, total_minutes=30)
+
+
+def test_search_orders_prefix_matches_first_and_allows_duplicate_titles() -> None:
+    index = ProfileSearchIndex(
+        [
+            _profile("math-ali", "Math"),
+            _profile("math-sara", "Math"),
+            _profile("art-1", "Art homework"),
+            _profile("read-1", "Reading"),
+        ]
+    )
+
+    assert index.search("") == ["art-1", "math-ali", "math-sara", "read-1"]
+    assert index.search("ma") == ["math-ali", "math-sara"]
+    assert index.search("hom") == ["art-1"]
+    assert index.search("sara") == ["math-sara"]
+    assert index.search("ework") == ["art-1"]
+
+    index.upsert(_profile("art-1", "Zoology"))
+    index.remove("read-1")
+
+    assert index.search("art") == ["art-1"]
+    assert index.search("homework") == []
+    assert index.search("") == ["math-ali", "math-sara", "art-1"]
+
+
+def test_search_scans_only_matching_profiles_of_ten_thousand() -> None:
+    index = ProfileSearchIndex(_profile(f"kid-{number}", f"Student {number:05} study") for number in range(10_000))
+
+    scanned = {}
+    for query in ("0042", "9999 st", "kid-123", "student 0004"):
+        index.keys_scanned = 0
+        results = index.search(query)
+        scanned[query] = (index.keys_scanned, len(results))
+
+    assert index.search("0042") == ["kid-42"] + [f"kid-{number}" for number in range(420, 430)]
+    # Posting intersections leave a handful of candidates out of 20,000 keys.
+    assert all(keys <= results + 20 for keys, results in scanned.values()), scanned
+
+
+def test_viewport_clamps_scrolling_and_reports_fractions() -> None:
+    viewport = ListViewport(visible_rows=10)
+    viewport.set_total(10_000)
+
+    viewport.moveto(0.5)
+    assert viewport.visible_range() == (5000, 5010)
+    viewport.scroll_by(10_000)
+    assert viewport.visible_range() == (9990, 10_000)
+    viewport.ensure_visible(3)
+    assert viewport.offset == 3
+    viewport.set_total(4)
+    assert viewport.visible_range() == (0, 4)
+    assert viewport.scrollbar_fractions() == (0.0, 1.0)
@@ -0,0 +1,35 @@
+"""Tests for opt-in action profiling."""
+
+import pstats
+import tracemalloc
+
+from services.app_controller import AppController
+from utils.profiling import CONTROLLER_ACTIONS, PROFILE_ENV_VAR, capture_from_env
+
+
+def test_capture_is_disabled_without_env_var(tmp_path) -> None:
+    assert capture_from_env(tmp_path, environ={}) is None
+    assert capture_from_env(tmp_path, environ={PROFILE_ENV_VAR: "0"}) is None
+    assert capture_from_env(tmp_path, environ={PROFILE_ENV_VAR: "5"}).max_bytes == 5 * 1024 * 1024
+
+
+def test_wrapped_actions_dump_profiles_within_size_cap(tmp_path) -> None:
+    controller = AppController(storage_path=tmp_path / "state.json")
+    capture = capture_from_env(tmp_path / "profiles", environ={PROFILE_ENV_VAR: "1"})
+    capture.instrument(controller, CONTROLLER_ACTIONS)
+    profile = controller.list_profiles()[0]
+
+    controller.run_profile_session(profile.profile_id, completed_minutes=profile.total_minutes)
+
+    files = {path.suffix: path for path in capture.files()}
+    assert sorted(files) == [".alloc", ".prof"]
+    assert "run_profile_session" in files[".prof"].name
+    stats = pstats.Stats(str(files[".prof"]))
+    assert any(func[2] == "run_profile_session" for func in stats.stats)
+    assert tracemalloc.Snapshot.load(str(files[".alloc"])).traces is not None
+    assert not tracemalloc.is_tracing()
+
+    capture.max_bytes = sum(path.stat().st_size for path in files.values()) + 1
+    controller.get_report()
+    assert sum(path.stat().st_size for path in capture.files()) <= capture.max_bytes
+    assert any("get_report" in path.name for path in capture.files())
@@ -0,0 +1,89 @@
+"""Tests for folding old sessions into daily totals."""
+
+from datetime import date, timedelta
+
+from data.models import Period
+from services.app_controller import AppController
+
+
+def _write_history(path, start: date, days: int) -> None:
+    lines = ["profile_id,completed_minutes,session_date"]
+    for offset in range(days):
+        day = (start + timedelta(days=offset)).isoformat()
+        lines.append(f"study-default,{20 + offset % 40},{day}")
+        lines.append(f"gaming-default,{10 + offset % 30},{day}")
+        if offset % 3 == 0:
+            lines.append(f"study-default,45,{day}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _reports(controller: AppController):
+    return {period: controller.get_report(period) for period in Period}
+
+
+def test_retention_keeps_rollups_and_rewards_exact(tmp_path) -> None:
+    source = tmp_path / "history.csv"
+    _write_history(source, date(2024, 1, 1), 800)
+    controller = AppController(storage_path=tmp_path / "state.json", retention_days=365)
+    controller.import_sessions(source)
+    reports_before = _reports(controller)
+    scores_before = controller.get_scores()
+    reward_before = controller.get_next_reward_progress(Period.MONTHLY)
+    sessions_before = len(controller.state.sessions)
+
+    result = controller.apply_retention(today=date(2026, 3, 10))
+
+    assert result.cutoff == date(2025, 3, 11)
+    assert result.folded_sessions == sessions_before - len(controller.state.sessions) > 0
+    assert all(session.session_date >= result.cutoff for session in controller.state.sessions)
+    assert controller.get_history_window(0, 5)[0] == len(controller.state.sessions)
+    assert _reports(controller) == reports_before
+    assert controller.get_scores() == scores_before
+    assert controller.get_next_reward_progress(Period.MONTHLY) == reward_before
+
+    reloaded = AppController(storage_path=tmp_path / "state.json", retention_days=365)
+    assert _reports(reloaded) == reports_before
+    assert len(reloaded.state.daily_totals) == len(controller.state.daily_totals)
+
+
+def test_retention_only_folds_sessions_that_crossed_the_cutoff(tmp_path) -> None:
+    source = tmp_path / "history.csv"
+    _write_history(source, date(2025, 1, 1), 60)
+    controller = AppController(storage_path=tmp_path / "state.json", retention_days=30)
+
+    controller.import_sessions(source)
+    first = controller.apply_retention(today=date(2025, 2, 14))
+    assert controller.apply_retention(today=date(2025, 2, 14)).folded_sessions == 0
+
+    second = controller.apply_retention(today=date(2025, 2, 16))
+    assert second.touched_days == 4  # two days x two profiles
+    assert first.folded_sessions + second.folded_sessions == sum(
+        item.sessions for item in controller.state.daily_totals
+    )
+
+
+def test_sync_after_retention_ships_archived_sessions(tmp_path) -> None:
+    source = tmp_path / "history.csv"
+    today = date.today()
+    _write_history(source, today - timedelta(days=499), 500)
+    device = AppController(storage_path=tmp_path / "device" / "state.json", retention_days=365)
+    device.import_sessions(source)
+    assert device.apply_retention(today).folded_sessions > 0
+
+    outbox = tmp_path / "changes.json"
+    device.export_changes(outbox)
+    peer = AppController(storage_path=tmp_path / "peer" / "state.json", retention_days=365)
+    report = peer.import_changes(outbox)
+
+    assert len(report.sessions) == sum(item.sessions for item in device.state.daily_totals) + len(
+        device.state.sessions
+    )
+    assert peer.get_scores() == device.get_scores()
+    assert _reports(peer) == _reports(device)
+    # Once the peer acknowledged them, archived sessions are not shipped again.
+    peer.export_changes(tmp_path / "ack.json")
+    device.import_changes(tmp_path / "ack.json")
+    device.repository.cold.blocks_decompressed = 0
+    device.export_changes(outbox, peer_id=peer.device_id)
+    assert device.repository.read_change_set(outbox).sessions == []
+    assert device.repository.cold.blocks_decompressed == 0
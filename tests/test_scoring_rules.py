@@ -0,0 +1,98 @@
+"""Tests for compiled, data-defined scoring rules."""
+
+import json
+from datetime import date
+
+import pytest
+
+from data.models import Period, SessionRecord, TaskProfile
+from services.app_controller import AppController
+from services.scoring_rules import ScoringRuleBook, coefficient_table, compile_rules
+
+
+def _reference_points(session: SessionRecord) -> int:
+    completion_ratio = min(session.completed_minutes / session.planned_minutes, 1.0)
+    return int(completion_ratio * 100) + session.completed_focus_blocks * 2
+
+
+def test_default_rules_match_historical_formula() -> None:
+    book = ScoringRuleBook()
+    sessions = [
+        SessionRecord("p", planned, completed, blocks, date(2026, 1, 1))
+        for planned in (1, 7, 45, 60, 97)
+        for completed in range(0, planned + 3)
+        for blocks in (0, 3)
+    ]
+
+    assert book.score_many(sessions) == [_reference_points(item) for item in sessions]
+
+
+def test_profile_rules_override_global_and_reject_unknown_metrics() -> None:
+    study = TaskProfile(
+        profile_id="study",
+        title="study",
+        total_minutes=60,
+        settings={"scoring_rules": json.dumps([{"metric": "completed_minutes", "weight": 3}])},
+    )
+    book = ScoringRuleBook([{"metric": "session", "weight": 10}], [study])
+
+    assert book.score(SessionRecord("study", 60, 30, 1, date(2026, 1, 1))) == 90
+    assert book.score(SessionRecord("game", 60, 30, 1, date(2026, 1, 1))) == 10
+    with pytest.raises(ValueError):
+        compile_rules([{"metric": "typing_speed", "weight": 1}])
+
+
+def test_changing_profile_rules_recomputes_reports(tmp_path) -> None:
+    controller = AppController(storage_path=tmp_path / "state.json")
+    profile = controller.list_profiles()[0]
+    controller.run_profile_session(profile.profile_id, completed_minutes=profile.total_minutes)
+
+    profile.settings = {"scoring_rules": json.dumps([{"metric": "completed_minutes", "weight": 2}])}
+    controller.upsert_profile(profile)
+
+    report = controller.get_report(Period.YEARLY, profile.profile_id)
+    assert report[0].totals.points == profile.total_minutes * 2
+
+
+def test_per_session_cost_stays_flat_as_rule_count_grows() -> None:
+    class CountingRule(dict):
+        lookups = 0
+
+        def get(self, *args):
+            CountingRule.lookups += 1
+            return super().get(*args)
+
+    sessions = [SessionRecord("p", 60, minute % 61, minute % 3, date(2026, 1, 1)) for minute in range(2_000)]
+    single = compile_rules([{"metric": "completed_minutes", "weight": 250}])
+    many = compile_rules([CountingRule(metric="completed_minutes", weight=0.25) for _ in range(1000)])
+    compile_lookups = CountingRule.lookups
+
+    assert len(coefficient_table([{"metric": "session", "weight": 1}] * 1000)) == len(coefficient_table([]))
+    assert len(many.__closure__) == len(single.__closure__)
+    assert [many(session) for session in sessions] == [single(session) for session in sessions]
+    # Scoring reads the folded coefficients only, never the rules themselves.
+    assert CountingRule.lookups == compile_lookups
+
+
+def test_invalid_stored_rules_fall_back_to_defaults_and_new_ones_are_rejected(tmp_path, caplog) -> None:
+    source = AppController(storage_path=tmp_path / "source" / "state.json")
+    broken = source.list_profiles()[0]
+    broken.settings = {"scoring_rules": "[{broken"}
+    with pytest.raises(ValueError):
+        source.upsert_profile(broken)
+    with pytest.raises(ValueError):
+        source.set_scoring_rules([{"metric": "completed_minutes", "weight": "many"}])
+
+    # Rules that reached the state anyway (older versions, merges) must not stop the app from loading.
+    with source.repository.lock:
+        source.repository.save(source.state, source._journal_cursor)
+    with caplog.at_level("WARNING", logger="services.scoring_rules"):
+        reloaded = AppController(storage_path=tmp_path / "source" / "state.json")
+    assert broken.profile_id in caplog.text
+    session = SessionRecord(broken.profile_id, 60, 30, 1, date(2026, 1, 1))
+    assert reloaded.scoring_service.calculate_points(session) == _reference_points(session)
+
+    reloaded.export_changes(tmp_path / "changes.json")
+    target = AppController(storage_path=tmp_path / "target" / "state.json")
+    with pytest.raises(ValueError):
+        target.import_changes(tmp_path / "changes.json")
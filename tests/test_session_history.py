@@ -0,0 +1,102 @@
+"""Tests for keyset-paginated session history."""
+
+import random
+from collections import Counter
+from datetime import date, timedelta
+
+from data.models import SessionRecord
+from services.app_controller import AppController
+from utils import session_history
+from utils.session_history import SessionHistoryRepository
+
+
+def _sessions(count: int) -> list:
+    start = date(2025, 1, 1)
+    return [
+        SessionRecord(
+            profile_id="study" if number % 2 else "game",
+            planned_minutes=30,
+            completed_minutes=number % 31,
+            completed_focus_blocks=1,
+            session_date=start + timedelta(days=number // 3),
+            sequence=number + 1,
+        )
+        for number in range(count)
+    ]
+
+
+def test_keyset_pages_walk_history_newest_first_without_gaps() -> None:
+    sessions = _sessions(95)
+    history = SessionHistoryRepository(reversed(sessions))
+
+    seen = []
+    cursor = None
+    while True:
+        page = history.page(after=cursor, limit=20)
+        seen.extend(item.sequence for item in page.rows)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == list(range(95, 0, -1))
+    assert history.page(profile_id="study", limit=3).rows[0].sequence == 94
+    assert history.count("game") == 48
+
+
+def test_window_and_backfilled_rows_keep_date_order() -> None:
+    history = SessionHistoryRepository(_sessions(10))
+    backfill = SessionRecord("study", 30, 30, 1, date(2024, 12, 31), sequence=history.next_sequence())
+
+    history.add(backfill)
+
+    assert history.window(0, 2)[0].sequence == 10
+    assert history.window(10, 5) == [backfill]
+    history.remove(backfill)
+    assert history.count() == 10
+
+
+def test_controller_assigns_sequences_and_pages_sessions(tmp_path) -> None:
+    controller = AppController(storage_path=tmp_path / "state.json")
+    profile = controller.list_profiles()[0]
+    for _ in range(3):
+        controller.run_profile_session(profile.profile_id)
+
+    page = controller.query_sessions(profile_id=profile.profile_id, limit=2)
+    total, rows = AppController(storage_path=tmp_path / "state.json").get_history_window(2, 5)
+
+    assert [item.sequence for item in page.rows] == [3, 2]
+    assert controller.query_sessions(after=page.next_cursor).rows[0].sequence == 1
+    assert total == 3 and [item.sequence for item in rows] == [1]
+
+
+def test_out_of_order_sessions_are_indexed_in_bulk(monkeypatch) -> None:
+    sessions = _sessions(100_000)
+    random.Random(7).shuffle(sessions)
+    calls = Counter()
+
+    def counted(name, function):
+        def wrapper(*args):
+            calls[name] += 1
+            return function(*args)
+
+        return wrapper
+
+    monkeypatch.setattr(session_history, "_insert", counted("insert", session_history._insert))
+    monkeypatch.setattr(session_history, "_merge_sorted", counted("merge", session_history._merge_sorted))
+
+    # One merge per key list (all sessions plus each profile) per batch, never a per-session insert.
+    history = SessionHistoryRepository(sessions)
+    assert calls == {"merge": 3}
+    batched = SessionHistoryRepository()
+    for position in range(0, len(sessions), 10_000):
+        batched.add_many(sessions[position : position + 10_000])
+    assert calls == {"merge": 3 + 10 * 3}
+    SessionHistoryRepository(sessions[:5])
+    assert calls["insert"] == 5 * 2  # small batches go key by key into both lists
+    newest = sorted(sessions, key=lambda item: (item.session_date, item.sequence), reverse=True)
+    for index in (history, batched):
+        assert index.window(0, 50) == newest[:50]
+        assert index.window(70_000, 50) == newest[70_000:70_050]
+        assert index.count("game") == 50_000
+        assert index.page(profile_id="study", limit=5).rows == [item for item in newest if item.profile_id == "study"][:5]
+    assert batched.next_sequence() == 100_001
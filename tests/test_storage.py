@@ -1,9 +1,13 @@
 """Tests for JSON state persistence."""
 
-from datetime import date
+import json
+import tracemalloc
+from datetime import date, timedelta
 
-from data.models import AppState, Period, RewardRule, ScoreSnapshot, SessionRecord, TaskProfile
-from utils.storage import LocalStateRepository
+import pytest
+
+from data.models import AppState, Period, RewardRule, ScoreSnapshot, SessionRecord, SyncState, TaskProfile
+from utils.storage import JournalCursor, LocalStateRepository
 
 
 def test_save_and_load_state(tmp_path) -> None:
@@ -30,3 +34,73 @@ def test_save_and_load_state(tmp_path) -> None:
     assert loaded.rewards[0].period == Period.WEEKLY
     assert loaded.scores.monthly == 2
     assert loaded.sessions[0].session_date.isoformat() == "2026-01-01"
+
+
+def test_journal_skips_torn_lines_and_detects_compaction(tmp_path) -> None:
+    repository = LocalStateRepository(tmp_path / "state.json")
+    session = SessionRecord("p1", 30, 30, 1, date(2026, 1, 2), sequence=1)
+    cursor = repository.append_journal([repository.session_entry(session, 102, 0)], JournalCursor())
+    with repository.journal_path.open("ab") as handle:
+        handle.write(b'{"op": "session", "wri')
+    cursor = repository.append_journal([repository.profile_entry(TaskProfile("p2", "read", 20))], cursor)
+
+    entries, end, reset = repository.read_journal(JournalCursor())
+    assert [entry.op for entry in entries] == ["session", "profile"]
+    assert entries[0].session.sequence == 1 and entries[0].points == 102
+    assert end == cursor and not reset
+
+    fresh = repository.compact(AppState(), end)
+    _, marker = repository.load_snapshot()
+    assert marker == end
+    assert repository.read_journal(marker) == ([], fresh, True)
+
+
+def _history_state(count: int) -> AppState:
+    sessions = [
+        SessionRecord("p1", 30, 20 + index % 10, 1, date(2024, 1, 1) + timedelta(days=index % 700), index + 1, "dev1")
+        for index in range(count)
+    ]
+    return AppState(profiles=[TaskProfile("p1", "study", 30)], sessions=sessions, sync=SyncState(device_id="dev1"))
+
+
+def test_streaming_load_reads_legacy_layout_with_small_memory_peak(tmp_path) -> None:
+    repository = LocalStateRepository(tmp_path / "state.json")
+    state = _history_state(20000)
+    repository.save(state)
+    # Files written before the streaming loader used indent=2 and put sessions mid-file.
+    legacy = LocalStateRepository(tmp_path / "legacy.json")
+    payload = json.loads(repository.storage_path.read_text(encoding="utf-8"))
+    legacy.storage_path.write_text(json.dumps(dict(reversed(payload.items())), indent=2), encoding="utf-8")
+
+    tracemalloc.start()
+    loaded, _ = repository.load_snapshot()
+    _, streaming_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tracemalloc.start()
+    json.loads(repository.storage_path.read_text(encoding="utf-8"))
+    _, dict_tree_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert loaded.sessions == state.sessions
+    assert legacy.load().sessions == state.sessions
+    # The whole state costs less at peak than json.loads' dict tree alone.
+    assert streaming_peak < dict_tree_peak * 0.75
+
+
+def test_streaming_load_reports_error_position(tmp_path) -> None:
+    repository = LocalStateRepository(tmp_path / "state.json")
+    repository.save(_history_state(3000))
+    text = repository.storage_path.read_text(encoding="utf-8")
+    broken = text.index('"completed_minutes"', len(text) // 2)
+    repository.storage_path.write_text(text[:broken] + "}" + text[broken + 1 :], encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(repository.storage_path.read_text(encoding="utf-8"))
+    error = expected.value
+    position = rf"{error.msg}: line {error.lineno} column {error.colno} \(char {error.pos}\)"
+    with pytest.raises(ValueError, match=rf"state\.json: {position}"):
+        repository.load()
+
+    repository.storage_path.write_text(text[: len(text) // 3], encoding="utf-8")
+    with pytest.raises(ValueError, match="state.json: .*line 1"):
+        repository.load()
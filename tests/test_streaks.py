@@ -0,0 +1,51 @@
+"""Tests for incremental streak tracking and streak bonus scoring."""
+
+from datetime import date, timedelta
+
+from data.models import ScoreSnapshot, SessionRecord, StreakState
+from services.app_controller import AppController
+from services.scoring import ScoringService
+from services.streaks import StreakTracker
+
+
+def test_backfilled_day_bridges_runs_and_updates_current_streak() -> None:
+    tracker = StreakTracker(StreakState())
+    for day in (date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 4), date(2026, 3, 5)):
+        tracker.record(day)
+
+    assert tracker.current_streak(date(2026, 3, 5)) == 2
+
+    update = tracker.record(date(2026, 3, 3))
+    repeat = tracker.record(date(2026, 3, 3))
+
+    assert update.new_day and update.streak_days == 5
+    assert not repeat.new_day
+    assert tracker.current_streak(date(2026, 3, 6)) == 5
+    assert tracker.current_streak(date(2026, 3, 8)) == 0
+    assert tracker.state.day_runs == {date(2026, 3, 1).toordinal(): date(2026, 3, 5).toordinal()}
+
+
+def test_weekly_badge_unlocks_once_and_adds_bonus() -> None:
+    tracker = StreakTracker(StreakState())
+    service = ScoringService()
+    monday = date(2026, 3, 2)
+    session = SessionRecord("study", 60, 60, 2, monday)
+
+    bonuses = [service.streak_bonus(tracker.record(monday + timedelta(days=offset))) for offset in range(6)]
+    result = service.apply_session(ScoreSnapshot(), session, tracker.record(monday + timedelta(days=6)))
+
+    assert bonuses == [0, 5, 10, 15, 20 + 25, 25]
+    assert tracker.weekly_badges() == 1
+    assert result.bonus_points == 30
+    assert result.awarded_points == 134
+
+
+def test_streak_state_persists_with_scores(tmp_path) -> None:
+    controller = AppController(storage_path=tmp_path / "state.json")
+    profile = controller.list_profiles()[0]
+    controller.run_profile_session(profile.profile_id)
+
+    reloaded = AppController(storage_path=tmp_path / "state.json")
+
+    assert reloaded.state.streaks == controller.state.streaks
+    assert reloaded.get_streak_summary()[0] == 1
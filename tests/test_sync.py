@@ -0,0 +1,51 @@
+"""Tests for change-set sync between devices."""
+
+from dataclasses import replace
+
+from services.app_controller import AppController
+
+
+def test_change_sets_carry_only_unseen_changes(tmp_path) -> None:
+    child = AppController(storage_path=tmp_path / "child" / "state.json")
+    parent = AppController(storage_path=tmp_path / "parent" / "state.json")
+    profile = child.list_profiles()[0]
+    for _ in range(3):
+        child.run_profile_session(profile.profile_id, completed_minutes=profile.total_minutes)
+    parent_score = parent.get_scores().weekly
+
+    outbox = tmp_path / "child-to-parent.json"
+    child.export_changes(outbox)
+    report = parent.import_changes(outbox)
+
+    assert len(report.sessions) == 3
+    session_points = sum(parent.scoring_service.score_many(report.sessions))
+    assert parent.get_scores().weekly == parent_score + session_points + report.bonus_points
+    assert parent.import_changes(outbox).duplicates == 3
+
+    parent.run_profile_session(profile.profile_id, completed_minutes=profile.total_minutes)
+    inbox = tmp_path / "parent-to-child.json"
+    parent.export_changes(inbox, peer_id=child.device_id)
+    assert len(child.import_changes(inbox).sessions) == 1
+
+    child.export_changes(outbox, peer_id=parent.device_id)
+    assert child.repository.read_change_set(outbox).sessions == []
+    reloaded = AppController(storage_path=tmp_path / "parent" / "state.json")
+    assert reloaded.get_history_window(0, 10)[0] == 4
+
+
+def test_concurrent_profile_edits_merge_deterministically(tmp_path) -> None:
+    first = AppController(storage_path=tmp_path / "a" / "state.json")
+    second = AppController(storage_path=tmp_path / "b" / "state.json")
+    profile = first.list_profiles()[0]
+    first.upsert_profile(replace(profile, total_minutes=50))
+    second.upsert_profile(replace(profile, total_minutes=70))
+
+    first.export_changes(tmp_path / "a.json")
+    second.export_changes(tmp_path / "b.json")
+    first.import_changes(tmp_path / "b.json")
+    second.import_changes(tmp_path / "a.json")
+
+    merged = [first._find_profile(profile.profile_id), second._find_profile(profile.profile_id)]
+    assert merged[0].total_minutes == merged[1].total_minutes
+    assert len(first.list_profiles()) == len(second.list_profiles()) == 3
+    assert len(first.state.rewards) == len(second.state.rewards) == 3
@@ -0,0 +1,139 @@
+"""Tests for compact session event timelines."""
+
+import json
+import time
+from datetime import date, timedelta
+
+from services.app_controller import AppController
+from utils.timeline import (
+    EventKind,
+    TimelineEvent,
+    TimelineStore,
+    decode_timeline,
+    encode_timeline,
+    focus_seconds,
+    paused_seconds,
+)
+
+
+def _events(*pairs):
+    return [TimelineEvent(kind, offset) for kind, offset in pairs]
+
+
+def test_timeline_encoding_is_small_and_store_survives_torn_tail(tmp_path) -> None:
+    events = _events(
+        (EventKind.START, 0),
+        (EventKind.FOCUS, 0),
+        (EventKind.PAUSE, 900),
+        (EventKind.RESUME, 1200),
+        (EventKind.BREAK, 1800),
+        (EventKind.FOCUS, 2100),
+        (EventKind.ALERT, 3300),
+        (EventKind.STOP, 3600),
+    )
+    encoded = encode_timeline(events)
+    as_json = json.dumps([[event.kind.name, event.offset_seconds] for event in events])
+    assert len(encoded) <= 16 < len(as_json) // 5
+    assert decode_timeline(encoded) == events
+    assert focus_seconds(events) == 900 + 600 + 1500
+    assert paused_seconds(events) == 300
+
+    started = time.perf_counter()
+    for _ in range(10000):
+        decode_timeline(encoded)
+    # Timings vary between machines, so decode speed is reported rather than asserted.
+    print(f"benchmark: 10000 timeline decodes in {time.perf_counter() - started:.3f}s")
+
+    store = TimelineStore(tmp_path / "state.json.timeline")
+    store.append(1, events)
+    store.append(2, events[:2])
+    with store.path.open("ab") as handle:
+        handle.write(b"\x03\x20\x01")  # crash in the middle of the next record
+    reopened = TimelineStore(store.path)
+    assert reopened.get(1) == events
+    assert reopened.bytes_decoded == len(encoded)  # a lookup reads its own record only
+    assert reopened.get(3) is None
+    reopened.append(3, events[:3])
+    assert TimelineStore(store.path).get(3) == events[:3]
+    assert TimelineStore(store.path).get(2) == events[:2]
+
+
+def test_live_session_records_pauses_blocks_and_crash_gap(tmp_path, monkeypatch) -> None:
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    controller = AppController(storage_path=tmp_path / "state.json", checkpoint_interval_seconds=0)
+    profile = next(item for item in controller.list_profiles() if item.total_minutes == 60)
+    started = now[0]
+
+    def at(offset: int) -> None:
+        now[0] = started + offset
+
+    controller.begin_live_session(profile.profile_id)
+    at(900)
+    controller.tick_live_session(900)
+    controller.set_live_paused(True)
+    at(1200)
+    controller.set_live_paused(False)
+    at(1800)
+    controller.tick_live_session(1500)
+    at(2100)
+    controller.tick_live_session(1800)
+    at(3300)
+    controller.tick_live_session(3000)
+    controller.finish_live_session()
+
+    sequence = controller.state.sessions[-1].sequence
+    timeline = controller.get_session_timeline(sequence)
+    assert [(event.kind, event.offset_seconds) for event in timeline] == [
+        (EventKind.START, 0),
+        (EventKind.FOCUS, 0),
+        (EventKind.PAUSE, 900),
+        (EventKind.RESUME, 1200),
+        (EventKind.BREAK, 1800),
+        (EventKind.FOCUS, 2100),
+        (EventKind.ALERT, 3300),
+        (EventKind.STOP, 3300),
+    ]
+    assert controller.get_focus_seconds(sequence) == 900 + 600 + 1200
+
+    # A crash leaves the checkpoint behind; the downtime becomes a pause.
+    started = now[0]
+    controller.begin_live_session(profile.profile_id)
+    at(600)
+    controller.tick_live_session(600)
+    controller.checkpointer.close()
+    at(1000)
+    restarted = AppController(storage_path=tmp_path / "state.json")
+    restarted.resume_pending_session()
+    at(1300)
+    restarted.tick_live_session(900)
+    restarted.finish_live_session()
+    monkeypatch.undo()
+
+    sequence = restarted.state.sessions[-1].sequence
+    timeline = AppController(storage_path=tmp_path / "state.json").get_session_timeline(sequence)
+    assert [event.kind for event in timeline][2:] == [EventKind.PAUSE, EventKind.RESUME, EventKind.STOP]
+    assert paused_seconds(timeline) == 400
+    assert focus_seconds(timeline) == 900
+
+
+def test_sequences_are_not_reused_after_retention_archives_every_session(tmp_path) -> None:
+    controller = AppController(storage_path=tmp_path / "state.json", retention_days=30)
+    profile = controller.list_profiles()[0]
+    controller.begin_live_session(profile.profile_id)
+    controller.tick_live_session(600)
+    controller.finish_live_session()
+    live = controller.state.sessions[-1]
+    later = date.today() + timedelta(days=60)
+    assert controller.apply_retention(later).folded_sessions == 1
+    assert controller.state.sessions == []
+
+    reloaded = AppController(storage_path=tmp_path / "state.json", retention_days=30)
+    reloaded.run_profile_session(profile.profile_id, completed_minutes=30)
+    manual = reloaded.state.sessions[-1]
+
+    assert manual.sequence > live.sequence
+    assert reloaded.get_session_timeline(manual.sequence) is None
+    assert reloaded.get_session_timeline(live.sequence)[-1].kind == EventKind.STOP
+    archived = reloaded.get_archived_sessions(date.today(), later)
+    assert [session.sequence for session in archived] == [live.sequence]
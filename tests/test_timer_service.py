@@ -1,6 +1,7 @@
 """Tests for timer behavior and edge cases."""
 
 from data.models import TaskProfile
+from services.app_controller import AppController
 from services.timer_service import TimerController
 
 
@@ -48,3 +49,21 @@ def test_switching_profiles_keeps_profile_identity() -> None:
 
     assert first.session.profile_id == "study"
     assert second.session.profile_id == "game"
+
+
+def test_live_sessions_are_recorded_without_the_end_reminder(tmp_path) -> None:
+    controller = AppController(storage_path=tmp_path / "state.json")
+    fake = FakeNotificationService()
+    controller.timer_controller.notification_service = fake
+    profile = next(item for item in controller.list_profiles() if item.alert_before_end_minutes > 0)
+
+    controller.begin_live_session(profile.profile_id)
+    controller.tick_live_session(profile.total_minutes * 60)
+    controller.finish_live_session()
+
+    assert controller.state.sessions[-1].completed_minutes == profile.total_minutes
+    assert fake.popup_calls == [] and fake.sound_calls == 0
+    assert not controller.checkpointer.path.exists()
+
+    controller.run_profile_session(profile.profile_id)
+    assert len(fake.popup_calls) == 1 and fake.sound_calls == 1
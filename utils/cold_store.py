@@ -0,0 +1,344 @@
+"""Compressed cold tier for sessions moved out of the state snapshot."""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from contextlib import nullcontext
+from dataclasses import dataclass, field, replace
+from datetime import date
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from data.models import SessionRecord
+
+MAGIC = b"PKCOLD1\n"
+# File ends with the footer offset and the magic again.
+TRAILER = struct.Struct("<Q8s")
+DEFAULT_BLOCK_SESSIONS = 4096
+# Encoded bytes fed to the compressor per staging step (about a millisecond of lzma).
+STAGE_CHUNK_BYTES = 4 * 1024
+# A block's JSON fits 1 MiB; the default 8 MiB dictionary takes milliseconds to allocate.
+LZMA_DICT_BYTES = 1 << 20
+# Codecs are imported on the first archive write or query, not at startup.
+CODECS = ("lzma", "zlib")
+
+
+@dataclass
+class ColdBlock:
+    """Index entry of one compressed block.
+
+    Attributes:
+        offset: Byte offset of the block in the file.
+        length: Compressed size in bytes.
+        start: Archive position of the block's first session.
+        count: Sessions in the block.
+        first_day: Ordinal of the earliest session date in the block.
+        last_day: Ordinal of the latest session date in the block.
+        codec: Compression codec name.
+        stamps: Highest sync stamp per origin device in the block (empty in
+            blocks written before stamps were recorded).
+    """
+
+    offset: int
+    length: int
+    start: int
+    count: int
+    first_day: int
+    last_day: int
+    codec: str
+    stamps: Dict[str, int] = field(default_factory=dict)
+
+
+class ColdSessionStore:
+    """Append-ordered session archive in independently compressed blocks.
+
+    Each block holds up to ``block_sessions`` sessions in columnar JSON;
+    the footer lists every block's date range, so a date query only
+    decompresses blocks overlapping it. Only the first ``committed``
+    sessions are visible: the repository records that count in the
+    snapshot, so blocks appended by a run that never saved its snapshot
+    are ignored on load and replaced on the next append.
+    """
+
+    def __init__(self, path: Path, codec: str = "lzma", block_sessions: int = DEFAULT_BLOCK_SESSIONS) -> None:
+        """Initialize store.
+
+        Args:
+            path: Archive file.
+            codec: ``"lzma"`` or ``"zlib"`` for new blocks.
+            block_sessions: Maximum sessions per block.
+        """
+
+        if codec not in CODECS:
+            raise ValueError(f"Unknown cold tier codec: {codec}")
+        if block_sessions <= 0:
+            raise ValueError("Block size must be positive")
+
+        self.path = path
+        self.codec = codec
+        self.block_sessions = block_sessions
+        self.committed = 0
+        self.blocks_decompressed = 0
+        self._cached_index: Optional[Tuple[Tuple[int, int], List[ColdBlock]]] = None
+
+    def blocks(self) -> List[ColdBlock]:
+        """Return index entries of blocks holding committed sessions."""
+
+        return [block for block in self._index() if block.start < self.committed]
+
+    def sessions_between(self, first: date, last: date, profile_id: Optional[str] = None) -> List[SessionRecord]:
+        """Return archived sessions dated ``first``..``last`` inclusive, oldest first."""
+
+        low, high = first.toordinal(), last.toordinal()
+        overlapping = [block for block in self.blocks() if block.first_day <= high and block.last_day >= low]
+        found: List[SessionRecord] = []
+        if not overlapping:
+            return found
+        with self.path.open("rb") as handle:
+            for block in overlapping:
+                for session in self._read_block(handle, block):
+                    if low <= session.session_date.toordinal() <= high and profile_id in (None, session.profile_id):
+                        found.append(session)
+        found.sort(key=lambda session: (session.session_date, session.sequence))
+        return found
+
+    def sessions_unseen(self, seen: Mapping[str, int]) -> List[SessionRecord]:
+        """Return archived sessions stamped above ``seen`` for their origin, in archive order.
+
+        Blocks whose stamps a peer has all seen are not decompressed.
+        """
+
+        def unseen(origin: str, sequence: int) -> bool:
+            return sequence > seen.get(origin, 0)
+
+        candidates = [
+            block
+            for block in self.blocks()
+            if not block.stamps or any(unseen(origin, sequence) for origin, sequence in block.stamps.items())
+        ]
+        found: List[SessionRecord] = []
+        if not candidates:
+            return found
+        with self.path.open("rb") as handle:
+            for block in candidates:
+                found.extend(
+                    session
+                    for session in self._read_block(handle, block)
+                    if unseen(session.origin, session.origin_sequence)
+                )
+        return found
+
+    def append(self, sessions: List[SessionRecord]) -> int:
+        """Archive sessions after the committed ones and return the new committed count.
+
+        Caller holds the repository lock and must save a snapshot recording
+        the returned count. Long appends should ``stage`` instead.
+        """
+
+        if not sessions:
+            return self.committed
+        committed = self.stage(sessions).commit()
+        assert committed is not None
+        return committed
+
+    def stage(self, sessions: List[SessionRecord]) -> "ColdStaging":
+        """Return an append of ``sessions`` to prepare in steps outside the lock."""
+
+        return ColdStaging(self, sessions)
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        """Return the archive file's mtime and size, or None when it does not exist."""
+
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_block(self, handle: BinaryIO, block: ColdBlock) -> List[SessionRecord]:
+        """Decompress one block and return its committed sessions."""
+
+        handle.seek(block.offset)
+        columns = json.loads(_codec(block.codec)[1](handle.read(block.length)))
+        self.blocks_decompressed += 1
+        from_ordinal = date.fromordinal
+        rows = zip(
+            columns["profile_id"],
+            columns["planned_minutes"],
+            columns["completed_minutes"],
+            columns["completed_focus_blocks"],
+            columns["day"],
+            columns["sequence"],
+            columns["origin"],
+            columns["origin_sequence"],
+        )
+        sessions = [
+            SessionRecord(profile_id, planned, completed, blocks, from_ordinal(day), sequence, origin, origin_sequence)
+            for profile_id, planned, completed, blocks, day, sequence, origin, origin_sequence in rows
+        ]
+        return sessions[: max(0, self.committed - block.start)]
+
+    def _index(self) -> List[ColdBlock]:
+        """Return all block entries from the footer, cached by file size and mtime."""
+
+        signature = self._signature()
+        if signature is None:
+            return []
+        if self._cached_index is not None and self._cached_index[0] == signature:
+            return self._cached_index[1]
+
+        size = signature[1]
+        with self.path.open("rb") as handle:
+            if handle.read(len(MAGIC)) != MAGIC or size < len(MAGIC) + TRAILER.size:
+                raise ValueError(f"{self.path}: not a cold session archive")
+            handle.seek(size - TRAILER.size)
+            footer_offset, magic = TRAILER.unpack(handle.read(TRAILER.size))
+            if magic != MAGIC or not len(MAGIC) <= footer_offset <= size - TRAILER.size:
+                raise ValueError(f"{self.path}: damaged cold archive footer")
+            handle.seek(footer_offset)
+            footer = json.loads(handle.read(size - TRAILER.size - footer_offset))
+        blocks = [ColdBlock(*entry) for entry in footer["blocks"]]
+        self._cached_index = (signature, blocks)
+        return blocks
+
+
+def _codec(name: str) -> Tuple[Callable[[], Any], Callable[[bytes], bytes]]:
+    """Return the incremental compressor factory and decompress function of codec ``name``."""
+
+    if name == "lzma":
+        import lzma
+
+        filters = [{"id": lzma.FILTER_LZMA2, "preset": 6, "dict_size": LZMA_DICT_BYTES}]
+        return (lambda: lzma.LZMACompressor(filters=filters)), lzma.decompress
+    if name == "zlib":
+        import zlib
+
+        return (lambda: zlib.compressobj(9)), zlib.decompress
+    raise ValueError(f"Unknown cold tier codec: {name}")
+
+
+class ColdStaging:
+    """An archive append written to a side file in small steps.
+
+    Committed blocks are copied as compressed bytes; only a partly filled
+    last block is decompressed and merged with the new sessions, and new
+    blocks are compressed incrementally, ``STAGE_CHUNK_BYTES`` at a time.
+    ``advance`` needs no lock; ``commit`` (lock held) only swaps the file
+    in, and gives up when another append changed the archive meanwhile.
+    """
+
+    def __init__(self, store: ColdSessionStore, sessions: List[SessionRecord]) -> None:
+        """Initialize staging of ``sessions`` after the store's committed ones."""
+
+        self.store = store
+        self.path = store.path.with_name(f"{store.path.name}.{os.getpid()}.staged")
+        self.committed = store.committed
+        self._base = (store._signature(), store.committed)
+        self._steps: Optional[Iterator[None]] = self._write(sessions)
+
+    def advance(self) -> bool:
+        """Do one step of staging; returns True while steps are left."""
+
+        if self._steps is None:
+            return False
+        try:
+            next(self._steps)
+            return True
+        except StopIteration:
+            self._steps = None
+            return False
+        except BaseException:
+            self.abort()
+            raise
+
+    def commit(self) -> Optional[int]:
+        """Swap the staged archive in (lock held) and return the new committed count.
+
+        Steps not taken yet run first. Returns None, discarding the staged
+        file, when the archive changed since staging began.
+        """
+
+        while self.advance():
+            pass
+        store = self.store
+        if (store._signature(), store.committed) != self._base:
+            self.abort()
+            return None
+        os.replace(self.path, store.path)
+        store.committed = self.committed
+        store._cached_index = None
+        return self.committed
+
+    def abort(self) -> None:
+        """Stop staging and remove the side file; a no-op after ``commit``."""
+
+        if self._steps is not None:
+            self._steps.close()
+            self._steps = None
+        self.path.unlink(missing_ok=True)
+
+    def _write(self, sessions: List[SessionRecord]) -> Iterator[None]:
+        """Write the archive with ``sessions`` appended to ``path``, yielding between steps."""
+
+        store = self.store
+        kept = store.blocks()
+        pending: List[SessionRecord] = []
+        with store.path.open("rb") if kept else nullcontext() as source, self.path.open("wb") as target:
+            if kept and store.committed - kept[-1].start < store.block_sessions:
+                # A partly filled or partly committed last block is re-encoded with the new sessions.
+                pending = store._read_block(source, kept.pop())
+                yield
+            pending.extend(sessions)
+
+            target.write(MAGIC)
+            written: List[ColdBlock] = []
+            for block in kept:
+                source.seek(block.offset)
+                written.append(replace(block, offset=target.tell()))
+                target.write(source.read(block.length))
+                yield
+            start = kept[-1].start + kept[-1].count if kept else 0
+            for position in range(0, len(pending), store.block_sessions):
+                chunk = pending[position : position + store.block_sessions]
+                written.append((yield from self._write_block(target, chunk, start)))
+                start += len(chunk)
+            footer_offset = target.tell()
+            target.write(json.dumps({"blocks": [list(vars(block).values()) for block in written]}).encode("utf-8"))
+            target.write(TRAILER.pack(footer_offset, MAGIC))
+        self.committed = start
+
+    def _write_block(self, target: BinaryIO, sessions: List[SessionRecord], start: int) -> Iterator[None]:
+        """Compress sessions as one block at the current file position; returns its ``ColdBlock``."""
+
+        days = [session.session_date.toordinal() for session in sessions]
+        columns = {
+            "profile_id": [session.profile_id for session in sessions],
+            "planned_minutes": [session.planned_minutes for session in sessions],
+            "completed_minutes": [session.completed_minutes for session in sessions],
+            "completed_focus_blocks": [session.completed_focus_blocks for session in sessions],
+            "day": days,
+            "sequence": [session.sequence for session in sessions],
+            "origin": [session.origin for session in sessions],
+            "origin_sequence": [session.origin_sequence for session in sessions],
+        }
+        stamps: Dict[str, int] = {}
+        for session in sessions:
+            if session.origin_sequence > stamps.get(session.origin, 0):
+                stamps[session.origin] = session.origin_sequence
+        codec = self.store.codec
+        compressor = _codec(codec)[0]()
+        offset = target.tell()
+        # The block is the columns' JSON object, encoded one column per step.
+        separator = "{"
+        for name, values in columns.items():
+            text = f"{separator}{json.dumps(name)}:{json.dumps(values, ensure_ascii=False, separators=(',', ':'))}"
+            separator = ","
+            data = text.encode("utf-8")
+            for piece in range(0, len(data), STAGE_CHUNK_BYTES):
+                target.write(compressor.compress(data[piece : piece + STAGE_CHUNK_BYTES]))
+                yield
+        target.write(compressor.compress(b"}"))
+        target.write(compressor.flush())
+        return ColdBlock(offset, target.tell() - offset, start, len(sessions), min(days), max(days), codec, stamps)
@@ -0,0 +1,113 @@
+"""Cross-process advisory file lock (fcntl on POSIX, msvcrt on Windows)."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import IO, Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """Re-entrant (per instance) exclusive lock on a small side file.
+
+    Hold times are recorded so callers can verify critical sections stay
+    short.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize lock over ``path`` (created on first use)."""
+
+        self.path = path
+        self.acquisitions = 0
+        self.max_hold_seconds = 0.0
+        self.total_hold_seconds = 0.0
+        self._handle: Optional[IO[bytes]] = None
+        self._depth = 0
+        self._acquired_at = 0.0
+
+    def __enter__(self) -> "FileLock":
+        """Acquire the lock, blocking until it is available."""
+
+        self.acquire()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Release the lock when the outermost block exits."""
+
+        self.release()
+
+    @property
+    def held(self) -> bool:
+        """Return True while this instance holds the lock."""
+
+        return self._depth > 0
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Acquire the lock; without ``blocking`` return False if another holder has it."""
+
+        if self._depth == 0:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handle = self.path.open("a+b")
+            try:
+                if not _lock(handle, blocking):
+                    handle.close()
+                    return False
+            except BaseException:
+                handle.close()
+                raise
+            self._handle = handle
+            self._acquired_at = time.perf_counter()
+        self._depth += 1
+        return True
+
+    def release(self) -> None:
+        """Release one acquisition; the lock is freed when the outermost one ends."""
+
+        self._depth -= 1
+        if self._depth > 0 or self._handle is None:
+            return
+
+        held = time.perf_counter() - self._acquired_at
+        _unlock(self._handle)
+        self._handle.close()
+        self._handle = None
+        self.acquisitions += 1
+        self.total_hold_seconds += held
+        self.max_hold_seconds = max(self.max_hold_seconds, held)
+
+
+def _lock(handle: IO[bytes], blocking: bool = True) -> bool:
+    """Take an exclusive lock on ``handle``; return False if busy and not ``blocking``."""
+
+    if os.name == "nt":
+        handle.seek(0)
+        while True:
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if not blocking:
+                    return False
+                # LK_LOCK gives up after ~10 seconds; keep waiting.
+                continue
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _unlock(handle: IO[bytes]) -> None:
+    """Release a lock taken by ``_lock``."""
+
+    if os.name == "nt":
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
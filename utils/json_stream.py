@@ -0,0 +1,185 @@
+"""Incremental JSON reading for large state files."""
+
+from __future__ import annotations
+
+import json
+from typing import IO, Any, Iterator, NoReturn, Tuple
+
+DEFAULT_CHUNK_CHARS = 64 * 1024
+_WHITESPACE = " \t\n\r"
+# Decode results this close to the end of the buffered text may come from a value cut by the chunk.
+_TRUNCATION_MARGIN = 64
+
+
+class JsonStreamReader:
+    """Reads one JSON document from a text stream a chunk at a time.
+
+    Containers can be walked item by item (``iter_object``/``iter_array``)
+    so a caller converts each array element as soon as it is decoded and
+    only one chunk of raw text is held at a time. Scalars and small
+    containers are decoded whole with ``read_value``. Errors raise
+    ``ValueError`` naming the line, column and character offset.
+    """
+
+    def __init__(self, handle: IO[str], name: str = "<stream>", chunk_chars: int = DEFAULT_CHUNK_CHARS) -> None:
+        """Initialize reader.
+
+        Args:
+            handle: Text stream positioned at the start of the document.
+            name: Source name used in error messages.
+            chunk_chars: Characters read from ``handle`` at a time.
+        """
+
+        if chunk_chars <= 0:
+            raise ValueError("Chunk size must be positive")
+
+        self.name = name
+        self._handle = handle
+        self._chunk_chars = chunk_chars
+        self._decode = json.JSONDecoder().raw_decode
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        # Bookkeeping for text already dropped from the buffer, for error positions.
+        self._dropped_chars = 0
+        self._dropped_lines = 0
+        self._dropped_last_line_start = 0
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of an object; the caller must read each value before the next key."""
+
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self._peek() != '"':
+                self._fail("Expecting property name enclosed in double quotes")
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            if self._next_separator("}"):
+                return
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield decoded array items one by one."""
+
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        decode = self._decode
+        while True:
+            # Fast path: the item and the comma after it are already buffered.
+            self._peek()
+            buffer = self._buffer
+            try:
+                value, end = decode(buffer, self._pos)
+            except json.JSONDecodeError:
+                end = len(buffer)
+            if end < len(buffer) and buffer[end] == ",":
+                self._pos = end + 1
+                yield value
+                continue
+
+            yield self.read_value()
+            if self._next_separator("]"):
+                return
+
+    def read_value(self) -> Any:
+        """Decode the next complete value."""
+
+        self._peek()
+        wanted = self._chunk_chars
+        while True:
+            try:
+                value, end = self._decode(self._buffer, self._pos)
+            except json.JSONDecodeError as error:
+                truncated = error.msg.startswith("Unterminated string") or (
+                    len(self._buffer) - error.pos < _TRUNCATION_MARGIN
+                )
+                if self._eof or not truncated:
+                    self._fail(error.msg, error.pos)
+            else:
+                # A number near the buffer end may be cut (``-2.5e|10`` decodes as ``-2.5``).
+                if self._eof or len(self._buffer) - end >= _TRUNCATION_MARGIN:
+                    self._pos = end
+                    return value
+            wanted *= 2
+            self._fill(wanted)
+
+    def finish(self) -> None:
+        """Check that only whitespace follows the document."""
+
+        if self._peek() != "":
+            self._fail("Extra data")
+
+    def _next_separator(self, closing: str) -> bool:
+        """Consume ``,`` or ``closing``; return True at the closing bracket."""
+
+        char = self._peek()
+        self._pos += 1
+        if char == closing:
+            return True
+        if char != ",":
+            self._pos -= 1
+            self._fail(f"Expecting ',' delimiter or '{closing}'")
+        return False
+
+    def _expect(self, char: str) -> None:
+        """Consume ``char`` after optional whitespace."""
+
+        if self._peek() != char:
+            self._fail(f"Expecting '{char}'")
+        self._pos += 1
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, or ``""`` at the end."""
+
+        while True:
+            buffer = self._buffer
+            length = len(buffer)
+            pos = self._pos
+            while pos < length and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < length:
+                return buffer[pos]
+            if self._eof:
+                return ""
+            self._fill(self._chunk_chars)
+
+    def _fill(self, chars: int) -> None:
+        """Drop consumed text and read at least ``chars`` more characters if available."""
+
+        if self._pos:
+            consumed = self._buffer[: self._pos]
+            newlines = consumed.count("\n")
+            if newlines:
+                self._dropped_lines += newlines
+                self._dropped_last_line_start = self._dropped_chars + consumed.rindex("\n") + 1
+            self._dropped_chars += self._pos
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        chunk = self._handle.read(chars)
+        if not chunk:
+            self._eof = True
+        self._buffer += chunk
+
+    def _position(self, pos: int) -> Tuple[int, int, int]:
+        """Return line, column and absolute offset of buffer index ``pos``."""
+
+        before = self._buffer[:pos]
+        newlines = before.count("\n")
+        offset = self._dropped_chars + pos
+        if newlines:
+            line_start = self._dropped_chars + before.rindex("\n") + 1
+        else:
+            line_start = self._dropped_last_line_start
+        return self._dropped_lines + newlines + 1, offset - line_start + 1, offset
+
+    def _fail(self, message: str, pos: int = -1) -> NoReturn:
+        """Raise ``ValueError`` for a problem at buffer index ``pos`` (default: current)."""
+
+        line, column, offset = self._position(self._pos if pos < 0 else pos)
+        raise ValueError(f"{self.name}: {message}: line {line} column {column} (char {offset})")
@@ -0,0 +1,133 @@
+"""Prefix and substring search index over profile titles and ids."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Collection, Dict, Iterable, List, Set, Tuple
+
+from data.models import TaskProfile
+
+MAX_GRAM = 3
+
+
+def _grams(text: str) -> Set[str]:
+    """Return all substrings of ``text`` up to ``MAX_GRAM`` characters."""
+
+    return {
+        text[start : start + size]
+        for size in range(1, MAX_GRAM + 1)
+        for start in range(len(text) - size + 1)
+    }
+
+
+class ProfileSearchIndex:
+    """Finds profiles by case-insensitive prefix or substring of title or id.
+
+    A sorted key list answers prefix queries with ``bisect`` and n-gram
+    posting sets answer substring queries, so lookups touch only matching
+    profiles instead of scanning the whole catalog. ``keys_scanned``
+    counts the index entries lookups have walked or verified.
+    """
+
+    def __init__(self, profiles: Iterable[TaskProfile] = ()) -> None:
+        """Build index for an initial profile catalog."""
+
+        self._titles: Dict[str, str] = {}
+        self._keys: Dict[str, Tuple[str, str]] = {}
+        self._sorted: List[Tuple[str, str]] = []
+        self._by_title: List[Tuple[str, str]] = []
+        self._postings: Dict[str, Set[str]] = {}
+        self.keys_scanned = 0
+        for profile in profiles:
+            self.upsert(profile)
+
+    def __len__(self) -> int:
+        """Return number of indexed profiles."""
+
+        return len(self._keys)
+
+    def upsert(self, profile: TaskProfile) -> None:
+        """Add a profile or re-index it after its title changed."""
+
+        if profile.profile_id in self._keys:
+            if self._titles[profile.profile_id] == profile.title:
+                return
+            self.remove(profile.profile_id)
+
+        profile_id = profile.profile_id
+        title_key = profile.title.casefold()
+        id_key = profile_id.casefold()
+        self._titles[profile_id] = profile.title
+        self._keys[profile_id] = (title_key, id_key)
+        insort(self._sorted, (title_key, profile_id))
+        insort(self._sorted, (id_key, profile_id))
+        insort(self._by_title, (title_key, profile_id))
+        for gram in _grams(title_key) | _grams(id_key):
+            self._postings.setdefault(gram, set()).add(profile_id)
+
+    def remove(self, profile_id: str) -> None:
+        """Drop a profile from the index."""
+
+        keys = self._keys.pop(profile_id, None)
+        if keys is None:
+            return
+        del self._titles[profile_id]
+        for key in keys:
+            position = bisect_left(self._sorted, (key, profile_id))
+            del self._sorted[position]
+        del self._by_title[bisect_left(self._by_title, (keys[0], profile_id))]
+        for gram in _grams(keys[0]) | _grams(keys[1]):
+            bucket = self._postings[gram]
+            bucket.discard(profile_id)
+            if not bucket:
+                del self._postings[gram]
+
+    def search(self, query: str) -> List[str]:
+        """Return matching profile ids, prefix matches first, ordered by title."""
+
+        needle = query.strip().casefold()
+        if not needle:
+            return [profile_id for _, profile_id in self._by_title]
+
+        prefix_ids: List[str] = []
+        seen: Set[str] = set()
+        position = bisect_left(self._sorted, (needle, ""))
+        while position < len(self._sorted) and self._sorted[position][0].startswith(needle):
+            profile_id = self._sorted[position][1]
+            if profile_id not in seen:
+                seen.add(profile_id)
+                prefix_ids.append(profile_id)
+            position += 1
+            self.keys_scanned += 1
+
+        prefix_ids = self._ordered(prefix_ids)
+        substring_ids = self._substring_matches(needle) - seen
+        return prefix_ids + self._ordered(substring_ids)
+
+    def _substring_matches(self, needle: str) -> Set[str]:
+        """Return ids whose title or id contains ``needle``."""
+
+        if len(needle) <= MAX_GRAM:
+            return set(self._postings.get(needle, ()))
+
+        grams = [needle[start : start + MAX_GRAM] for start in range(len(needle) - MAX_GRAM + 1)]
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for bucket in postings[1:]:
+            candidates &= bucket
+            if not candidates:
+                return candidates
+        self.keys_scanned += len(candidates)
+        return {item for item in candidates if needle in self._keys[item][0] or needle in self._keys[item][1]}
+
+    def _ordered(self, profile_ids: Collection[str]) -> List[str]:
+        """Order ids by case-insensitive title, then id.
+
+        Large result sets are filtered from the pre-sorted title list
+        instead of being sorted again.
+        """
+
+        if len(profile_ids) * 8 < len(self._by_title):
+            return sorted(profile_ids, key=lambda item: (self._keys[item][0], item))
+        wanted = profile_ids if isinstance(profile_ids, (set, frozenset)) else set(profile_ids)
+        return [profile_id for _, profile_id in self._by_title if profile_id in wanted]
@@ -0,0 +1,138 @@
+"""Opt-in cProfile/tracemalloc capture of individual user actions."""
+
+from __future__ import annotations
+
+import functools
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Mapping, Optional
+
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+PROFILE_ENV_VAR = "POMODROKIDS_PROFILE"
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# Actions wrapped when capture is enabled.
+CONTROLLER_ACTIONS = (
+    "run_profile_session",
+    "upsert_profile",
+    "set_scoring_rules",
+    "finish_live_session",
+    "import_sessions",
+    "export_changes",
+    "import_changes",
+    "get_report",
+    "get_history_window",
+)
+WINDOW_ACTIONS = ("_run_session", "_save_current_profile", "_finish_live_session", "_log_manual_session")
+
+
+class ProfileCapture:
+    """Dumps one profile and one allocation snapshot per wrapped action call.
+
+    Captures go to ``directory`` as ``<time>-<n>-<action>.prof`` (``pstats``
+    format) and ``.alloc`` (``tracemalloc.Snapshot.load`` format); the oldest
+    files are deleted once the directory exceeds ``max_bytes``. Nested
+    actions are recorded as part of the outermost one.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Initialize capture directory and size cap."""
+
+        if max_bytes <= 0:
+            raise ValueError("Profile directory size cap must be positive")
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.captures = 0
+        self._active = False
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return ``func`` wrapped so each outermost call is captured as ``name``."""
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if self._active:
+                return func(*args, **kwargs)
+            return self._capture(name, func, args, kwargs)
+
+        return wrapper
+
+    def instrument(self, target: object, names: Iterable[str]) -> None:
+        """Replace methods of an instance or class with capturing wrappers.
+
+        Classes must be instrumented before instances bind the methods as
+        callbacks (e.g. Tk button commands).
+        """
+
+        for name in names:
+            setattr(target, name, self.wrap(name, getattr(target, name)))
+
+    def files(self) -> List[Path]:
+        """Return capture files, oldest first."""
+
+        if not self.directory.exists():
+            return []
+        return sorted(path for path in self.directory.iterdir() if path.suffix in (".prof", ".alloc"))
+
+    def _capture(self, name: str, func: Callable[..., Any], args: Any, kwargs: Any) -> Any:
+        """Run one call under cProfile and tracemalloc and dump both results."""
+
+        import cProfile
+        import tracemalloc
+
+        self._active = True
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            self._active = False
+            self._dump(name, profiler, snapshot)
+
+    def _dump(self, name: str, profiler: cProfile.Profile, snapshot: tracemalloc.Snapshot) -> None:
+        """Write capture files and enforce the directory size cap."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.captures += 1
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.captures:05d}-{name.lstrip('_')}"
+        profiler.dump_stats(str(self.directory / f"{stem}.prof"))
+        snapshot.dump(str(self.directory / f"{stem}.alloc"))
+        self._rotate()
+
+    def _rotate(self) -> None:
+        """Delete oldest captures until the directory fits ``max_bytes``."""
+
+        sized = [(path, path.stat().st_size) for path in self.files()]
+        total = sum(size for _, size in sized)
+        for path, size in sized:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def capture_from_env(
+    directory: Path,
+    environ: Optional[Mapping[str, str]] = None,
+) -> Optional[ProfileCapture]:
+    """Return a capture when ``POMODROKIDS_PROFILE`` is set, else None.
+
+    The variable may be ``1`` or a size cap in megabytes. Nothing is wrapped
+    when it is unset, so disabled profiling costs nothing at runtime.
+    """
+
+    value = (environ if environ is not None else os.environ).get(PROFILE_ENV_VAR, "").strip()
+    if value in ("", "0"):
+        return None
+    if value.isdigit() and int(value) > 1:
+        return ProfileCapture(directory, max_bytes=int(value) * 1024 * 1024)
+    return ProfileCapture(directory)
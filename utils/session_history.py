@@ -0,0 +1,228 @@
+"""Keyset-paginated query API over session history."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from data.models import SessionRecord
+
+# Cursor pointing at the last row of a page: (session_date, sequence).
+HistoryCursor = Tuple[date, int]
+
+_Key = Tuple[int, int]
+
+# Batches up to this size are inserted key by key instead of re-sorting.
+_BULK_THRESHOLD = 32
+# Batches smaller than 1/ratio of the index are spliced in rather than re-sorted.
+_SPLICE_RATIO = 8
+
+
+@dataclass
+class SessionPage:
+    """One newest-first page of session history.
+
+    Attributes:
+        rows: Sessions of the page, newest first.
+        next_cursor: Cursor for the following (older) page, or None at the end.
+    """
+
+    rows: List[SessionRecord]
+    next_cursor: Optional[HistoryCursor]
+
+
+class SessionHistoryRepository:
+    """Serves history pages keyed by ``(session_date, sequence)`` cursors.
+
+    Sorted key lists (global and per profile) make both cursor seeks and
+    offset lookups O(log n), so page cost does not depend on history size.
+    Sessions arriving in bulk (load, import, sync, journal replay) go
+    through ``add_many``, which sorts once instead of inserting one by one.
+    """
+
+    def __init__(self, sessions: Iterable[SessionRecord] = (), last_sequence: int = 0) -> None:
+        """Index existing sessions with a single sort.
+
+        Args:
+            sessions: Sessions to index.
+            last_sequence: Highest sequence assigned before, including sessions no longer indexed.
+        """
+
+        self._sessions: Dict[int, SessionRecord] = {}
+        self._keys: List[_Key] = []
+        self._profile_keys: Dict[str, List[_Key]] = {}
+        self._last_sequence = last_sequence
+        self.add_many(sessions)
+
+    @property
+    def last_sequence(self) -> int:
+        """Return the highest sequence seen, including dropped sessions."""
+
+        return self._last_sequence
+
+    def next_sequence(self) -> int:
+        """Return a sequence number greater than every session seen, dropped ones included."""
+
+        return self._last_sequence + 1
+
+    def add(self, session: SessionRecord) -> None:
+        """Index one session; appends in date order are amortized O(log n)."""
+
+        key = (session.session_date.toordinal(), session.sequence)
+        self._sessions[session.sequence] = session
+        self._last_sequence = max(self._last_sequence, session.sequence)
+        _insert(self._keys, key)
+        _insert(self._profile_keys.setdefault(session.profile_id, []), key)
+
+    def add_many(self, sessions: Iterable[SessionRecord]) -> None:
+        """Index a batch of sessions in any date order.
+
+        Small batches are inserted one by one; larger ones are sorted and
+        merged into the key lists in one pass, so the cost is
+        O(n + k log k) whatever the date order.
+        """
+
+        batch = list(sessions)
+        if len(batch) <= _BULK_THRESHOLD:
+            for session in batch:
+                self.add(session)
+            return
+
+        index = self._sessions
+        new_keys: List[_Key] = []
+        profile_keys: Dict[str, List[_Key]] = {}
+        for session in batch:
+            key = (session.session_date.toordinal(), session.sequence)
+            index[session.sequence] = session
+            new_keys.append(key)
+            profile_keys.setdefault(session.profile_id, []).append(key)
+        self._last_sequence = max(self._last_sequence, max(key[1] for key in new_keys))
+        self._keys = _merge_sorted(self._keys, new_keys)
+        for profile_id, keys in profile_keys.items():
+            self._profile_keys[profile_id] = _merge_sorted(self._profile_keys.get(profile_id, []), keys)
+
+    def remove(self, session: SessionRecord) -> None:
+        """Drop one session from the index."""
+
+        key = (session.session_date.toordinal(), session.sequence)
+        if self._sessions.pop(session.sequence, None) is None:
+            return
+        _delete(self._keys, key)
+        _delete(self._profile_keys.get(session.profile_id, []), key)
+
+    def drop_older_than(self, day: date) -> List[SessionRecord]:
+        """Remove and return sessions dated before ``day``, oldest first.
+
+        Expired sessions form a prefix of every sorted key list, so each
+        list is cut once instead of deleting keys one by one.
+        """
+
+        bound = (day.toordinal(), 0)
+        stop = bisect_left(self._keys, bound)
+        if stop == 0:
+            return []
+
+        expired = [self._sessions.pop(sequence) for _, sequence in self._keys[:stop]]
+        del self._keys[:stop]
+        for keys in self._profile_keys.values():
+            del keys[: bisect_left(keys, bound)]
+        return expired
+
+    def older_than(self, day: date, start: int = 0, limit: Optional[int] = None) -> List[SessionRecord]:
+        """Return sessions dated before ``day``, oldest first, without removing them.
+
+        ``start`` and ``limit`` select a slice so callers can read a long
+        expired prefix in chunks.
+        """
+
+        stop = bisect_left(self._keys, (day.toordinal(), 0))
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return [self._sessions[sequence] for _, sequence in self._keys[start:stop]]
+
+    def count(self, profile_id: Optional[str] = None) -> int:
+        """Return number of sessions, optionally for one profile."""
+
+        return len(self._select(profile_id))
+
+    def page(
+        self,
+        profile_id: Optional[str] = None,
+        after: Optional[HistoryCursor] = None,
+        limit: int = 50,
+    ) -> SessionPage:
+        """Return up to ``limit`` sessions older than ``after`` (newest first)."""
+
+        keys = self._select(profile_id)
+        stop = len(keys) if after is None else bisect_left(keys, (after[0].toordinal(), after[1]))
+        start = max(stop - limit, 0)
+        rows = [self._sessions[sequence] for _, sequence in reversed(keys[start:stop])]
+        next_cursor = None
+        if start > 0 and rows:
+            next_cursor = (rows[-1].session_date, rows[-1].sequence)
+        return SessionPage(rows=rows, next_cursor=next_cursor)
+
+    def window(self, offset: int, limit: int, profile_id: Optional[str] = None) -> List[SessionRecord]:
+        """Return ``limit`` sessions starting ``offset`` rows from the newest.
+
+        Used by scrollbars that jump to arbitrary positions.
+        """
+
+        keys = self._select(profile_id)
+        stop = max(len(keys) - offset, 0)
+        start = max(stop - limit, 0)
+        return [self._sessions[sequence] for _, sequence in reversed(keys[start:stop])]
+
+    def _select(self, profile_id: Optional[str]) -> List[_Key]:
+        """Return sorted keys for all sessions or one profile."""
+
+        if profile_id is None:
+            return self._keys
+        return self._profile_keys.get(profile_id, [])
+
+
+def _merge_sorted(keys: List[_Key], new_keys: List[_Key]) -> List[_Key]:
+    """Return the sorted union of a sorted key list and a batch.
+
+    ``keys`` may be extended in place and returned. A batch much smaller
+    than the list is spliced in at bisected positions into a new list,
+    so existing keys are copied rather than compared.
+    """
+
+    new_keys.sort()
+    if not keys or keys[-1] < new_keys[0]:
+        keys.extend(new_keys)
+        return keys
+    if len(new_keys) * _SPLICE_RATIO > len(keys):
+        keys.extend(new_keys)
+        keys.sort()
+        return keys
+
+    merged: List[_Key] = []
+    start = 0
+    for key in new_keys:
+        position = bisect_left(keys, key, start)
+        merged.extend(keys[start:position])
+        merged.append(key)
+        start = position
+    merged.extend(keys[start:])
+    return merged
+
+
+def _insert(keys: List[_Key], key: _Key) -> None:
+    """Insert into a sorted key list, fast-pathing in-order appends."""
+
+    if not keys or keys[-1] < key:
+        keys.append(key)
+    else:
+        insort(keys, key)
+
+
+def _delete(keys: List[_Key], key: _Key) -> None:
+    """Delete a key from a sorted key list if present."""
+
+    position = bisect_left(keys, key)
+    if position < len(keys) and keys[position] == key:
+        del keys[position]
@@ -3,16 +3,97 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict
+import os
+import time
+from dataclasses import asdict, dataclass, field
 from datetime import date
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
-from data.models import AppState, Period, RewardRule, ScoreSnapshot, SessionRecord, TaskProfile
+from data.models import (
+    AppState,
+    DailyAggregate,
+    Period,
+    RewardRule,
+    ScoreSnapshot,
+    SessionRecord,
+    StreakState,
+    SyncState,
+    TaskProfile,
+)
+from utils.cold_store import ColdSessionStore, ColdStaging
+from utils.file_lock import FileLock
+from utils.json_stream import JsonStreamReader
+from utils.timeline import TimelineStore
+
+
+CHANGE_SET_FORMAT = "pomodrokids-changes/1"
+# Snapshots are read without the lock; on Windows a reader's open handle
+# makes ``os.replace`` fail for a moment, so it is retried this long.
+REPLACE_RETRY_SECONDS = 5.0
+
+
+@dataclass
+class JournalCursor:
+    """Position in the change journal: compaction generation and byte offset."""
+
+    generation: int = 0
+    offset: int = 0
+
+
+@dataclass
+class JournalEntry:
+    """One change appended by a process since the last snapshot.
+
+    Attributes:
+        op: ``"session"``, ``"profile"`` or ``"rules"``.
+        writer: Identifier of the repository instance that wrote the entry.
+        session: Recorded session for ``"session"`` entries.
+        points: Session points awarded by the writer.
+        bonus: Streak/badge bonus awarded by the writer.
+        profile: Upserted profile for ``"profile"`` entries.
+        rules: New global scoring rules for ``"rules"`` entries.
+    """
+
+    op: str
+    writer: str
+    session: Optional[SessionRecord] = None
+    points: int = 0
+    bonus: int = 0
+    profile: Optional[TaskProfile] = None
+    rules: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class ChangeSet:
+    """Changes exported by one device for a peer.
+
+    Attributes:
+        device_id: Exporting device.
+        seen: Exporter's per-device sequence vector; every change up to it is
+            either included here or already known to the peer.
+        profiles: Profiles changed since the peer's last known sequences.
+        rewards: Rewards added since then.
+        sessions: Sessions recorded since then.
+    """
+
+    device_id: str
+    seen: Dict[str, int] = field(default_factory=dict)
+    profiles: List[TaskProfile] = field(default_factory=list)
+    rewards: List[RewardRule] = field(default_factory=list)
+    sessions: List[SessionRecord] = field(default_factory=list)
 
 
 class LocalStateRepository:
-    """Read and write application state from JSON files."""
+    """Read and write application state from JSON files.
+
+    Full snapshots live in ``storage_path``. Between snapshots every process
+    appends its changes to ``<name>.journal`` under a short advisory lock,
+    and other processes merge that tail on their next read. Sessions moved
+    out of the state are kept compressed in ``<name>.cold``; the snapshot
+    records how many of them it committed. Event timelines of live
+    sessions are kept in ``<name>.timeline``.
+    """
 
     def __init__(self, storage_path: Path) -> None:
         """Initialize repository.
@@ -22,68 +103,545 @@ class LocalStateRepository:
         """
 
         self.storage_path = storage_path
+        self.journal_path = storage_path.with_name(f"{storage_path.name}.journal")
+        self.lock = FileLock(storage_path.with_name(f"{storage_path.name}.lock"))
+        self.cold = ColdSessionStore(storage_path.with_name(f"{storage_path.name}.cold"))
+        self.timelines = TimelineStore(storage_path.with_name(f"{storage_path.name}.timeline"))
+        self.writer_id = os.urandom(16).hex()
 
     def load(self) -> AppState:
-        """Load application state or return defaults when file does not exist."""
+        """Load the snapshot state or return defaults when file does not exist.
+
+        Journal entries are not applied; see ``load_snapshot``/``read_journal``.
+        """
+
+        return self.load_snapshot()[0]
+
+    def load_snapshot(self) -> Tuple[AppState, JournalCursor]:
+        """Load snapshot state and the journal position it already includes.
+
+        The file is streamed: sessions and daily totals are built one array
+        item at a time, so neither the raw text nor a dict tree of the whole
+        history is held next to the loaded state. Corrupt files raise
+        ``ValueError`` with the line and column of the problem.
+        """
 
         if not self.storage_path.exists():
-            return AppState()
+            return AppState(), JournalCursor()
+
+        payload: Dict[str, Any] = {}
+        sessions: List[SessionRecord] = []
+        daily_totals: List[DailyAggregate] = []
+        with self.storage_path.open(encoding="utf-8") as handle:
+            reader = JsonStreamReader(handle, name=str(self.storage_path))
+            for key in reader.iter_object():
+                if key == "sessions":
+                    sessions = self._read_sessions(reader)
+                elif key == "daily_totals":
+                    daily_totals = [
+                        DailyAggregate(profile_id, date.fromisoformat(day), planned, completed, blocks, points, count)
+                        for profile_id, day, planned, completed, blocks, points, count in reader.iter_array()
+                    ]
+                else:
+                    payload[key] = reader.read_value()
+            reader.finish()
 
-        payload = json.loads(self.storage_path.read_text(encoding="utf-8"))
+        sync = self._deserialize_sync(payload.get("sync", {}))
+        # Local sessions omit their origin; "sync" may follow "sessions" in the file.
+        local_origin = sync.device_id
+        if local_origin:
+            for session in sessions:
+                if not session.origin:
+                    session.origin = local_origin
         profiles = [TaskProfile(**item) for item in payload.get("profiles", [])]
-        rewards = [
-            RewardRule(
-                period=Period(item["period"]),
-                target_score=item["target_score"],
-                reward_title=item["reward_title"],
-            )
-            for item in payload.get("rewards", [])
-        ]
+        rewards = [self._deserialize_reward(item) for item in payload.get("rewards", [])]
         scores_data = payload.get("scores", {})
         scores = ScoreSnapshot(
             weekly=scores_data.get("weekly", 0),
             monthly=scores_data.get("monthly", 0),
             yearly=scores_data.get("yearly", 0),
         )
-        sessions = [
+        streaks = self._deserialize_streaks(payload.get("streaks", {}))
+        self.cold.committed = payload.get("cold", {}).get("sessions", 0)
+        marker = payload.get("journal", {})
+        state = AppState(
+            profiles=profiles,
+            rewards=rewards,
+            scores=scores,
+            sessions=sessions,
+            streaks=streaks,
+            scoring_rules=list(payload.get("scoring_rules", [])),
+            sync=sync,
+            daily_totals=daily_totals,
+            last_sequence=payload.get("last_sequence", 0),
+        )
+        return state, JournalCursor(marker.get("generation", 0), marker.get("offset", 0))
+
+    @staticmethod
+    def _read_sessions(reader: JsonStreamReader) -> List[SessionRecord]:
+        """Build session records from the streamed ``sessions`` array."""
+
+        from_iso = date.fromisoformat
+        return [
             SessionRecord(
                 profile_id=item["profile_id"],
                 planned_minutes=item["planned_minutes"],
                 completed_minutes=item["completed_minutes"],
                 completed_focus_blocks=item["completed_focus_blocks"],
-                session_date=date.fromisoformat(item["session_date"]),
+                session_date=from_iso(item["session_date"]),
+                sequence=item.get("sequence") or position,
+                origin=item.get("origin", ""),
+                origin_sequence=item.get("origin_sequence", 0),
             )
-            for item in payload.get("sessions", [])
+            for position, item in enumerate(reader.iter_array(), start=1)
         ]
-        return AppState(profiles=profiles, rewards=rewards, scores=scores, sessions=sessions)
 
-    def save(self, state: AppState) -> None:
-        """Persist application state to disk."""
+    def save(self, state: AppState, journal: Optional[JournalCursor] = None) -> None:
+        """Persist application state to disk atomically.
+
+        Args:
+            state: State to write.
+            journal: Journal position already folded into ``state``.
+        """
 
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
 
-        serialized = {
+        # Sessions recorded on this device omit their origin to keep large histories small.
+        local_origin = state.sync.device_id
+        serialized = self._snapshot_payload(state, journal)
+        serialized["sessions"] = [self._serialize_session(item, local_origin) for item in state.sessions]
+        # Compact output keeps json on its C encoder; indent=2 falls back
+        # to the pure-Python encoder and dominates large-history saves.
+        temp_path = self.storage_path.with_name(f"{self.storage_path.name}.tmp")
+        temp_path.write_text(json.dumps(serialized, ensure_ascii=False), encoding="utf-8")
+        _replace_snapshot(temp_path, self.storage_path)
+
+    def snapshot_writer(self, local_origin: str) -> "SnapshotWriter":
+        """Return a writer that saves a snapshot in session chunks."""
+
+        return SnapshotWriter(self, local_origin)
+
+    def _snapshot_payload(self, state: AppState, journal: Optional[JournalCursor]) -> Dict[str, Any]:
+        """Return every snapshot section except sessions."""
+
+        return {
             "profiles": [asdict(profile) for profile in state.profiles],
-            "rewards": [
-                {
-                    "period": rule.period.value,
-                    "target_score": rule.target_score,
-                    "reward_title": rule.reward_title,
-                }
-                for rule in state.rewards
-            ],
+            "rewards": [self._serialize_reward(rule) for rule in state.rewards],
             "scores": asdict(state.scores),
-            "sessions": [self._serialize_session(item) for item in state.sessions],
+            "streaks": self._serialize_streaks(state.streaks),
+            "scoring_rules": state.scoring_rules,
+            "sync": asdict(state.sync),
+            "daily_totals": [
+                [
+                    item.profile_id,
+                    item.day.isoformat(),
+                    item.planned_minutes,
+                    item.completed_minutes,
+                    item.completed_focus_blocks,
+                    item.points,
+                    item.sessions,
+                ]
+                for item in state.daily_totals
+            ],
+            "journal": asdict(journal or JournalCursor()),
+            "cold": {"sessions": self.cold.committed},
+            "last_sequence": state.last_sequence,
+        }
+
+    def compact(self, state: AppState, journal: JournalCursor) -> JournalCursor:
+        """Write a snapshot containing the journal up to ``journal`` and start a new generation.
+
+        Must be called while holding ``lock`` with ``state`` merged up to the
+        journal end. A crash between the two steps is safe: the snapshot
+        marker makes replay skip entries it already contains.
+        """
+
+        self.save(state, journal)
+        return self._start_generation(journal)
+
+    def archive_sessions(self, sessions: List[SessionRecord]) -> int:
+        """Move sessions into the cold tier (lock held).
+
+        The archive becomes durable with the next snapshot save; until then
+        a reload rolls it back together with the state that dropped them.
+
+        Returns:
+            Number of committed cold sessions.
+        """
+
+        return self.cold.append(sessions)
+
+    def stage_archive(self, sessions: List[SessionRecord]) -> ColdStaging:
+        """Return a cold tier append to prepare without the lock.
+
+        Advance it between UI events, then ``commit`` it under the lock;
+        like ``archive_sessions`` it becomes durable with the next snapshot.
+        """
+
+        return self.cold.stage(sessions)
+
+    def archived_sessions(self, first: date, last: date, profile_id: Optional[str] = None) -> List[SessionRecord]:
+        """Return cold sessions dated ``first``..``last``, decompressing only overlapping blocks."""
+
+        return self.cold.sessions_between(first, last, profile_id)
+
+    def archived_unseen(self, seen: Dict[str, int]) -> List[SessionRecord]:
+        """Return cold sessions a peer with sync vector ``seen`` has not merged."""
+
+        return self.cold.sessions_unseen(seen)
+
+    def _start_generation(self, journal: JournalCursor) -> JournalCursor:
+        """Replace the journal with an empty one of the next generation."""
+
+        generation = journal.generation + 1
+        header = self._journal_header(generation)
+        temp_path = self.journal_path.with_name(f"{self.journal_path.name}.tmp")
+        temp_path.write_bytes(header)
+        os.replace(temp_path, self.journal_path)
+        return JournalCursor(generation, len(header))
+
+    def snapshot_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Return inode, size and mtime of the snapshot, or None when there is none.
+
+        Snapshots are only replaced whole, so an unchanged signature means
+        a snapshot read earlier is still the current one.
+        """
+
+        try:
+            stat = self.storage_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def journal_generation(self) -> Optional[int]:
+        """Return the generation in the journal header, or None without a complete header."""
+
+        try:
+            with self.journal_path.open("rb") as handle:
+                header = handle.readline()
+        except FileNotFoundError:
+            return None
+        if not header.endswith(b"\n"):
+            return None
+        return json.loads(header)["generation"]
+
+    def journal_signature(self) -> Tuple[int, int]:
+        """Return ``(size, mtime_ns)`` of the journal for cheap change checks."""
+
+        try:
+            stat = self.journal_path.stat()
+        except FileNotFoundError:
+            return 0, 0
+        return stat.st_size, stat.st_mtime_ns
+
+    def read_journal(self, cursor: JournalCursor) -> Tuple[List[JournalEntry], JournalCursor, bool]:
+        """Read complete journal entries after ``cursor``.
+
+        Returns:
+            ``(entries, new_cursor, reset)``. ``reset`` is True when another
+            process compacted the journal since ``cursor``; entries then start
+            at the new generation and must be applied on a freshly loaded
+            snapshot.
+        """
+
+        try:
+            handle = self.journal_path.open("rb")
+        except FileNotFoundError:
+            return [], JournalCursor(cursor.generation, 0), False
+
+        with handle:
+            header = handle.readline()
+            if not header.endswith(b"\n"):
+                return [], JournalCursor(cursor.generation, 0), False
+            generation = json.loads(header)["generation"]
+            reset = generation != cursor.generation
+            start = len(header) if reset else max(cursor.offset, len(header))
+            handle.seek(start)
+            tail = handle.read()
+
+        complete = tail.rfind(b"\n") + 1
+        entries: List[JournalEntry] = []
+        for line in tail[:complete].splitlines():
+            try:
+                entries.append(self._deserialize_entry(json.loads(line)))
+            except (ValueError, KeyError, TypeError):
+                # A torn write from a crashed process; later entries are intact.
+                continue
+        return entries, JournalCursor(generation, start + complete), reset
+
+    def append_journal(self, entries: List[JournalEntry], cursor: JournalCursor) -> JournalCursor:
+        """Append entries (caller holds ``lock`` and has read up to the end)."""
+
+        lines = b"".join(
+            json.dumps(self._serialize_entry(entry), ensure_ascii=False).encode("utf-8") + b"\n" for entry in entries
+        )
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.journal_path.open("a+b") as handle:
+            size = handle.seek(0, os.SEEK_END)
+            if size == 0:
+                handle.write(self._journal_header(cursor.generation))
+            else:
+                handle.seek(size - 1)
+                if handle.read(1) != b"\n":
+                    # Terminate a torn line left by a crashed writer.
+                    handle.write(b"\n")
+            handle.write(lines)
+            offset = handle.tell()
+        return JournalCursor(cursor.generation, offset)
+
+    def write_change_set(self, target: Path, changes: ChangeSet) -> None:
+        """Write a change-set file atomically (the sync transport)."""
+
+        serialized = {
+            "format": CHANGE_SET_FORMAT,
+            "device_id": changes.device_id,
+            "seen": changes.seen,
+            "profiles": [asdict(profile) for profile in changes.profiles],
+            "rewards": [self._serialize_reward(rule) for rule in changes.rewards],
+            "sessions": [self._serialize_session(item) for item in changes.sessions],
         }
-        self.storage_path.write_text(
-            json.dumps(serialized, ensure_ascii=False, indent=2),
-            encoding="utf-8",
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(f"{target.name}.tmp")
+        temp_path.write_text(json.dumps(serialized, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp_path, target)
+
+    def read_change_set(self, source: Path) -> ChangeSet:
+        """Read a change-set file written by ``write_change_set``.
+
+        Raises:
+            ValueError: When the file is not a change set.
+        """
+
+        payload = json.loads(source.read_text(encoding="utf-8"))
+        if not isinstance(payload, dict) or payload.get("format") != CHANGE_SET_FORMAT:
+            raise ValueError(f"Not a change-set file: {source}")
+
+        return ChangeSet(
+            device_id=payload["device_id"],
+            seen={device: int(sequence) for device, sequence in payload.get("seen", {}).items()},
+            profiles=[TaskProfile(**item) for item in payload.get("profiles", [])],
+            rewards=[self._deserialize_reward(item) for item in payload.get("rewards", [])],
+            sessions=[
+                SessionRecord(
+                    profile_id=item["profile_id"],
+                    planned_minutes=item["planned_minutes"],
+                    completed_minutes=item["completed_minutes"],
+                    completed_focus_blocks=item["completed_focus_blocks"],
+                    session_date=date.fromisoformat(item["session_date"]),
+                    origin=item["origin"],
+                    origin_sequence=item["origin_sequence"],
+                )
+                for item in payload.get("sessions", [])
+            ],
         )
 
+    def session_entry(self, session: SessionRecord, points: int, bonus: int) -> JournalEntry:
+        """Build a journal entry for a recorded session."""
+
+        return JournalEntry(op="session", writer=self.writer_id, session=session, points=points, bonus=bonus)
+
+    def profile_entry(self, profile: TaskProfile) -> JournalEntry:
+        """Build a journal entry for an upserted profile."""
+
+        return JournalEntry(op="profile", writer=self.writer_id, profile=profile)
+
+    def rules_entry(self, rules: List[Dict[str, Any]]) -> JournalEntry:
+        """Build a journal entry for replaced global scoring rules."""
+
+        return JournalEntry(op="rules", writer=self.writer_id, rules=list(rules))
+
     @staticmethod
-    def _serialize_session(session: SessionRecord) -> Dict[str, Any]:
-        """Convert session records into JSON-safe dictionaries."""
+    def _journal_header(generation: int) -> bytes:
+        """Return the first journal line for a generation."""
+
+        return json.dumps({"generation": generation}).encode("utf-8") + b"\n"
+
+    def _serialize_entry(self, entry: JournalEntry) -> Dict[str, Any]:
+        """Convert a journal entry into a JSON-safe dictionary."""
 
-        payload = asdict(session)
-        payload["session_date"] = session.session_date.isoformat()
+        payload: Dict[str, Any] = {"op": entry.op, "writer": entry.writer}
+        if entry.session is not None:
+            payload["session"] = self._serialize_session(entry.session)
+            payload["points"] = entry.points
+            payload["bonus"] = entry.bonus
+        if entry.profile is not None:
+            payload["profile"] = asdict(entry.profile)
+        if entry.op == "rules":
+            payload["rules"] = entry.rules
         return payload
+
+    @staticmethod
+    def _deserialize_entry(payload: Dict[str, Any]) -> JournalEntry:
+        """Rebuild a journal entry from its JSON representation."""
+
+        entry = JournalEntry(op=payload["op"], writer=payload["writer"])
+        if "session" in payload:
+            item = payload["session"]
+            entry.session = SessionRecord(
+                profile_id=item["profile_id"],
+                planned_minutes=item["planned_minutes"],
+                completed_minutes=item["completed_minutes"],
+                completed_focus_blocks=item["completed_focus_blocks"],
+                session_date=date.fromisoformat(item["session_date"]),
+                sequence=item["sequence"],
+                origin=item.get("origin", ""),
+                origin_sequence=item.get("origin_sequence", 0),
+            )
+            entry.points = payload.get("points", 0)
+            entry.bonus = payload.get("bonus", 0)
+        if "profile" in payload:
+            entry.profile = TaskProfile(**payload["profile"])
+        if "rules" in payload:
+            entry.rules = list(payload["rules"])
+        return entry
+
+    @staticmethod
+    def _serialize_session(session: SessionRecord, local_origin: str = "") -> Dict[str, Any]:
+        """Convert session records into JSON-safe dictionaries.
+
+        Args:
+            session: Session to convert.
+            local_origin: Origin omitted from the output (restored on load).
+        """
+
+        payload: Dict[str, Any] = {
+            "profile_id": session.profile_id,
+            "planned_minutes": session.planned_minutes,
+            "completed_minutes": session.completed_minutes,
+            "completed_focus_blocks": session.completed_focus_blocks,
+            "session_date": session.session_date.isoformat(),
+            "sequence": session.sequence,
+        }
+        if session.origin_sequence:
+            payload["origin_sequence"] = session.origin_sequence
+        if session.origin != local_origin:
+            payload["origin"] = session.origin
+        return payload
+
+    @staticmethod
+    def _serialize_reward(rule: RewardRule) -> Dict[str, Any]:
+        """Convert a reward rule into a JSON-safe dictionary."""
+
+        return {
+            "period": rule.period.value,
+            "target_score": rule.target_score,
+            "reward_title": rule.reward_title,
+            "origin": rule.origin,
+            "origin_sequence": rule.origin_sequence,
+        }
+
+    @staticmethod
+    def _deserialize_reward(payload: Dict[str, Any]) -> RewardRule:
+        """Rebuild a reward rule from its JSON representation."""
+
+        return RewardRule(
+            period=Period(payload["period"]),
+            target_score=payload["target_score"],
+            reward_title=payload["reward_title"],
+            origin=payload.get("origin", ""),
+            origin_sequence=payload.get("origin_sequence", 0),
+        )
+
+    @staticmethod
+    def _deserialize_sync(payload: Dict[str, Any]) -> SyncState:
+        """Rebuild sync bookkeeping from its JSON representation."""
+
+        return SyncState(
+            device_id=payload.get("device_id", ""),
+            clock=payload.get("clock", 0),
+            seen={device: int(sequence) for device, sequence in payload.get("seen", {}).items()},
+            peers={
+                peer: {device: int(sequence) for device, sequence in vector.items()}
+                for peer, vector in payload.get("peers", {}).items()
+            },
+        )
+
+    @staticmethod
+    def _serialize_streaks(streaks: StreakState) -> Dict[str, Any]:
+        """Convert streak runs and week masks into JSON-safe values."""
+
+        return {
+            "runs": [
+                [date.fromordinal(start).isoformat(), date.fromordinal(end).isoformat()]
+                for start, end in sorted(streaks.day_runs.items())
+            ],
+            "weeks": dict(streaks.week_masks),
+        }
+
+    @staticmethod
+    def _deserialize_streaks(payload: Dict[str, Any]) -> StreakState:
+        """Rebuild streak state from its JSON representation."""
+
+        return StreakState(
+            day_runs={
+                date.fromisoformat(start).toordinal(): date.fromisoformat(end).toordinal()
+                for start, end in payload.get("runs", [])
+            },
+            week_masks={label: int(mask) for label, mask in payload.get("weeks", {}).items()},
+        )
+
+
+class SnapshotWriter:
+    """Writes a snapshot in slices: sessions first, the small sections last.
+
+    Sessions already recorded never change, so they can be encoded and
+    written in chunks without the lock; ``finish`` then adds the remaining
+    sections of the (merged) state and swaps the file in, like ``compact``.
+    """
+
+    def __init__(self, repository: LocalStateRepository, local_origin: str) -> None:
+        """Open the temporary snapshot file."""
+
+        repository.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sessions_written = 0
+        self._repository = repository
+        self._local_origin = local_origin
+        # Writers of several processes may run at once outside the lock.
+        name = f"{repository.storage_path.name}.{repository.writer_id[:12]}.compact.tmp"
+        self._temp_path = repository.storage_path.with_name(name)
+        self._handle = self._temp_path.open("w", encoding="utf-8")
+        self._handle.write('{"sessions": [')
+
+    def write_sessions(self, sessions: List[SessionRecord]) -> None:
+        """Append a chunk of sessions to the snapshot."""
+
+        if not sessions:
+            return
+        serialize = self._repository._serialize_session
+        encoded = json.dumps([serialize(item, self._local_origin) for item in sessions], ensure_ascii=False)
+        if self.sessions_written:
+            self._handle.write(", ")
+        self._handle.write(encoded[1:-1])
+        self.sessions_written += len(sessions)
+
+    def finish(self, state: AppState, journal: JournalCursor) -> JournalCursor:
+        """Write remaining sections, replace the snapshot and start a new journal generation.
+
+        Caller holds the repository lock with ``state`` merged up to ``journal``.
+        """
+
+        payload = self._repository._snapshot_payload(state, journal)
+        self._handle.write("], " + json.dumps(payload, ensure_ascii=False)[1:])
+        self._handle.close()
+        _replace_snapshot(self._temp_path, self._repository.storage_path)
+        return self._repository._start_generation(journal)
+
+    def abort(self) -> None:
+        """Discard the partial snapshot."""
+
+        self._handle.close()
+        self._temp_path.unlink(missing_ok=True)
+
+
+def _replace_snapshot(source: Path, target: Path) -> None:
+    """Replace the snapshot, waiting out readers that hold it open on Windows."""
+
+    deadline = time.monotonic() + REPLACE_RETRY_SECONDS
+    while True:
+        try:
+            os.replace(source, target)
+            return
+        except PermissionError:
+            if os.name != "nt" or time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
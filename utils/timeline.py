@@ -0,0 +1,222 @@
+"""Compact per-session event timelines stored beside the state file."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Low bits of each encoded event hold its kind, the rest the offset delta.
+_KIND_BITS = 3
+
+
+class EventKind(IntEnum):
+    """What happened at a timeline offset."""
+
+    START = 0
+    PAUSE = 1
+    RESUME = 2
+    FOCUS = 3
+    BREAK = 4
+    ALERT = 5
+    STOP = 6
+
+
+@dataclass(frozen=True)
+class TimelineEvent:
+    """One session event.
+
+    Attributes:
+        kind: Event kind; ``FOCUS``/``BREAK`` mark the start of a block.
+        offset_seconds: Wall-clock seconds since the session started.
+    """
+
+    kind: EventKind
+    offset_seconds: int
+
+
+def encode_timeline(events: Iterable[TimelineEvent]) -> bytes:
+    """Encode events as varints of ``(offset delta << 3) | kind``.
+
+    Offsets only grow, so most events take one or two bytes.
+    """
+
+    encoded = bytearray()
+    previous = 0
+    for event in events:
+        delta = event.offset_seconds - previous
+        if delta < 0:
+            raise ValueError("Timeline offsets must not decrease")
+        previous = event.offset_seconds
+        encoded += _varint((delta << _KIND_BITS) | event.kind)
+    return bytes(encoded)
+
+
+def decode_timeline(data: bytes) -> List[TimelineEvent]:
+    """Decode events written by ``encode_timeline``."""
+
+    events: List[TimelineEvent] = []
+    offset = 0
+    value = 0
+    shift = 0
+    kinds = list(EventKind)
+    mask = (1 << _KIND_BITS) - 1
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        offset += value >> _KIND_BITS
+        if value & mask >= len(kinds):
+            raise ValueError(f"Unknown timeline event kind: {value & mask}")
+        events.append(TimelineEvent(kinds[value & mask], offset))
+        value = 0
+        shift = 0
+    if shift:
+        raise ValueError("Truncated timeline")
+    return events
+
+
+def focus_seconds(events: Iterable[TimelineEvent]) -> int:
+    """Return seconds spent running inside focus blocks (pauses excluded)."""
+
+    return _running_seconds(events)[0]
+
+
+def paused_seconds(events: Iterable[TimelineEvent]) -> int:
+    """Return seconds between pauses and the following resume or stop."""
+
+    return _running_seconds(events)[1]
+
+
+def _running_seconds(events: Iterable[TimelineEvent]) -> Tuple[int, int]:
+    """Return focus and paused seconds of a timeline."""
+
+    focus = paused = 0
+    running = in_focus = False
+    previous: Optional[int] = None
+    for event in events:
+        if previous is not None:
+            elapsed = event.offset_seconds - previous
+            if running and in_focus:
+                focus += elapsed
+            elif not running:
+                paused += elapsed
+        previous = event.offset_seconds
+        if event.kind in (EventKind.START, EventKind.RESUME):
+            running = True
+        elif event.kind == EventKind.PAUSE:
+            running = False
+        elif event.kind in (EventKind.FOCUS, EventKind.BREAK):
+            in_focus = event.kind == EventKind.FOCUS
+        elif event.kind == EventKind.STOP:
+            break
+    return focus, paused
+
+
+class TimelineStore:
+    """Append-only file of encoded timelines keyed by session sequence.
+
+    Records are ``varint(sequence) varint(length) payload``. The index is
+    built by one scan and extended as the file grows; a torn last record
+    (crash mid-append) is ignored and overwritten by the next append.
+    Caller holds the repository lock when appending. ``bytes_decoded``
+    counts the payload bytes lookups have read back.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize store for ``path``."""
+
+        self.path = path
+        self._index: Dict[int, Tuple[int, int]] = {}
+        self._scanned = 0
+        self.bytes_decoded = 0
+
+    def append(self, sequence: int, events: Iterable[TimelineEvent]) -> None:
+        """Store the timeline of a recorded session."""
+
+        payload = encode_timeline(events)
+        self._scan()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as handle:
+            handle.truncate(self._scanned)
+            handle.write(_varint(sequence) + _varint(len(payload)) + payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._scan()
+
+    def get(self, sequence: int) -> Optional[List[TimelineEvent]]:
+        """Return the timeline of a session, or None when none was recorded."""
+
+        self._scan()
+        location = self._index.get(sequence)
+        if location is None:
+            return None
+        with self.path.open("rb") as handle:
+            handle.seek(location[0])
+            payload = handle.read(location[1])
+        self.bytes_decoded += len(payload)
+        return decode_timeline(payload)
+
+    def _scan(self) -> None:
+        """Index records appended since the last scan."""
+
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            self._index.clear()
+            self._scanned = 0
+            return
+        if size < self._scanned:
+            self._index.clear()
+            self._scanned = 0
+        if size == self._scanned:
+            return
+
+        with self.path.open("rb") as handle:
+            handle.seek(self._scanned)
+            data = handle.read()
+        position = 0
+        while True:
+            header = _read_varints(data, position, 2)
+            if header is None:
+                break
+            (sequence, length), payload_start = header
+            if payload_start + length > len(data):
+                break
+            self._index[sequence] = (self._scanned + payload_start, length)
+            position = payload_start + length
+        self._scanned += position
+
+
+def _varint(value: int) -> bytes:
+    """Encode a non-negative integer as a little-endian base-128 varint."""
+
+    encoded = bytearray()
+    while value >= 0x80:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _read_varints(data: bytes, position: int, count: int) -> Optional[Tuple[List[int], int]]:
+    """Read ``count`` varints from ``position``; None when the data ends first."""
+
+    values = []
+    for _ in range(count):
+        value = 0
+        shift = 0
+        while True:
+            if position >= len(data):
+                return None
+            byte = data[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                break
+            shift += 7
+        values.append(value)
+    return values, position